@@ -0,0 +1,154 @@
+"""
+benchmarks/path_filter.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Times apply_filters() against the one-fnmatch-per-pattern baseline.
+
+Usage:
+    python benchmarks/path_filter.py [SIZE ...]
+"""
+
+import fnmatch
+import random
+import sys
+import time
+from typing import List, Optional, Sequence
+
+from pydantic import BaseModel
+
+from wembed_core.utils.file_utils import apply_filters
+
+
+def apply_filters_per_pattern(
+    files: List[str], match_patterns: List[str], exclude_patterns: List[str]
+) -> List[str]:
+    """The previous one-fnmatch-per-pattern apply_filters(), used as the baseline."""
+    file_set = set(files)
+    if match_patterns:
+        matched_files = set()
+        for pattern in match_patterns:
+            matched_files.update(f for f in file_set if fnmatch.fnmatch(f, pattern))
+        file_set = file_set.intersection(matched_files)
+    if exclude_patterns:
+        excluded_files = set()
+        for pattern in exclude_patterns:
+            excluded_files.update(f for f in file_set if fnmatch.fnmatch(f, pattern))
+        file_set = file_set.difference(excluded_files)
+    return sorted(file_set)
+
+
+class FilterBenchmark(BaseModel):
+    """
+    Timing of apply_filters() against the per-pattern baseline.
+
+    Attributes:
+        paths (int): Number of input paths.
+        patterns (int): Match plus exclude patterns.
+        kept (int): Paths that passed the filters.
+        compiled_ms (float): Time taken by PathFilter-based apply_filters().
+        baseline_ms (float): Time taken by one fnmatch pass per pattern.
+        speedup (float): baseline_ms / compiled_ms.
+        agrees (bool): Whether both implementations kept the same paths.
+    """
+
+    paths: int
+    patterns: int
+    kept: int
+    compiled_ms: float
+    baseline_ms: float
+    speedup: float
+    agrees: bool = True
+
+
+BENCHMARK_MATCH_PATTERNS = [
+    "*.py", "*.md", "*.rst", "*.txt", "*.toml", "*.json", "*.yaml", "*.yml",
+    "*.js", "*.ts", "*.tsx", "*.go", "*.rs", "*.java", "*.c", "*.h",
+    "Makefile", "Dockerfile", "docs/*", "src/*", "*README*", "*/config/*.ini",
+]  # fmt: skip
+BENCHMARK_EXCLUDE_PATTERNS = [
+    "*.min.js", "*_pb2.py", "*/node_modules/*", "*/.venv/*", "build/*",
+    "dist/*", "*/__pycache__/*", "*/migrations/0*.py", "*.lock", "*~",
+    "*/vendor/*", "*/test_data/*",
+]  # fmt: skip
+
+
+def synthetic_paths(count: int, seed: int = 0) -> List[str]:
+    """Generate repository-like relative paths for benchmarking."""
+    rng = random.Random(seed)
+    top = ["src", "docs", "tests", "build", "dist", "lib", "app", "tools"]
+    mid = ["core", "api", "node_modules", ".venv", "__pycache__", "config",
+           "migrations", "vendor", "utils", "models", "test_data", "ui"]  # fmt: skip
+    exts = [".py", ".md", ".js", ".min.js", ".json", ".c", ".h", ".png", ".lock",
+            ".txt", ".ts", ".go", ".ini", ".pyc", ".so", ".rs"]  # fmt: skip
+    paths = []
+    for i in range(count):
+        depth = rng.randint(0, 3)
+        parts = [rng.choice(top)] + [rng.choice(mid) for _ in range(depth)]
+        parts.append(f"file_{i}{rng.choice(exts)}")
+        paths.append("/".join(parts))
+    return paths
+
+
+def benchmark_path_filter(
+    sizes: Sequence[int] = (10_000, 100_000, 1_000_000),
+    match_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    baseline: bool = True,
+) -> List[FilterBenchmark]:
+    """
+    Time apply_filters() on synthetic path lists of the given sizes.
+
+    Args:
+        sizes (Sequence[int]): Numbers of paths to filter.
+        match_patterns (Optional[List[str]]): Defaults to BENCHMARK_MATCH_PATTERNS.
+        exclude_patterns (Optional[List[str]]): Defaults to BENCHMARK_EXCLUDE_PATTERNS.
+        baseline (bool): Also time the per-pattern implementation and compare the results.
+    Returns:
+        List[FilterBenchmark]: One entry per size.
+    """
+    match_patterns = match_patterns or BENCHMARK_MATCH_PATTERNS
+    exclude_patterns = exclude_patterns or BENCHMARK_EXCLUDE_PATTERNS
+    results = []
+    for size in sizes:
+        paths = synthetic_paths(size)
+        start = time.perf_counter()
+        kept = apply_filters(paths, match_patterns, exclude_patterns)
+        compiled_ms = (time.perf_counter() - start) * 1000.0
+        baseline_ms = 0.0
+        agrees = True
+        if baseline:
+            start = time.perf_counter()
+            expected = apply_filters_per_pattern(
+                paths, match_patterns, exclude_patterns
+            )
+            baseline_ms = (time.perf_counter() - start) * 1000.0
+            agrees = expected == kept
+        results.append(
+            FilterBenchmark(
+                paths=size,
+                patterns=len(match_patterns) + len(exclude_patterns),
+                kept=len(kept),
+                compiled_ms=compiled_ms,
+                baseline_ms=baseline_ms,
+                speedup=baseline_ms / compiled_ms if compiled_ms else 0.0,
+                agrees=agrees,
+            )
+        )
+    return results
+
+
+def main(argv: Sequence[str]) -> int:
+    sizes = [int(a) for a in argv] or (10_000, 100_000, 1_000_000)
+    print(f"{'paths':>10} {'kept':>9} {'compiled ms':>12} {'baseline ms':>12} speedup")
+    failed = False
+    for r in benchmark_path_filter(sizes):
+        mismatch = "" if r.agrees else "  MISMATCH"
+        print(
+            f"{r.paths:>10} {r.kept:>9} {r.compiled_ms:>12.1f} "
+            f"{r.baseline_ms:>12.1f} {r.speedup:>6.1f}x{mismatch}"
+        )
+        failed = failed or not r.agrees
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,6 +3,8 @@ from .config import *  # noqa:F401, F403
 from .database import *  # noqa:F401, F403
 from .embedding import EmbeddingModelConfig, EmbeddingService  # noqa:F401, F403
 from .file_scanner import *  # noqa:F401, F403
+from .pagination import *  # noqa:F401, F403
+from .search import *  # noqa:F401, F403
 from .services import *  # noqa:F401, F403
 
 __version__ = "0.1.7"
@@ -7,7 +7,12 @@ Constants used throughout the application.
 from .headers import HEADERS  # noqa
 from .ignore_ext import IGNORE_EXTENSIONS  # noqa
 from .ignore_parts import IGNORE_PARTS  # noqa
-from .indexing_markers import OBSIDIAN_MARKER, REPO_MARKER  # noqa
+from .indexing_markers import (  # noqa
+    DOCLING_EXTENSIONS,
+    IMAGE_EXTENSIONS,
+    OBSIDIAN_MARKER,
+    REPO_MARKER,
+)
 from .md_xref import MD_XREF  # noqa
 from .stdlib_modules import STD_LIB_MODULES  # noqa
 
@@ -19,6 +24,8 @@ IGNORE_LIST: list[str] = [
 __all__ = [
     "REPO_MARKER",
     "OBSIDIAN_MARKER",
+    "IMAGE_EXTENSIONS",
+    "DOCLING_EXTENSIONS",
     "HEADERS",
     "IGNORE_EXTENSIONS",
     "IGNORE_PARTS",
@@ -4,5 +4,41 @@ wembed_core/constants/indexing_markers.py
 Markers used to identify specific types of repositories or files during indexing.
 """
 
+from typing import Set
+
 REPO_MARKER = ".git"
 OBSIDIAN_MARKER = ".obsidian"
+
+IMAGE_EXTENSIONS: Set[str] = {
+    ".png",
+    ".jpg",
+    ".jpeg",
+    ".gif",
+    ".bmp",
+    ".tiff",
+    ".svg",
+    ".webp",
+    ".nef",
+    ".cr2",
+    ".arw",
+    ".orf",
+    ".rw2",
+}
+
+DOCLING_EXTENSIONS: Set[str] = {
+    ".pdf",
+    ".docx",
+    ".pptx",
+    ".xlsx",
+    ".html",
+    ".xhtml",
+    ".wav",
+    ".mp3",
+    ".vtt",
+    ".csv",
+    ".png",
+    ".tiff",
+    ".jpeg",
+    ".webp",
+    ".bmp",
+}
@@ -5,11 +5,16 @@ SQLAlchemy setup and database service for the application.
 """
 
 import contextlib
-from typing import Generator
+from typing import TYPE_CHECKING, Generator, List, Optional
 
+from sqlalchemy import event
 from sqlalchemy.orm import Session, declarative_base
 
 from .config import AppConfig
+from .instrumentation import QueryInstrumentation
+
+if TYPE_CHECKING:
+    from .replica import ReadReplica
 
 AppBase = declarative_base()
 """
@@ -17,6 +22,17 @@ AppBase is the base sqlalchemy.orm.declarative_base() instance for all models.
 """
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Enable incremental auto-vacuum on new SQLite connections.
+    The setting only takes effect on a database that has no tables yet;
+    see StorageMaintenance.enable_incremental_vacuum() for existing files.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    cursor.close()
+
+
 class DatabaseService:
     """
     Service class to manage database connections and sessions using SQLAlchemy.
@@ -24,6 +40,9 @@ class DatabaseService:
     Methods:
         init_db(): Initializes the database connection and creates tables.
         get_db(): Provides a database session for use in application code.
+        get_read_db(): Provides a session for query serving, from the read replica if enabled.
+        enable_read_replica(): Serves reads from an in-memory copy of the database.
+        instrument(): Attaches per-statement timing and a slow-query log.
     """
 
     is_initialized = False
@@ -38,6 +57,8 @@ class DatabaseService:
         self.debug = config.debug
         self.engine = None
         self.SessionLocal = None
+        self.instrumentation: Optional[QueryInstrumentation] = None
+        self.replica: Optional["ReadReplica"] = None
 
     def init_db(self) -> None:
         """
@@ -50,12 +71,40 @@ class DatabaseService:
         from sqlalchemy.orm import sessionmaker
 
         self.engine = create_engine(self.uri, echo=self.debug)
+        if self.engine.dialect.name == "sqlite":
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
         AppBase.metadata.create_all(bind=self.engine)
+        # create_all() skips existing tables, so add columns and indexes
+        # introduced later.
+        self._add_missing_columns()
+        for table in AppBase.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
         self.is_initialized = True
 
+    def _add_missing_columns(self) -> None:
+        """Add nullable model columns that are missing from existing tables."""
+        from sqlalchemy import inspect, text
+
+        inspector = inspect(self.engine)
+        preparer = self.engine.dialect.identifier_preparer
+        for table in AppBase.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=self.engine.dialect)
+                with self.engine.begin() as conn:
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {preparer.format_table(table)} "
+                            f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+                        )
+                    )
+
     @contextlib.contextmanager
     def get_db(self) -> "Generator[Session, None, None]":
         """
@@ -72,3 +121,84 @@ class DatabaseService:
             yield db
         finally:
             db.close()
+
+    @contextlib.contextmanager
+    def get_read_db(self) -> "Generator[Session, None, None]":
+        """
+        Provide a read-only session for search and lookups.
+        Uses the read replica when one is enabled, otherwise get_db().
+        Yields:
+            Generator[Session, None, None]: A generator yielding a SQLAlchemy session.
+        """
+        if self.replica is None:
+            with self.get_db() as db:
+                yield db
+        else:
+            with self.replica.session() as db:
+                yield db
+
+    def enable_read_replica(
+        self,
+        tables: Optional[List[str]] = None,
+        refresh_interval_s: Optional[float] = None,
+    ) -> "ReadReplica":
+        """
+        Copy the database into memory and route get_read_db() sessions to it.
+        Args:
+            tables (Optional[List[str]]): Tables to copy; None copies the whole database.
+            refresh_interval_s (Optional[float]): Check for changes and refresh in the
+                background at this interval; None refreshes only on replica.refresh().
+        Returns:
+            ReadReplica: The replica; call notify() after ingestion to refresh early.
+        Raises:
+            Exception: If the database has not been initialized.
+        """
+        if self.engine is None:
+            raise Exception("Database not initialized. Call init_db() first.")
+        from .replica import ReadReplica
+
+        self.disable_read_replica()
+        replica = ReadReplica(self.engine, tables=tables)
+        if refresh_interval_s is None:
+            replica.refresh()
+        else:
+            replica.start(refresh_interval_s)
+        self.replica = replica
+        return replica
+
+    def disable_read_replica(self) -> None:
+        """Release the read replica and serve reads from the database again."""
+        if self.replica is not None:
+            replica, self.replica = self.replica, None
+            replica.close()
+
+    def instrument(
+        self,
+        slow_query_ms: float = 100.0,
+        explain_slow_queries: bool = False,
+        max_slow_queries: int = 500,
+    ) -> QueryInstrumentation:
+        """
+        Attach query instrumentation to the engine.
+        Collects per-statement latency histograms and row counts, and logs
+        statements slower than the threshold, optionally with their
+        EXPLAIN QUERY PLAN output.
+        Args:
+            slow_query_ms (float): Threshold in milliseconds for the slow-query log.
+            explain_slow_queries (bool): Capture query plans for slow statements.
+            max_slow_queries (int): Number of slow-query entries to retain.
+        Returns:
+            QueryInstrumentation: The collector; export with to_json().
+        Raises:
+            Exception: If the database has not been initialized.
+        """
+        if self.engine is None:
+            raise Exception("Database not initialized. Call init_db() first.")
+        if self.instrumentation is not None:
+            self.instrumentation.detach()
+        self.instrumentation = QueryInstrumentation(
+            slow_query_ms=slow_query_ms,
+            explain_slow_queries=explain_slow_queries,
+            max_slow_queries=max_slow_queries,
+        ).attach(self.engine)
+        return self.instrumentation
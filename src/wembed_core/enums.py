@@ -41,3 +41,71 @@ class CodeChunkerChunkTypes(str, Enum):
     METHOD = "method"
     IMPORT = "import"
     MODULE = "module"
+
+
+class FTSSources(str, Enum):
+    """
+    Enum for the full-text searchable corpora.
+    "indexed_files", "file_lines", "doc_chunks", "code_chunks"
+
+    Values:
+      INDEXED_FILES: "indexed_files"
+      FILE_LINES: "file_lines"
+      DOC_CHUNKS: "doc_chunks"
+      CODE_CHUNKS: "code_chunks"
+    """
+
+    INDEXED_FILES = "indexed_files"
+    FILE_LINES = "file_lines"
+    DOC_CHUNKS = "doc_chunks"
+    CODE_CHUNKS = "code_chunks"
+
+
+class FileChangeStates(str, Enum):
+    """
+    Enum for how a scanned file compares with its indexed record.
+    "unchanged", "modified", "new", "deleted"
+
+    Values:
+      UNCHANGED: "unchanged"
+      MODIFIED: "modified"
+      NEW: "new"
+      DELETED: "deleted"
+    """
+
+    UNCHANGED = "unchanged"
+    MODIFIED = "modified"
+    NEW = "new"
+    DELETED = "deleted"
+
+
+class ContentKinds(str, Enum):
+    """
+    Enum for how a file's content is treated when it is indexed.
+    "text", "binary"
+
+    Values:
+      TEXT: "text"
+      BINARY: "binary"
+    """
+
+    TEXT = "text"
+    BINARY = "binary"
+
+
+class CloneStrategies(str, Enum):
+    """
+    Enum for how TmpRepoManager clones a repository.
+    "full", "shallow", "blobless", "sparse"
+
+    Values:
+      FULL: "full"
+      SHALLOW: "shallow"
+      BLOBLESS: "blobless"
+      SPARSE: "sparse"
+    """
+
+    FULL = "full"
+    SHALLOW = "shallow"
+    BLOBLESS = "blobless"
+    SPARSE = "sparse"
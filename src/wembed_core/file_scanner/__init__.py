@@ -7,9 +7,55 @@ It includes functionality for handling .scanignore files, temporary git reposito
 and utility functions for file operations.
 """
 
-from .dot_scanignore import DotScanIgnoreFile  # noqa: F401
+from .async_scan import AsyncFileScanner  # noqa: F401
+from .dot_scanignore import DotScanIgnoreFile, ScanIgnoreMatcher  # noqa: F401
+from .git_changes import GitChangeSet, collect_changes, head_commit  # noqa: F401
+from .git_objects import (  # noqa: F401
+    GitBlob,
+    blob_sizes,
+    filtered_paths,
+    iter_blob_contents,
+    list_blobs,
+    worktree_changes,
+)
+from .hashing import (  # noqa: F401
+    DEFAULT_TEXT_SIZE_LIMIT,
+    FileDigest,
+    digest_bytes,
+    hash_file,
+)
 from .list_builder import ListBuilder, ListBuilderOptions  # noqa: F401
-from .tmp_repo_manager import TmpRepoManager  # noqa: F401
+from .path_resolver import PathRecord, PathRecordResolver, ResolvedPaths  # noqa: F401
+from .path_table import PathMemoryReport, PathTable, measure_path_memory  # noqa: F401
+from .record_builder import (  # noqa: F401
+    FileRecordData,
+    ParallelRecordBuilder,
+    RecordBuildResult,
+    WorkerStats,
+    build_record_data,
+)
+from .sniffing import (  # noqa: F401
+    ContentSniffer,
+    SniffResult,
+    default_sniffer,
+    sniff_bytes,
+)
+from .tmp_repo_manager import (  # noqa: F401
+    CloneReport,
+    TmpRepoManager,
+    measure_clone_strategies,
+)
 from .utils import (  # format_file_record_markdown,; get_filelines_list_from_file_record,
+    create_file_record_from_content,
+    create_file_record_from_digest,
     create_file_record_from_path,
 )
+from .walker import (  # noqa: F401
+    DirectoryPruner,
+    FileTreeWalker,
+    PruneReport,
+    WalkResult,
+    measure_pruning,
+    walk_tree,
+)
+from .watcher import FileWatcher, WatchBatch, WatchLimitReached  # noqa: F401
@@ -0,0 +1,184 @@
+"""
+wembed_core/file_scanner/async_scan.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Asynchronous scanning on anyio.
+
+Directory listing, reading and hashing run on anyio worker threads
+behind one CapacityLimiter, and records are delivered through a memory
+object stream. One event loop can therefore overlap disk I/O (which is
+slow on network file systems) with embedding requests and database
+writes.
+"""
+
+import os
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Iterable, Optional
+
+import anyio
+from anyio.abc import ObjectReceiveStream, ObjectSendStream
+
+from .dot_scanignore import ScanIgnoreMatcher
+from .hashing import DEFAULT_TEXT_SIZE_LIMIT
+from .record_builder import FileRecordData, build_record_data
+from .walker import DirectoryPruner, _list_dir
+
+DEFAULT_SCAN_CONCURRENCY = 16
+
+
+class AsyncFileScanner:
+    """
+    Walks directories and builds file records with bounded concurrency.
+
+    At most 'concurrency' blocking calls (directory listings and file
+    reads) run at once. Records are produced in completion order.
+
+    The iter_*() generators must be consumed from a single task; the
+    open_*() context managers return streams that can be handed to other
+    tasks.
+
+    Methods:
+        open_paths(): Context manager yielding a stream of file paths.
+        iter_paths(): Async iterator over the files below a root.
+        open_records(): Context manager yielding a stream of records.
+        iter_records(): Async iterator over records.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_SCAN_CONCURRENCY,
+        prune: Iterable[str] = (),
+        scanignore: Optional[ScanIgnoreMatcher] = None,
+        text_size_limit: int = DEFAULT_TEXT_SIZE_LIMIT,
+    ):
+        """
+        Initialize the scanner.
+        Args:
+            concurrency (int): Maximum number of worker threads in use at once.
+            prune (Iterable[str]): Directory names or globs that are not entered.
+            scanignore (Optional[ScanIgnoreMatcher]): .scanignore rules to honour.
+            text_size_limit (int): Files above this size are hashed without loading their text.
+        """
+        self.concurrency = max(1, concurrency)
+        self.limiter = anyio.CapacityLimiter(self.concurrency)
+        self.prune = DirectoryPruner(prune)
+        self.scanignore = scanignore
+        self.text_size_limit = text_size_limit
+
+    @asynccontextmanager
+    async def open_paths(
+        self, root: str | os.PathLike
+    ) -> AsyncIterator[ObjectReceiveStream[str]]:
+        """
+        Walk 'root' in the background while the caller consumes the file paths.
+
+        Args:
+            root (str | os.PathLike): Directory to walk.
+        Yields:
+            ObjectReceiveStream[str]: Absolute file paths, as directory listings complete.
+        """
+        send, receive = anyio.create_memory_object_stream[str](self.concurrency)
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._walk, os.path.abspath(root), send)
+            try:
+                async with receive:
+                    yield receive
+            finally:
+                tg.cancel_scope.cancel()
+
+    async def iter_paths(self, root: str | os.PathLike) -> AsyncIterator[str]:
+        """Yield the files below 'root'; see open_paths()."""
+        async with self.open_paths(root) as paths:
+            try:
+                async for path in paths:
+                    yield path
+            except GeneratorExit:
+                # Closed early: leave the task group without an error.
+                return
+
+    async def _walk(self, root: str, send: ObjectSendStream[str]) -> None:
+        async with send, anyio.create_task_group() as tg:
+
+            async def visit(path: str, send: ObjectSendStream[str]) -> None:
+                async with send:
+                    _, dirs, files, _ok = await anyio.to_thread.run_sync(
+                        _list_dir, path, limiter=self.limiter
+                    )
+                    for name in dirs:
+                        sub = os.path.join(path, name)
+                        if self.prune(name) or self._scanignored(sub, True):
+                            continue
+                        tg.start_soon(visit, sub, send.clone())
+                    for name in files:
+                        full = os.path.join(path, name)
+                        if not self._scanignored(full, False):
+                            await send.send(full)
+
+            tg.start_soon(visit, root, send.clone())
+
+    def _scanignored(self, path: str, is_dir: bool) -> bool:
+        return self.scanignore is not None and self.scanignore.is_ignored(path, is_dir)
+
+    @asynccontextmanager
+    async def open_records(
+        self, source: str | os.PathLike | Iterable[str | os.PathLike]
+    ) -> AsyncIterator[ObjectReceiveStream[FileRecordData]]:
+        """
+        Scan and build records in the background while the caller consumes them.
+
+        Args:
+            source: A directory to walk, or an iterable of file paths.
+        Yields:
+            ObjectReceiveStream[FileRecordData]: Records; files that cannot be read are skipped.
+        """
+        paths_send, paths_receive = anyio.create_memory_object_stream[str](
+            self.concurrency
+        )
+        records_send, records_receive = anyio.create_memory_object_stream[
+            FileRecordData
+        ](self.concurrency)
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self._feed_paths, source, paths_send)
+            async with paths_receive, records_send:
+                for _ in range(self.concurrency):
+                    tg.start_soon(
+                        self._build, paths_receive.clone(), records_send.clone()
+                    )
+            try:
+                async with records_receive:
+                    yield records_receive
+            finally:
+                # Stop producers if the caller leaves before the scan is done.
+                tg.cancel_scope.cancel()
+
+    async def iter_records(
+        self, source: str | os.PathLike | Iterable[str | os.PathLike]
+    ) -> AsyncIterator[FileRecordData]:
+        """Yield records for a directory or a list of files; see open_records()."""
+        async with self.open_records(source) as records:
+            try:
+                async for record in records:
+                    yield record
+            except GeneratorExit:
+                # Closed early: leave the task group without an error.
+                return
+
+    async def _feed_paths(self, source, send: ObjectSendStream[str]) -> None:
+        async with send:
+            if isinstance(source, (str, os.PathLike)):
+                await self._walk(os.path.abspath(source), send.clone())
+            else:
+                for path in source:
+                    await send.send(str(path))
+
+    async def _build(
+        self,
+        receive: ObjectReceiveStream[str],
+        send: ObjectSendStream[FileRecordData],
+    ) -> None:
+        async with receive, send:
+            async for path in receive:
+                record = await anyio.to_thread.run_sync(
+                    build_record_data, path, self.text_size_limit, limiter=self.limiter
+                )
+                if record is not None:
+                    await send.send(record)
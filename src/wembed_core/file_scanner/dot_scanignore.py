@@ -4,10 +4,11 @@ wembed_core/file_scanner/dot_scanignore.py
 Handles .scanignore files for excluding files during scanning.
 """
 
+import os
+import re
 from fnmatch import fnmatch
 from pathlib import Path
-
-from pydantic import BaseModel, Field
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 
 class DotScanIgnoreFile:
@@ -16,6 +17,9 @@ class DotScanIgnoreFile:
     patterns: list[str] = []
     file_name: str = ".scanignore"
 
+    def __init__(self, patterns: Optional[list[str]] = None):
+        self.patterns = list(patterns or [])
+
     @classmethod
     def load(cls, file_path: str | Path) -> "DotScanIgnoreFile":
         """Load patterns from a .scanignore file."""
@@ -62,3 +66,216 @@ class DotScanIgnoreFile:
     def is_present(directory: Path) -> bool:
         """Check if a .scanignore file exists in the given directory."""
         return (directory / ".scanignore").is_file()
+
+
+class _Rule(NamedTuple):
+    """One compiled .scanignore line."""
+
+    regex: str
+    negated: bool
+    dir_only: bool
+
+
+class _DirState(NamedTuple):
+    """Rules in force in a directory, compiled once and shared by its files."""
+
+    ignored: bool
+    rules: Tuple[_Rule, ...]
+    file_matcher: Optional[Tuple[re.Pattern, Dict[str, bool]]]
+    dir_matcher: Optional[Tuple[re.Pattern, Dict[str, bool]]]
+
+
+def _glob_to_regex(glob: str) -> str:
+    """Translate a gitignore-style glob; '*' stays within one path segment."""
+    out: List[str] = []
+    i, n = 0, len(glob)
+    while i < n:
+        char = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif char == "*":
+            out.append("[^/]*")
+            i += 1
+        elif char == "?":
+            out.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = glob.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+                i += 1
+                continue
+            body = glob[i + 1 : end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            out.append(re.escape(char))
+            i += 1
+    return "".join(out)
+
+
+def compile_scanignore_line(line: str, base: str = "") -> Optional[_Rule]:
+    """
+    Compile one .scanignore line, gitignore-style.
+
+    Blank lines and '#' comments are skipped, '!' re-includes, a trailing
+    '/' matches directories only, and a pattern containing '/' is anchored
+    to 'base', the directory of the .scanignore relative to the scan root.
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.strip("/") if dir_only else line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _glob_to_regex(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    if base:
+        regex = re.escape(base + "/") + regex
+    return _Rule(regex, negated, dir_only)
+
+
+def _compile(rules: Tuple[_Rule, ...]) -> Optional[Tuple[re.Pattern, Dict[str, bool]]]:
+    """
+    Combine rules into one regex in which the last matching rule wins.
+
+    Rules are emitted in reverse so the first alternative that matches is
+    the last rule in file order; its group name gives its negation flag.
+    """
+    if not rules:
+        return None
+    parts, negations = [], {}
+    for index in range(len(rules) - 1, -1, -1):
+        name = f"r{index}"
+        parts.append(f"(?P<{name}>{rules[index].regex})\\Z")
+        negations[name] = rules[index].negated
+    return re.compile("|".join(parts)), negations
+
+
+def _matches(
+    matcher: Optional[Tuple[re.Pattern, Dict[str, bool]]], rel_path: str
+) -> bool:
+    if matcher is None:
+        return False
+    pattern, negations = matcher
+    match = pattern.match(rel_path)
+    return match is not None and not negations[match.lastgroup]
+
+
+class ScanIgnoreMatcher:
+    """
+    Hierarchical .scanignore matching below a scan root.
+
+    Each directory's .scanignore is read once, its rules are appended to
+    those inherited from the parent directory, and the combined list is
+    compiled into a single regex cached for that directory. Directories
+    without a .scanignore share their parent's compiled rules, so checking
+    a file costs one dict lookup and one regex match once its directory has
+    been seen. As with gitignore, nothing below an ignored directory can be
+    re-included.
+
+    Methods:
+        is_ignored(): Check a file or directory.
+        clear(): Forget cached rules after .scanignore files change.
+    """
+
+    def __init__(self, root: str | Path):
+        """
+        Initialize the matcher.
+        Args:
+            root (str | Path): Scan root; .scanignore files above it are not read.
+        """
+        self.root = os.path.abspath(root)
+        self._prefix = self.root.rstrip(os.sep) + os.sep
+        self._dirs: Dict[str, _DirState] = {}
+
+    def _relative(self, path: str | Path) -> Optional[str]:
+        path = os.path.abspath(path)
+        if path == self.root:
+            return ""
+        if not path.startswith(self._prefix):
+            return None
+        rel = path[len(self._prefix) :]
+        return rel.replace(os.sep, "/") if os.sep != "/" else rel
+
+    def _load_rules(self, rel_dir: str) -> Tuple[_Rule, ...]:
+        """Read and compile the .scanignore of one directory, if any."""
+        directory = (
+            os.path.join(self.root, *rel_dir.split("/")) if rel_dir else self.root
+        )
+        try:
+            with open(
+                os.path.join(directory, DotScanIgnoreFile.file_name), encoding="utf-8"
+            ) as f:
+                lines = f.read().splitlines()
+        except (FileNotFoundError, NotADirectoryError):
+            return ()
+        except OSError as e:
+            print(f"Error loading .scanignore: {e}")
+            return ()
+        rules = (compile_scanignore_line(line, rel_dir) for line in lines)
+        return tuple(rule for rule in rules if rule is not None)
+
+    def _state(self, rel_dir: str) -> _DirState:
+        state = self._dirs.get(rel_dir)
+        if state is not None:
+            return state
+        if rel_dir:
+            parent = self._state(rel_dir.rpartition("/")[0])
+            ignored = parent.ignored or _matches(parent.dir_matcher, rel_dir)
+        else:
+            parent = _DirState(False, (), None, None)
+            ignored = False
+        own = () if ignored else self._load_rules(rel_dir)
+        if own:
+            rules = parent.rules + own
+            state = _DirState(
+                ignored,
+                rules,
+                _compile(tuple(r for r in rules if not r.dir_only)),
+                _compile(rules),
+            )
+        else:
+            state = parent._replace(ignored=ignored)
+        self._dirs[rel_dir] = state
+        return state
+
+    def is_ignored(self, path: str | Path, is_dir: bool = False) -> bool:
+        """
+        Check a path against the .scanignore files of its directory and ancestors.
+
+        Args:
+            path (str | Path): File or directory to check.
+            is_dir (bool): Whether 'path' is a directory.
+        Returns:
+            bool: True if the path is excluded; paths outside the root never are.
+        """
+        rel = self._relative(path)
+        if rel is None:
+            return False
+        if is_dir:
+            return self._state(rel).ignored
+        parent = self._state(rel.rpartition("/")[0])
+        return parent.ignored or _matches(parent.file_matcher, rel)
+
+    def clear(self) -> None:
+        """Drop all cached directory rules."""
+        self._dirs.clear()
+
+    @property
+    def cached_dirs(self) -> int:
+        """Number of directories whose rules are cached."""
+        return len(self._dirs)
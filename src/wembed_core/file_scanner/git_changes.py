@@ -0,0 +1,224 @@
+"""
+wembed_core/file_scanner/git_changes.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Lists the files of a git repository that changed since a given commit.
+
+Committed changes come from 'git diff --name-status -M <since> HEAD' and
+uncommitted ones from 'git status --porcelain'; the two are composed into
+the net change from the old commit to the working tree. Paths are
+relative to the repository root, with '/' separators, as git prints them.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+
+class GitChangeSet(BaseModel):
+    """
+    Net changes of a repository's tracked files since a commit.
+
+    Attributes:
+        repo_root (str): Repository root.
+        base_commit (Optional[str]): Commit the changes are relative to; None for a full listing.
+        head_commit (str): Commit checked out when the changes were listed.
+        full (bool): No usable base commit; 'added' lists every tracked file.
+        added (List[str]): Files that did not exist at the base commit.
+        modified (List[str]): Files whose content changed, including renamed files that were edited.
+        deleted (List[str]): Files removed since the base commit.
+        renamed (Dict[str, str]): New path -> path at the base commit.
+    """
+
+    repo_root: str
+    base_commit: Optional[str] = None
+    head_commit: str
+    full: bool = False
+    added: List[str] = Field(default_factory=list)
+    modified: List[str] = Field(default_factory=list)
+    deleted: List[str] = Field(default_factory=list)
+    renamed: Dict[str, str] = Field(default_factory=dict)
+
+    @property
+    def changed(self) -> List[str]:
+        """Files whose content needs to be (re)indexed."""
+        return sorted(set(self.added) | set(self.modified))
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.modified or self.deleted or self.renamed)
+
+
+def _git(repo: Path, *args: str) -> str:
+    result = subprocess.run(
+        ["git", "-C", str(repo), *args],
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="surrogateescape",
+        check=True,
+    )
+    return result.stdout
+
+
+def head_commit(repo: str | Path) -> Optional[str]:
+    """Return the full SHA of HEAD, or None if the repository has no commits."""
+    try:
+        return _git(Path(repo), "rev-parse", "--verify", "HEAD").strip()
+    except subprocess.CalledProcessError:
+        return None
+
+
+class _Changes:
+    """Mutable change state while composing commit and working-tree changes."""
+
+    def __init__(self):
+        self.added: Set[str] = set()
+        self.modified: Set[str] = set()
+        self.deleted: Set[str] = set()
+        self.renamed: Dict[str, str] = {}
+
+    def add(self, path: str) -> None:
+        if path in self.deleted:
+            self.deleted.discard(path)
+            self.modified.add(path)
+        else:
+            self.added.add(path)
+
+    def modify(self, path: str) -> None:
+        if path not in self.added:
+            self.modified.add(path)
+
+    def delete(self, path: str) -> None:
+        self.modified.discard(path)
+        if path in self.added:
+            self.added.discard(path)
+        elif path in self.renamed:
+            self.deleted.add(self.renamed.pop(path))
+        else:
+            self.deleted.add(path)
+
+    def rename(self, old: str, new: str, edited: bool) -> None:
+        if old in self.added:
+            self.added.discard(old)
+            self.added.add(new)
+            return
+        was_modified = old in self.modified
+        self.modified.discard(old)
+        base = self.renamed.pop(old, old)
+        if base == new:
+            # Renamed back to its original path.
+            if edited or was_modified:
+                self.modified.add(new)
+            return
+        self.deleted.discard(new)
+        self.renamed[new] = base
+        if edited or was_modified:
+            self.modified.add(new)
+
+
+def _apply_diff(changes: _Changes, output: str) -> None:
+    """Apply 'git diff --name-status -M -z' output."""
+    fields = output.split("\0")
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i]
+        kind = status[0]
+        if kind in "RC":
+            old, new = fields[i + 1], fields[i + 2]
+            i += 3
+            if kind == "R":
+                changes.rename(old, new, edited=status[1:] != "100")
+            else:
+                changes.add(new)
+            continue
+        path = fields[i + 1]
+        i += 2
+        if kind == "A":
+            changes.add(path)
+        elif kind == "D":
+            changes.delete(path)
+        else:
+            changes.modify(path)
+
+
+def _apply_status(changes: _Changes, output: str) -> None:
+    """Apply 'git status --porcelain=v1 -z' output; untracked and ignored files are skipped."""
+    fields = output.split("\0")
+    i = 0
+    while i < len(fields) and fields[i]:
+        entry = fields[i]
+        xy, path = entry[:2], entry[3:]
+        i += 1
+        if xy in ("??", "!!"):
+            continue
+        if xy[0] in "RC":
+            old = fields[i]
+            i += 1
+            if xy[0] == "R":
+                changes.rename(old, path, edited=xy[1] not in " D")
+            else:
+                changes.add(path)
+            if xy[1] == "D":
+                changes.delete(path)
+            continue
+        if "D" in xy:
+            changes.delete(path)
+        elif xy[0] == "A":
+            changes.add(path)
+        else:
+            changes.modify(path)
+
+
+def list_tracked_files(repo: str | Path) -> List[str]:
+    """Every tracked file, relative to the repository root."""
+    output = _git(Path(repo), "ls-files", "-z")
+    return [f for f in output.split("\0") if f]
+
+
+def collect_changes(repo: str | Path, since: Optional[str]) -> GitChangeSet:
+    """
+    List the tracked files that changed between 'since' and the working tree.
+
+    Args:
+        repo (str | Path): Repository root.
+        since (Optional[str]): Last indexed commit. If None or no longer
+            reachable, every tracked file is reported as added.
+    Returns:
+        GitChangeSet: The net changes.
+    Raises:
+        subprocess.CalledProcessError: If 'repo' is not a git repository.
+    """
+    repo = Path(repo)
+    head = head_commit(repo) or ""
+    if since and head:
+        try:
+            diff = _git(repo, "diff", "--name-status", "-M", "-z", since, head)
+        except subprocess.CalledProcessError:
+            since = None
+    else:
+        since = None
+    if since is None:
+        return GitChangeSet(
+            repo_root=str(repo),
+            head_commit=head,
+            full=True,
+            added=sorted(list_tracked_files(repo)),
+        )
+
+    changes = _Changes()
+    _apply_diff(changes, diff)
+    _apply_status(
+        changes,
+        _git(repo, "status", "--porcelain=v1", "-z", "--untracked-files=no"),
+    )
+    return GitChangeSet(
+        repo_root=str(repo),
+        base_commit=since,
+        head_commit=head,
+        added=sorted(changes.added),
+        modified=sorted(changes.modified),
+        deleted=sorted(changes.deleted),
+        renamed=dict(sorted(changes.renamed.items())),
+    )
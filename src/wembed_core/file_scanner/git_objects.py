@@ -0,0 +1,240 @@
+"""
+wembed_core/file_scanner/git_objects.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Reads file fingerprints and content straight from a repository's object store.
+
+'git ls-files -s' gives the blob id of every tracked file in one call.
+Sizes come from 'git cat-file --batch-check' and content from one
+long-running 'git cat-file --batch', so unchanged files can be
+recognized by their blob id without opening them.
+
+A blob is the file as committed, which is not what is checked out when
+.gitattributes filters or end-of-line conversion apply (LFS pointers,
+eol=crlf, core.autocrlf). filtered_paths() finds those files so they can
+be read from disk instead.
+"""
+
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+# Regular and executable files; symlinks (120000) and submodules (160000)
+# have no content of their own to index.
+BLOB_MODES = frozenset({"100644", "100755"})
+
+# Attributes under which checkout rewrites a blob.
+CONVERSION_ATTRIBUTES = ("filter", "eol", "text", "ident", "working-tree-encoding")
+# Those that apply even to files marked -text.
+_FILTER_ATTRIBUTES = ("filter", "ident", "working-tree-encoding")
+
+
+class GitBlob(NamedTuple):
+    """
+    A tracked file as recorded in the index.
+
+    Attributes:
+        path (str): Path relative to the repository root, with '/' separators.
+        mode (str): Git file mode, e.g. '100644'.
+        sha (str): Blob object id.
+        size (int): Blob size in bytes, or -1 if not looked up.
+    """
+
+    path: str
+    mode: str
+    sha: str
+    size: int = -1
+
+
+def list_blobs(repo: str | Path, with_sizes: bool = False) -> List[GitBlob]:
+    """
+    List the tracked regular files of a repository with their blob ids.
+
+    Args:
+        repo (str | Path): Repository root.
+        with_sizes (bool): Also look up blob sizes with 'cat-file --batch-check'.
+    Returns:
+        List[GitBlob]: One entry per file, in index order.
+    Raises:
+        subprocess.CalledProcessError: If 'repo' is not a git repository.
+    """
+    result = subprocess.run(
+        ["git", "-C", str(repo), "ls-files", "-s", "-z"],
+        capture_output=True,
+        check=True,
+    )
+    blobs: List[GitBlob] = []
+    seen: Set[str] = set()
+    for entry in result.stdout.split(b"\0"):
+        if not entry:
+            continue
+        meta, _, raw_path = entry.partition(b"\t")
+        mode, sha, _stage = meta.decode("ascii").split(" ")
+        path = raw_path.decode("utf-8", errors="surrogateescape")
+        # Unmerged paths appear once per stage; keep the first.
+        if mode not in BLOB_MODES or path in seen:
+            continue
+        seen.add(path)
+        blobs.append(GitBlob(path, mode, sha))
+    if with_sizes:
+        sizes = blob_sizes(repo, (b.sha for b in blobs))
+        blobs = [b._replace(size=sizes.get(b.sha, -1)) for b in blobs]
+    return blobs
+
+
+def blob_sizes(repo: str | Path, shas: Iterable[str]) -> Dict[str, int]:
+    """Look up blob sizes with one 'git cat-file --batch-check' call; missing blobs are omitted."""
+    request = "".join(f"{sha}\n" for sha in dict.fromkeys(shas))
+    if not request:
+        return {}
+    result = subprocess.run(
+        ["git", "-C", str(repo), "cat-file", "--batch-check"],
+        input=request.encode("ascii"),
+        capture_output=True,
+        check=True,
+    )
+    sizes: Dict[str, int] = {}
+    for line in result.stdout.decode("ascii").splitlines():
+        parts = line.split(" ")
+        if len(parts) == 3 and parts[1] == "blob":
+            sizes[parts[0]] = int(parts[2])
+    return sizes
+
+
+def worktree_changes(repo: str | Path) -> Set[str]:
+    """
+    Tracked files whose working tree or staged content differs from HEAD.
+
+    The blob ids of these files cannot be trusted for the content on disk,
+    so they have to be read from the file system.
+    """
+    result = subprocess.run(
+        [
+            "git",
+            "-C",
+            str(repo),
+            "status",
+            "--porcelain=v1",
+            "-z",
+            "--untracked-files=no",
+            "--no-renames",
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return {
+        entry[3:].decode("utf-8", errors="surrogateescape")
+        for entry in result.stdout.split(b"\0")
+        if entry
+    }
+
+
+def filtered_paths(repo: str | Path, paths: Iterable[str]) -> Set[str]:
+    """
+    Tracked files whose checked-out content may differ from their blob.
+
+    These are files with a clean/smudge filter (e.g. LFS), an eol, ident
+    or working-tree-encoding attribute, or a text attribute; with
+    core.autocrlf=true every file not marked -text is included.
+
+    Args:
+        repo (str | Path): Repository root.
+        paths (Iterable[str]): Paths relative to the root, with '/' separators.
+    Returns:
+        Set[str]: The subset of 'paths' to read from disk.
+    """
+    request = b"".join(
+        p.encode("utf-8", errors="surrogateescape") + b"\0" for p in paths
+    )
+    if not request:
+        return set()
+    result = subprocess.run(
+        ["git", "-C", str(repo), "check-attr", "-z", "--stdin", *CONVERSION_ATTRIBUTES],
+        input=request,
+        capture_output=True,
+        check=True,
+    )
+    autocrlf = subprocess.run(
+        ["git", "-C", str(repo), "config", "--get", "core.autocrlf"],
+        capture_output=True,
+        text=True,
+    ).stdout.strip().lower() in ("true", "yes", "on", "1")
+
+    fields = result.stdout.split(b"\0")
+    attributes: Dict[str, Dict[str, str]] = {}
+    for i in range(0, len(fields) - 2, 3):
+        path = fields[i].decode("utf-8", errors="surrogateescape")
+        attr, value = fields[i + 1].decode(), fields[i + 2].decode()
+        attributes.setdefault(path, {})[attr] = value
+
+    def specified(values: Dict[str, str], attr: str) -> bool:
+        return values.get(attr, "unspecified") not in ("unspecified", "unset")
+
+    filtered: Set[str] = set()
+    for path, values in attributes.items():
+        if any(specified(values, a) for a in _FILTER_ATTRIBUTES):
+            filtered.add(path)
+        elif values.get("text") != "unset" and (
+            autocrlf or specified(values, "text") or specified(values, "eol")
+        ):
+            filtered.add(path)
+    return filtered
+
+
+def iter_blob_contents(
+    repo: str | Path, shas: Iterable[str]
+) -> Iterator[Tuple[str, Optional[bytes]]]:
+    """
+    Stream blob contents through a single 'git cat-file --batch' process.
+
+    Requests are written from a background thread so neither side of the
+    pipe blocks on a full buffer.
+
+    Args:
+        repo (str | Path): Repository root.
+        shas (Iterable[str]): Blob ids to read.
+    Yields:
+        Tuple[str, Optional[bytes]]: Each requested id, in order, with its
+        content, or None if the object is missing or not a blob.
+    """
+    shas = list(shas)
+    if not shas:
+        return
+    proc = subprocess.Popen(
+        ["git", "-C", str(repo), "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+    def feed() -> None:
+        try:
+            for sha in shas:
+                proc.stdin.write(f"{sha}\n".encode("ascii"))
+        except (BrokenPipeError, ValueError):
+            pass
+        finally:
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    writer = threading.Thread(target=feed, name="git-cat-file-feed", daemon=True)
+    writer.start()
+    try:
+        for sha in shas:
+            header = proc.stdout.readline().decode("ascii").split()
+            if len(header) != 3:
+                # '<sha> missing'
+                yield sha, None
+                continue
+            size = int(header[2])
+            content = proc.stdout.read(size)
+            proc.stdout.read(1)  # trailing LF
+            yield sha, content if header[1] == "blob" else None
+    finally:
+        proc.stdout.close()
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+        writer.join()
@@ -0,0 +1,151 @@
+"""
+wembed_core/file_scanner/hashing.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Single-pass file hashing with bounded memory.
+
+Small files are read once and kept for text extraction. Larger files are
+fed to every hasher chunk by chunk (through an mmap view above
+MMAP_THRESHOLD), so peak memory stays around one chunk whatever the file
+size. hashlib releases the GIL while hashing large buffers, so for big
+files the hashers run side by side on worker threads.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Sequence
+
+from pydantic import BaseModel
+
+HASH_ALGORITHMS = ("sha256", "md5")
+HASH_CHUNK_SIZE = 4 * 1024 * 1024
+MMAP_THRESHOLD = 64 * 1024 * 1024
+# Files up to this size keep their bytes so the text can be decoded.
+DEFAULT_TEXT_SIZE_LIMIT = 16 * 1024 * 1024
+# Below this size a second thread costs more than it saves.
+PARALLEL_HASH_THRESHOLD = 8 * 1024 * 1024
+
+_hash_pool: Optional[ThreadPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(
+                max_workers=len(HASH_ALGORITHMS), thread_name_prefix="file-hash"
+            )
+        return _hash_pool
+
+
+def _reset_pool() -> None:
+    """Forget the hash pool: a forked child inherits it without its threads."""
+    global _hash_pool, _hash_pool_lock
+    _hash_pool = None
+    _hash_pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pool)
+
+
+class FileDigest(BaseModel):
+    """
+    Hashes of a file's content, computed in one pass.
+
+    Attributes:
+        size (int): Number of bytes hashed.
+        hashes (Dict[str, str]): Algorithm name -> hex digest.
+        content (Optional[bytes]): The content, if it was within the text size limit.
+    """
+
+    size: int
+    hashes: Dict[str, str]
+    content: Optional[bytes] = None
+
+    @property
+    def sha256(self) -> str:
+        return self.hashes["sha256"]
+
+    @property
+    def md5(self) -> str:
+        return self.hashes["md5"]
+
+
+def digest_bytes(
+    content: bytes, algorithms: Sequence[str] = HASH_ALGORITHMS
+) -> FileDigest:
+    """Hash content that is already in memory; the digest keeps a reference to it."""
+    return FileDigest(
+        size=len(content),
+        hashes={name: hashlib.new(name, content).hexdigest() for name in algorithms},
+        content=content,
+    )
+
+
+def _update_all(hashers: list, chunk: memoryview, parallel: bool) -> None:
+    if not parallel:
+        for hasher in hashers:
+            hasher.update(chunk)
+        return
+    futures = [_pool().submit(hasher.update, chunk) for hasher in hashers[1:]]
+    hashers[0].update(chunk)
+    for future in futures:
+        future.result()
+
+
+def hash_file(
+    path: str | Path,
+    algorithms: Sequence[str] = HASH_ALGORITHMS,
+    text_size_limit: int = DEFAULT_TEXT_SIZE_LIMIT,
+    chunk_size: int = HASH_CHUNK_SIZE,
+    mmap_threshold: int = MMAP_THRESHOLD,
+) -> FileDigest:
+    """
+    Hash a file with several algorithms in a single read pass.
+
+    Args:
+        path (str | Path): File to hash.
+        algorithms (Sequence[str]): hashlib algorithm names.
+        text_size_limit (int): Keep the content if the file is at most this many bytes.
+        chunk_size (int): Bytes fed to the hashers per step for larger files.
+        mmap_threshold (int): Map files of at least this size instead of reading them.
+    Returns:
+        FileDigest: Size, hex digests and, for small files, the content.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= text_size_limit:
+            return digest_bytes(f.read(), algorithms)
+
+        hashers = [hashlib.new(name) for name in algorithms]
+        parallel = len(hashers) > 1 and size >= PARALLEL_HASH_THRESHOLD
+        total = 0
+        if size and size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for start in range(0, len(view), chunk_size):
+                        chunk = view[start : start + chunk_size]
+                        _update_all(hashers, chunk, parallel)
+                        chunk.release()
+                    total = len(view)
+                finally:
+                    view.release()
+        else:
+            buffer = bytearray(chunk_size)
+            view = memoryview(buffer)
+            while True:
+                read = f.readinto(buffer)
+                if not read:
+                    break
+                _update_all(hashers, view[:read], parallel)
+                total += read
+    return FileDigest(
+        size=total,
+        hashes={name: h.hexdigest() for name, h in zip(algorithms, hashers)},
+    )
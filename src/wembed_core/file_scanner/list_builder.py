@@ -5,21 +5,22 @@ Builds lists of files to process based on various criteria.
 """
 
 import fnmatch
+import os
 from enum import Enum
 from pathlib import Path
 from sys import prefix
-from typing import List, Optional, Set
+from typing import Callable, List, Optional, Sequence, Set
 
 from pydantic import BaseModel, Field, computed_field
 
-from wembed_core.constants import (
-    IGNORE_EXTENSIONS,
-    IGNORE_PARTS,
-    OBSIDIAN_MARKER,
-    REPO_MARKER,
-)
+from wembed_core.constants import IGNORE_EXTENSIONS, IGNORE_PARTS
 
-from .dot_scanignore import DotScanIgnoreFile
+from .dot_scanignore import DotScanIgnoreFile, ScanIgnoreMatcher
+from .git_changes import GitChangeSet, collect_changes
+from .git_objects import GitBlob, list_blobs
+from .path_table import PathTable
+from .walker import FileTreeWalker, WalkResult
+from .watcher import FileWatcher, WatchBatch
 
 
 class ListBuilderModes(str, Enum):
@@ -78,7 +79,7 @@ class ListBuilderOptions(BaseModel):
 class ListBuilder:
     """Builds lists of files to process based on inclusion/exclusion criteria."""
 
-    all_files: Optional[List[Path]] = Field(
+    all_files: Optional[Sequence[Path]] = Field(
         default=None, description="All possible files found depending on mode."
     )
     filtered_files: Optional[List[Path]] = Field(
@@ -92,10 +93,15 @@ class ListBuilder:
     )
     options: ListBuilderOptions
     marked_dirs: Optional[Set[Path]] = None
+    walk_result: Optional[WalkResult] = None
+    scanignore: ScanIgnoreMatcher
 
     def __init__(self, options: ListBuilderOptions):
 
         self.options = options
+        # The class-level Field() defaults are FieldInfo objects, not values.
+        self.all_files = None
+        self.filtered_files = None
         self.mode = ListBuilderModes(options.mode) if options.mode else None
         self.root = options.root_path.resolve() if options.root_path else None
         if self.mode == ListBuilderModes.FULL:
@@ -107,9 +113,10 @@ class ListBuilder:
         # Business logic to populate all_files
         if not (self.root and self.root.exists()):
             raise ValueError("Invalid or missing root path; cannot scan files.")
+        self.scanignore = ScanIgnoreMatcher(self.root)
 
-    def get_git_files(self) -> Optional[List[Path]]:
-        """Get list of files tracked by git in the repository."""
+    def get_git_files(self) -> Optional[Sequence[Path]]:
+        """Get the files tracked by git in the repository as a compact PathTable."""
         import subprocess
 
         if not self.root or not (self.root / ".git").exists():
@@ -123,14 +130,37 @@ class ListBuilder:
                 text=True,
                 check=True,
             )
-            files = [
-                self.root / f.strip() for f in result.stdout.splitlines() if f.strip()
-            ]
-            return files
+            root = str(self.root)
+            return PathTable(
+                os.path.join(root, f.strip())
+                for f in result.stdout.splitlines()
+                if f.strip()
+            )
         except subprocess.CalledProcessError as e:
             print(f"Error getting git files: {e}")
             return []
 
+    def get_git_blobs(self, include_empty: bool = False) -> List[GitBlob]:
+        """
+        Get the tracked files with their git blob ids and sizes, taken from the
+        index and the object store instead of stat'ing every file.
+        """
+        if not self.root or not (self.root / ".git").exists():
+            return []
+        blobs = list_blobs(self.root, with_sizes=True)
+        if include_empty:
+            return blobs
+        return [b for b in blobs if b.size != 0]
+
+    def get_git_changes(self, since: Optional[str]) -> Optional[GitChangeSet]:
+        """
+        List the tracked files that changed since commit 'since', including
+        uncommitted changes. Returns None if the root is not a git repository.
+        """
+        if not self.root or not (self.root / ".git").exists():
+            return None
+        return collect_changes(self.root, since)
+
     def process_paths_for_subdirs(
         self,
     ) -> tuple[List[str], List[str]]:
@@ -180,11 +210,8 @@ class ListBuilder:
         Returns:
             bool: True if any part of the path matches an ignored segment, False otherwise.
         """
-        if DotScanIgnoreFile.is_present(item.parent):
-            scanignore = self.try_load_scanignore(item.parent)
-            if scanignore:
-                if scanignore.apply_exclude_patterns([item]):
-                    return True
+        if self.scanignore.is_ignored(item):
+            return True
         return any(seg in self.options.ignored_file_parts for seg in item.parts)
 
     def path_has_ignored_extension(self, item: Path) -> bool:
@@ -200,11 +227,8 @@ class ListBuilder:
         Returns:
             bool: True if the file's extension matches an ignored extension, False otherwise.
         """
-        if DotScanIgnoreFile.is_present(item.parent):
-            scanignore = self.try_load_scanignore(item.parent)
-            if scanignore:
-                if scanignore.apply_exclude_patterns([item]):
-                    return True
+        if self.scanignore.is_ignored(item):
+            return True
         return item.suffix in self.options.ignored_extensions
 
     def try_load_scanignore(
@@ -268,18 +292,58 @@ class ListBuilder:
                 marked_dirs.add(file.resolve())
         return marked_dirs if marked_dirs else None
 
+    def walk(self, target_directory: Path) -> WalkResult:
+        """
+        Walk 'target_directory' once and cache the result.
+        Directories named in options.ignored_file_parts or excluded by
+        .scanignore files are pruned rather than filtered out afterwards.
+        The try_locate_* methods share the cached walk, and all_files is
+        filled from it if no file list has been built yet.
+        """
+        target = target_directory.resolve()
+        if self.walk_result is None or self.walk_result.root != target:
+            walker = FileTreeWalker(
+                prune=self.options.ignored_file_parts or (),
+                scanignore=self.scanignore,
+            )
+            self.walk_result = walker.walk(target)
+        if not self.all_files:
+            self.all_files = self.walk_result.files
+        return self.walk_result
+
+    def watch(
+        self,
+        on_changes: Callable[[WatchBatch], None],
+        start: bool = True,
+        **kwargs,
+    ) -> FileWatcher:
+        """
+        Watch the root for changes, with the same pruning and .scanignore rules as walk().
+        Args:
+            on_changes (Callable[[WatchBatch], None]): Receives each coalesced batch of changes.
+            start (bool): Start the watcher's background thread.
+            **kwargs: Passed to FileWatcher (debounce_s, max_latency_s, backend, ...).
+        Returns:
+            FileWatcher: The watcher; call stop() when done.
+        """
+        watcher = FileWatcher(
+            self.root,
+            on_changes,
+            prune=self.options.ignored_file_parts or (),
+            scanignore=self.scanignore,
+            **kwargs,
+        )
+        if start:
+            watcher.start()
+        return watcher
+
     def try_locate_obsidian_vaults(
         self, target_directory: Optional[Path]
     ) -> Optional[Set[Path]]:
         """Returns a set of the root folders containing a `.obsidian` folder."""
         if not target_directory:
             return None
-        if not self.all_files:
-            self.all_files = target_directory.rglob("*")
-        vault_dirs = set()
-        for file in self.all_files:
-            if file.is_dir() and file.name == OBSIDIAN_MARKER:
-                vault_dirs.add(file.parent.resolve())
+        vault_dirs = set(self.walk(target_directory).obsidian_vaults)
         return vault_dirs if vault_dirs else None
 
     def try_locate_repositories(
@@ -288,12 +352,7 @@ class ListBuilder:
         """Returns a set of the root folders containing a `.git` folder."""
         if not target_directory:
             return None
-        if not self.all_files:
-            self.all_files = target_directory.rglob("*")
-        repo_dirs = set()
-        for file in self.all_files:
-            if file.is_dir() and file.name == REPO_MARKER:
-                repo_dirs.add(file.parent.resolve())
+        repo_dirs = set(self.walk(target_directory).repositories)
         return repo_dirs if repo_dirs else None
 
     def try_locate_images(
@@ -302,27 +361,7 @@ class ListBuilder:
         """Returns a set of image file paths."""
         if not target_directory:
             return None
-        if not self.all_files:
-            self.all_files = target_directory.rglob("*")
-        image_files = set()
-        image_extensions = {
-            ".png",
-            ".jpg",
-            ".jpeg",
-            ".gif",
-            ".bmp",
-            ".tiff",
-            ".svg",
-            ".webp",
-            ".nef",
-            ".cr2",
-            ".arw",
-            ".orf",
-            ".rw2",
-        }
-        for file in self.all_files:
-            if file.is_file() and file.suffix.lower() in image_extensions:
-                image_files.add(file.resolve())
+        image_files = set(self.walk(target_directory).images)
         return image_files if image_files else None
 
     def try_locate_dL_ingestiable_files(
@@ -331,28 +370,5 @@ class ListBuilder:
         """Returns a set of the root folders containing dL ingestiable files."""
         if not target_directory:
             return None
-        if not self.all_files:
-            self.all_files = target_directory.rglob("*")
-        dl_input_dirs = set()
-        dl_input_extensions = {
-            ".pdf",
-            ".docx",
-            ".pptx",
-            ".xlsx",
-            ".html",
-            ".xhtml",
-            ".wav",
-            ".mp3",
-            ".vtt",
-            ".csv",
-            ".png",
-            ".tiff",
-            ".jpeg",
-            ".webp",
-            ".bmp",
-            ".jpeg",
-        }
-        for file in self.all_files:
-            if file.is_file() and file.suffix.lower() in dl_input_extensions:
-                dl_input_dirs.add(file.parent.resolve())
+        dl_input_dirs = set(self.walk(target_directory).docling_dirs)
         return dl_input_dirs if dl_input_dirs else None
@@ -0,0 +1,177 @@
+"""
+wembed_core/file_scanner/path_resolver.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Resolves scanned paths to their IndexedFiles records in memory.
+"""
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+
+from wembed_core.database import DatabaseService
+from wembed_core.enums import FileChangeStates
+from wembed_core.models.indexing import IndexedFiles
+
+from .utils import current_host
+
+# Sorts directly after os.sep, so [root + sep, root + _SEP_NEXT) is every
+# path below root and the range can be answered from the (host, path) index.
+_SEP_NEXT = chr(ord(os.sep) + 1)
+
+
+class PathRecord(NamedTuple):
+    """The fields of an IndexedFiles row needed to classify a rescanned file."""
+
+    id: str
+    size: int
+    mtime: float
+    sha256: str
+    version: int
+
+
+class ResolvedPaths(BaseModel):
+    """
+    Scanned paths grouped by how they compare with the index.
+
+    Attributes:
+        unchanged (List[str]): Same size and mtime as the indexed record.
+        modified (List[str]): Indexed, but the size or mtime differs.
+        new (List[str]): No indexed record.
+        deleted (List[str]): Indexed under the root but not scanned.
+        failed (List[str]): Scanned but could not be stat'ed; neither
+            classified nor reported as deleted.
+    """
+
+    unchanged: List[str] = Field(default_factory=list)
+    modified: List[str] = Field(default_factory=list)
+    new: List[str] = Field(default_factory=list)
+    deleted: List[str] = Field(default_factory=list)
+    failed: List[str] = Field(default_factory=list)
+
+
+def _timestamp(value: datetime) -> float:
+    """Naive datetimes are stored in UTC by create_file_record_from_path()."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class PathRecordResolver:
+    """
+    Bulk-loads 'path -> record' for a source root so rescans need no per-file query.
+
+    Methods:
+        load(): Load every record below a root with one query.
+        get(): Look up the record of a path.
+        classify(): Compare one file's size and mtime with its record.
+        classify_paths(): Stat and classify many files.
+    """
+
+    def __init__(self, db_service: DatabaseService, host: Optional[str] = None):
+        """
+        Initialize the resolver.
+        Args:
+            db_service (DatabaseService): Database holding the file records.
+            host (Optional[str]): Host whose records are resolved; defaults to this machine.
+        """
+        self._db_service = db_service
+        self.host = host or current_host()
+        self.records: Dict[str, PathRecord] = {}
+
+    def load(self, root: str | Path) -> int:
+        """
+        Load the newest record of every indexed path below 'root'.
+
+        Records of one path are ordered by version, then modification and
+        creation time, then id; the last one wins.
+
+        Args:
+            root (str | Path): The source root about to be rescanned.
+        Returns:
+            int: Number of paths loaded.
+        """
+        prefix = str(root).rstrip(os.sep) + os.sep
+        stmt = (
+            select(
+                IndexedFiles.path,
+                IndexedFiles.id,
+                IndexedFiles.size,
+                IndexedFiles.mtime_iso,
+                IndexedFiles.sha256,
+                IndexedFiles.version,
+            )
+            .where(
+                IndexedFiles.host == self.host,
+                IndexedFiles.path >= prefix,
+                IndexedFiles.path < prefix[:-1] + _SEP_NEXT,
+            )
+            .order_by(
+                IndexedFiles.version,
+                IndexedFiles.mtime_iso,
+                IndexedFiles.created_at,
+                IndexedFiles.id,
+            )
+        )
+        records: Dict[str, PathRecord] = {}
+        with self._db_service.get_db() as db:
+            for path, file_id, size, mtime, sha256, version in db.execute(stmt):
+                records[path] = PathRecord(
+                    file_id, size, _timestamp(mtime), sha256, version
+                )
+        self.records = records
+        return len(records)
+
+    def get(self, path: str | Path) -> Optional[PathRecord]:
+        """Return the loaded record of a path, or None."""
+        return self.records.get(str(path))
+
+    def classify(self, path: str | Path, size: int, mtime: float) -> FileChangeStates:
+        """
+        Classify a file from its current size and mtime.
+
+        Args:
+            path (str | Path): Path of the scanned file.
+            size (int): Current size in bytes.
+            mtime (float): Current modification time as a POSIX timestamp.
+        Returns:
+            FileChangeStates: UNCHANGED, MODIFIED or NEW.
+        """
+        record = self.records.get(str(path))
+        if record is None:
+            return FileChangeStates.NEW
+        # DateTime columns keep microseconds, so allow for the rounding.
+        if record.size == size and abs(record.mtime - mtime) < 1e-5:
+            return FileChangeStates.UNCHANGED
+        return FileChangeStates.MODIFIED
+
+    def classify_paths(self, paths: Iterable[str | Path]) -> ResolvedPaths:
+        """
+        Stat and classify scanned files, and list indexed files that are gone.
+
+        Args:
+            paths (Iterable[str | Path]): Files found by the scan.
+        Returns:
+            ResolvedPaths: The paths grouped by state.
+        """
+        result = ResolvedPaths()
+        groups = {
+            FileChangeStates.UNCHANGED: result.unchanged,
+            FileChangeStates.MODIFIED: result.modified,
+            FileChangeStates.NEW: result.new,
+        }
+        seen = set()
+        for path in paths:
+            path = str(path)
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                result.failed.append(path)
+                continue
+            groups[self.classify(path, stat.st_size, stat.st_mtime)].append(path)
+        result.deleted = sorted(p for p in self.records if p not in seen)
+        return result
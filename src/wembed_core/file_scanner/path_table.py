@@ -0,0 +1,256 @@
+"""
+wembed_core/file_scanner/path_table.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Compact, prefix-compressed storage for large lists of file paths.
+
+A list of pathlib.Path objects keeps a full string and a parts tuple per
+file. PathTable instead stores each directory once as (parent, name) and
+each file as (directory, name), with every path component interned in a
+shared name list and the indexes held in typed arrays. Path objects are
+only created when an entry is read.
+"""
+
+import os
+import sys
+import tracemalloc
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class PathTable(Sequence):
+    """
+    An append-only sequence of file paths.
+
+    Behaves like a list of Path objects for iteration, indexing, len() and
+    membership tests, so it can stand in for ListBuilder's file lists.
+    """
+
+    __slots__ = (
+        "_names",
+        "_name_ids",
+        "_dir_parent",
+        "_dir_name",
+        "_dir_ids",
+        "_file_dir",
+        "_file_name",
+        "_last_dir",
+    )
+
+    def __init__(self, paths: Iterable[str | Path] = ()):
+        self._names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._dir_parent = array("i")
+        self._dir_name = array("I")
+        self._dir_ids: Dict[Tuple[int, int], int] = {}
+        self._file_dir = array("I")
+        self._file_name = array("I")
+        self._last_dir: Tuple[Optional[str], int] = (None, -1)
+        self.extend(paths)
+
+    # -- building ---------------------------------------------------------
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = name_id
+        return name_id
+
+    def _dir_for(self, dirname: str) -> int:
+        """Return the id of a directory, creating it and its parents as needed."""
+        head, tail = os.path.split(dirname)
+        if not tail:
+            if head != dirname:
+                return self._dir_for(head)
+            key = (-1, self._intern(head))
+        else:
+            key = (self._dir_for(head), self._intern(tail))
+        dir_id = self._dir_ids.get(key)
+        if dir_id is None:
+            dir_id = len(self._dir_parent)
+            self._dir_parent.append(key[0])
+            self._dir_name.append(key[1])
+            self._dir_ids[key] = dir_id
+        return dir_id
+
+    def append(self, path: str | Path) -> int:
+        """
+        Add a path and return its index.
+
+        Scanners emit files grouped by directory, so the directory of the
+        previous path is remembered to skip the parent lookup.
+        """
+        dirname, name = os.path.split(os.fspath(path))
+        last_name, dir_id = self._last_dir
+        if dirname != last_name:
+            dir_id = self._dir_for(dirname)
+            self._last_dir = (dirname, dir_id)
+        self._file_dir.append(dir_id)
+        self._file_name.append(self._intern(name))
+        return len(self._file_dir) - 1
+
+    def extend(self, paths: Iterable[str | Path]) -> None:
+        """Add every path of an iterable."""
+        for path in paths:
+            self.append(path)
+
+    # -- reading ----------------------------------------------------------
+
+    def _dir_str(self, dir_id: int) -> str:
+        parts = []
+        while dir_id >= 0:
+            parts.append(self._names[self._dir_name[dir_id]])
+            dir_id = self._dir_parent[dir_id]
+        return os.path.join(*reversed(parts))
+
+    def path_str(self, index: int) -> str:
+        """Return the path at 'index' as a string."""
+        return os.path.join(
+            self._dir_str(self._file_dir[index]),
+            self._names[self._file_name[index]],
+        )
+
+    def iter_str(self) -> Iterator[str]:
+        """Yield every path as a string, building each directory string once."""
+        dir_strs: Dict[int, str] = {}
+        names = self._names
+        for dir_id, name_id in zip(self._file_dir, self._file_name):
+            dir_str = dir_strs.get(dir_id)
+            if dir_str is None:
+                dir_str = dir_strs[dir_id] = self._dir_str(dir_id)
+            yield os.path.join(dir_str, names[name_id])
+
+    def __iter__(self) -> Iterator[Path]:
+        return map(Path, self.iter_str())
+
+    def __len__(self) -> int:
+        return len(self._file_dir)
+
+    def __getitem__(self, index: int | slice) -> Path | List[Path]:
+        if isinstance(index, slice):
+            return [Path(self.path_str(i)) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("PathTable index out of range")
+        return Path(self.path_str(index))
+
+    def _find_dir(self, dirname: str) -> Optional[int]:
+        """Look up a directory id without adding anything."""
+        head, tail = os.path.split(dirname)
+        if not tail:
+            if head != dirname:
+                return self._find_dir(head)
+            parent: Optional[int] = -1
+            name = head
+        else:
+            parent, name = self._find_dir(head), tail
+        name_id = self._name_ids.get(name)
+        if parent is None or name_id is None:
+            return None
+        return self._dir_ids.get((parent, name_id))
+
+    def __contains__(self, path: object) -> bool:
+        if not isinstance(path, (str, Path)):
+            return False
+        dirname, name = os.path.split(os.fspath(path))
+        dir_id, name_id = self._find_dir(dirname), self._name_ids.get(name)
+        if dir_id is None or name_id is None:
+            return False
+        return any(
+            d == dir_id and n == name_id
+            for d, n in zip(self._file_dir, self._file_name)
+        )
+
+    @property
+    def dir_count(self) -> int:
+        """Number of distinct directories."""
+        return len(self._dir_parent)
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the table, in bytes.
+
+        Counts the arrays, the interned names and the lookup dictionaries,
+        including their keys.
+        """
+        arrays = (self._dir_parent, self._dir_name, self._file_dir, self._file_name)
+        total = sum(sys.getsizeof(a) for a in arrays)
+        total += sys.getsizeof(self._names) + sys.getsizeof(self._name_ids)
+        total += sum(sys.getsizeof(name) for name in self._names)
+        total += sys.getsizeof(self._dir_ids)
+        total += sum(
+            sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(key[1])
+            for key in self._dir_ids
+        )
+        return total
+
+
+class PathMemoryReport(BaseModel):
+    """
+    Memory use of a PathTable compared with a list of Path objects.
+
+    Attributes:
+        entries (int): Number of paths measured.
+        directories (int): Number of distinct directories.
+        table_bytes (int): Bytes allocated while building the PathTable.
+        path_list_bytes (int): Bytes allocated for the equivalent List[Path].
+        table_bytes_per_million (float): table_bytes scaled to one million entries.
+        path_list_bytes_per_million (float): path_list_bytes scaled to one million entries.
+    """
+
+    entries: int
+    directories: int
+    table_bytes: int
+    path_list_bytes: int
+    table_bytes_per_million: float
+    path_list_bytes_per_million: float
+
+
+def _traced_bytes(build) -> Tuple[object, int]:
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def measure_path_memory(paths: Iterable[str]) -> PathMemoryReport:
+    """
+    Measure the memory a PathTable saves over a list of Path objects.
+
+    Both structures are built from the same strings under tracemalloc. The
+    Path list has its 'parts' materialised, as ListBuilder's ignore checks
+    do for every file.
+
+    Args:
+        paths (Iterable[str]): Sample paths, ideally from a real tree.
+    Returns:
+        PathMemoryReport: Allocated bytes in total and per million entries.
+    """
+    paths = list(paths)
+
+    def build_list() -> List[Path]:
+        items = [Path(p) for p in paths]
+        for item in items:
+            item.parts
+        return items
+
+    table, table_bytes = _traced_bytes(lambda: PathTable(paths))
+    _, list_bytes = _traced_bytes(build_list)
+    scale = 1_000_000 / max(len(paths), 1)
+    return PathMemoryReport(
+        entries=len(paths),
+        directories=table.dir_count,
+        table_bytes=table_bytes,
+        path_list_bytes=list_bytes,
+        table_bytes_per_million=table_bytes * scale,
+        path_list_bytes_per_million=list_bytes * scale,
+    )
@@ -0,0 +1,222 @@
+"""
+wembed_core/file_scanner/record_builder.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Builds file records on a process pool.
+
+Reading, hashing, decoding and MIME detection run in worker processes on
+chunks of paths. Workers return plain FileRecordData models instead of
+ORM instances, so results pickle cheaply and the parent can bulk-insert
+them.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from wembed_core.models.indexing import IndexedFiles
+
+from . import hashing
+from .hashing import DEFAULT_TEXT_SIZE_LIMIT, hash_file
+from .utils import file_record_fields
+
+DEFAULT_RECORD_CHUNK_SIZE = 64
+
+
+class FileRecordData(BaseModel):
+    """
+    Column values of an IndexedFiles record, detached from the ORM.
+
+    Attributes mirror IndexedFiles; see that model for their meaning.
+    """
+
+    id: str
+    version: int = 1
+    host: str
+    name: str
+    stem: str
+    path: str
+    suffix: str
+    sha256: str
+    md5: str
+    size: int
+    content: Optional[bytes] = None
+    content_text: str
+    ctime_iso: datetime
+    mtime_iso: datetime
+    uri: str
+    mimetype: str
+    git_blob_sha: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    def to_orm(self) -> IndexedFiles:
+        return IndexedFiles(**self.model_dump())
+
+
+class WorkerStats(BaseModel):
+    """
+    Throughput of one worker process.
+
+    Attributes:
+        pid (int): Worker process id.
+        files (int): Files turned into records.
+        failed (int): Files that could not be read.
+        bytes (int): Bytes hashed.
+        busy_ms (float): Time spent building records.
+    """
+
+    pid: int
+    files: int = 0
+    failed: int = 0
+    bytes: int = 0
+    busy_ms: float = 0.0
+
+    @property
+    def files_per_s(self) -> float:
+        return self.files / (self.busy_ms / 1000) if self.busy_ms else 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / 1e6 / (self.busy_ms / 1000) if self.busy_ms else 0.0
+
+
+class RecordBuildResult(BaseModel):
+    """
+    Outcome of a parallel record build.
+
+    Attributes:
+        records (List[FileRecordData]): Records in the order of the input paths.
+        failed (List[str]): Paths that could not be read, in input order.
+        workers (List[WorkerStats]): Per-worker throughput, by pid.
+        elapsed_ms (float): Wall-clock time of the build.
+        inserted (int): Records stored, when built through FileScanningService.
+    """
+
+    records: List[FileRecordData] = Field(default_factory=list)
+    failed: List[str] = Field(default_factory=list)
+    workers: List[WorkerStats] = Field(default_factory=list)
+    elapsed_ms: float = 0.0
+    inserted: int = 0
+
+
+def build_record_data(
+    path: str | Path, text_size_limit: int = DEFAULT_TEXT_SIZE_LIMIT
+) -> Optional[FileRecordData]:
+    """Build the record of one file, or None if it cannot be read."""
+    path = Path(path)
+    try:
+        stat = os.stat(path)
+        digest = hash_file(path, text_size_limit=text_size_limit)
+        return FileRecordData(**file_record_fields(path, digest, stat))
+    except (OSError, ValueError):
+        return None
+
+
+def _build_chunk(
+    paths: Sequence[str], text_size_limit: int
+) -> Tuple[List[Optional[FileRecordData]], WorkerStats]:
+    """Worker entry point; module-level so it can be pickled."""
+    start = time.perf_counter()
+    stats = WorkerStats(pid=os.getpid())
+    records = []
+    for path in paths:
+        record = build_record_data(path, text_size_limit)
+        records.append(record)
+        if record is None:
+            stats.failed += 1
+        else:
+            stats.files += 1
+            stats.bytes += record.size
+    stats.busy_ms = (time.perf_counter() - start) * 1000
+    return records, stats
+
+
+def _init_worker() -> None:
+    """Drop any hash pool copied from the parent; its threads do not survive fork."""
+    hashing._reset_pool()
+
+
+class ParallelRecordBuilder:
+    """
+    Builds FileRecordData for many files across a process pool.
+
+    Paths are split into chunks of 'chunk_size' that are handed to the
+    workers; results come back in input order whatever the scheduling.
+    With one worker the chunks are built in this process.
+
+    Methods:
+        build(): Build records for a list of paths.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_RECORD_CHUNK_SIZE,
+        text_size_limit: int = DEFAULT_TEXT_SIZE_LIMIT,
+        mp_context: Optional[BaseContext] = None,
+    ):
+        """
+        Initialize the builder.
+        Args:
+            workers (Optional[int]): Worker processes; defaults to the CPU count.
+            chunk_size (int): Paths per task sent to a worker.
+            text_size_limit (int): Files above this size are hashed without loading their text.
+            mp_context (Optional[BaseContext]): multiprocessing context for the pool.
+        """
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.text_size_limit = text_size_limit
+        self.mp_context = mp_context
+
+    def build(self, paths: Sequence[str | Path]) -> RecordBuildResult:
+        """
+        Build records for 'paths'.
+
+        Args:
+            paths (Sequence[str | Path]): Files to build records for.
+        Returns:
+            RecordBuildResult: Records in input order, failures and worker stats.
+        """
+        start = time.perf_counter()
+        paths = [str(p) for p in paths]
+        chunks = [
+            paths[i : i + self.chunk_size]
+            for i in range(0, len(paths), self.chunk_size)
+        ]
+        limits = [self.text_size_limit] * len(chunks)
+        if self.workers == 1 or len(chunks) <= 1:
+            outputs = map(_build_chunk, chunks, limits)
+            return self._collect(paths, outputs, start)
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(chunks)),
+            mp_context=self.mp_context,
+            initializer=_init_worker,
+        ) as pool:
+            return self._collect(paths, pool.map(_build_chunk, chunks, limits), start)
+
+    @staticmethod
+    def _collect(paths: List[str], outputs, start: float) -> RecordBuildResult:
+        result = RecordBuildResult()
+        workers: Dict[int, WorkerStats] = {}
+        i = 0
+        for records, stats in outputs:
+            for record in records:
+                if record is None:
+                    result.failed.append(paths[i])
+                else:
+                    result.records.append(record)
+                i += 1
+            total = workers.setdefault(stats.pid, WorkerStats(pid=stats.pid))
+            total.files += stats.files
+            total.failed += stats.failed
+            total.bytes += stats.bytes
+            total.busy_ms += stats.busy_ms
+        result.workers = sorted(workers.values(), key=lambda w: w.pid)
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        return result
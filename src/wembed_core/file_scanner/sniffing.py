@@ -0,0 +1,184 @@
+"""
+wembed_core/file_scanner/sniffing.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Decides whether file content is text, and in which encoding, from its first few KB.
+
+Binaries are recognized without decoding them, and text is decoded once
+in the detected encoding. Decisions are cached per suffix once enough
+files with that suffix have agreed.
+"""
+
+import codecs
+import threading
+from typing import Dict, NamedTuple, Optional
+
+from wembed_core.enums import ContentKinds
+
+SNIFF_SIZE = 8192
+# Share of undecodable bytes tolerated before UTF-8 is given up for latin-1.
+MAX_INVALID_UTF8_RATIO = 0.01
+# Share of control characters above which latin-1 content is treated as binary.
+MAX_CONTROL_RATIO = 0.1
+# Files with a suffix that must agree before that suffix's decision is reused.
+SUFFIX_CACHE_MIN_SAMPLES = 8
+BINARY_PLACEHOLDER = "<Binary or non-text content>"
+
+# Longest BOMs first: the UTF-32-LE BOM starts with the UTF-16-LE one.
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Bytes below 0x20 that are common in text: \b \t \n \f \r and ESC.
+_TEXT_CONTROLS = frozenset(b"\b\t\n\f\r\x1b")
+_CONTROL_BYTES = bytes(b for b in range(0x20) if b not in _TEXT_CONTROLS) + b"\x7f"
+
+
+class SniffResult(NamedTuple):
+    """
+    Classification of a file's content.
+
+    Attributes:
+        kind (ContentKinds): Text or binary.
+        encoding (Optional[str]): Codec to decode text with; None for binaries.
+        errors (str): Decode error handler; 'replace' when a few invalid bytes were seen.
+    """
+
+    kind: ContentKinds
+    encoding: Optional[str] = None
+    errors: str = "strict"
+
+
+BINARY = SniffResult(ContentKinds.BINARY)
+UTF8 = SniffResult(ContentKinds.TEXT, "utf-8")
+
+
+def sniff_bytes(head: bytes) -> SniffResult:
+    """
+    Classify content from its first bytes.
+
+    Args:
+        head (bytes): The start of the content, typically SNIFF_SIZE bytes.
+    Returns:
+        SniffResult: The content kind and encoding.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return SniffResult(ContentKinds.TEXT, encoding)
+    if b"\0" in head:
+        return BINARY
+    if not head:
+        return UTF8
+
+    # final=False tolerates a multi-byte character cut off at the end of 'head'.
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return UTF8
+    except UnicodeDecodeError:
+        pass
+    decoded = head.decode("utf-8", errors="replace")
+    if decoded.count("\ufffd") <= len(head) * MAX_INVALID_UTF8_RATIO:
+        return SniffResult(ContentKinds.TEXT, "utf-8", "replace")
+
+    controls = len(head) - len(head.translate(None, _CONTROL_BYTES))
+    if controls > len(head) * MAX_CONTROL_RATIO:
+        return BINARY
+    return SniffResult(ContentKinds.TEXT, "latin-1")
+
+
+class ContentSniffer:
+    """
+    Sniffs content and caches the decision per suffix.
+
+    After SUFFIX_CACHE_MIN_SAMPLES files with the same suffix got the same
+    result, later files with that suffix reuse it: binaries are then not
+    inspected at all, and text only gets a NUL check before decoding.
+    A suffix whose files disagree is never cached.
+
+    Methods:
+        sniff(): Classify content.
+        decode(): Return the text of content, or None for binaries.
+        cached(): The cached decision for a suffix.
+    """
+
+    def __init__(
+        self, sniff_size: int = SNIFF_SIZE, min_samples: int = SUFFIX_CACHE_MIN_SAMPLES
+    ):
+        """
+        Initialize the sniffer.
+        Args:
+            sniff_size (int): Number of leading bytes inspected.
+            min_samples (int): Agreeing files needed before a suffix is cached.
+        """
+        self.sniff_size = sniff_size
+        self.min_samples = min_samples
+        self._samples: Dict[str, tuple[Optional[SniffResult], int]] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, suffix: str) -> Optional[SniffResult]:
+        """Return the cached decision for 'suffix', if there is one."""
+        result, count = self._samples.get(suffix.lower(), (None, 0))
+        return result if count >= self.min_samples else None
+
+    def sniff(self, content: bytes, suffix: str = "") -> SniffResult:
+        """
+        Classify content, using and updating the per-suffix cache.
+
+        Args:
+            content (bytes): The content, or at least its first sniff_size bytes.
+            suffix (str): File suffix, e.g. '.py'.
+        Returns:
+            SniffResult: The content kind and encoding.
+        """
+        head = content[: self.sniff_size]
+        cached = self.cached(suffix)
+        if cached is not None and (
+            cached.kind == ContentKinds.BINARY or b"\0" not in head
+        ):
+            return cached
+        result = sniff_bytes(head)
+        self._record(suffix.lower(), result)
+        return result
+
+    def decode(self, content: bytes, suffix: str = "") -> Optional[str]:
+        """
+        Decode content once in its detected encoding.
+
+        Args:
+            content (bytes): The full content.
+            suffix (str): File suffix, e.g. '.py'.
+        Returns:
+            Optional[str]: The text, or None if the content is binary.
+        """
+        result = self.sniff(content, suffix)
+        if result.kind == ContentKinds.BINARY:
+            return None
+        try:
+            return content.decode(result.encoding, result.errors)
+        except UnicodeDecodeError:
+            # Invalid bytes past the sniffed head, or a cached suffix
+            # decision that does not fit this file.
+            fresh = sniff_bytes(content[: self.sniff_size])
+            if fresh[:2] != result[:2]:
+                self._record(suffix.lower(), fresh)
+            if fresh.kind == ContentKinds.BINARY:
+                return None
+            return content.decode(fresh.encoding, "replace")
+
+    def _record(self, suffix: str, result: SniffResult) -> None:
+        if not suffix:
+            return
+        with self._lock:
+            previous, count = self._samples.get(suffix, (result, 0))
+            if previous is None or count < 0:
+                return
+            if previous[:2] == result[:2]:
+                self._samples[suffix] = (result, count + 1)
+            else:
+                # Mixed suffix: never cache it.
+                self._samples[suffix] = (None, -1)
+
+
+default_sniffer = ContentSniffer()
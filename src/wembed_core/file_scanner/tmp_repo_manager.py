@@ -4,9 +4,88 @@ wembed_core/file_scanner/tmp_repo_manager.py
 Manages a temporary clone of a git repository for file scanning.
 """
 
+import os
+import shutil
+import stat
 import subprocess
+import time
 from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterable, List, Optional
+
+from pydantic import BaseModel
+
+from wembed_core.enums import CloneStrategies
+
+from .list_builder import ListBuilderOptions
+
+
+class CloneReport(BaseModel):
+    """
+    Cost of cloning a repository with one strategy.
+
+    Attributes:
+        strategy (CloneStrategies): Strategy used.
+        elapsed_ms (float): Wall-clock time of the clone and checkout.
+        git_bytes (int): Bytes in the .git directory.
+        worktree_bytes (int): Bytes of checked-out files.
+        worktree_files (int): Number of checked-out files.
+        sparse_patterns (List[str]): Sparse-checkout patterns, for the sparse strategy.
+    """
+
+    strategy: CloneStrategies
+    elapsed_ms: float
+    git_bytes: int
+    worktree_bytes: int
+    worktree_files: int
+    sparse_patterns: List[str] = []
+
+    @property
+    def total_bytes(self) -> int:
+        return self.git_bytes + self.worktree_bytes
+
+
+def sparse_patterns(options: Optional[ListBuilderOptions]) -> tuple[List[str], bool]:
+    """
+    Sparse-checkout patterns for ListBuilderOptions, and whether they use cone mode.
+
+    Subdirectories alone use cone mode. Match patterns need non-cone
+    (gitignore-style) patterns, scoped to the subdirectories if any.
+    """
+    if options is None:
+        return [], True
+    subdirs = [
+        d.strip("/\\").replace("\\", "/")
+        for d in options.subdirs or []
+        if d.strip("/\\")
+    ]
+    matches = list(options.match_patterns or [])
+    if not matches:
+        return subdirs, True
+    if not subdirs:
+        return matches, False
+    return [f"/{d}/**/{p}" for d in subdirs for p in matches], False
+
+
+def _tree_size(path: Path, skip: str = "") -> tuple[int, int]:
+    """Total bytes and number of files below 'path', skipping directories named 'skip'."""
+    total = files = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        if skip in dirnames:
+            dirnames.remove(skip)
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+                files += 1
+            except OSError:
+                continue
+    return total, files
+
+
+def _make_writable(func, path, _exc) -> None:
+    """rmtree error handler: git marks object files read-only, which blocks deletion on Windows."""
+    os.chmod(path, stat.S_IWRITE)
+    func(path)
 
 
 class TmpRepoManager:
@@ -22,13 +101,39 @@ class TmpRepoManager:
         - repo_url: URL of the git repository to clone.
         - tmp_dir: Path to the temporary directory.
         - keep: Whether to keep the temporary directory after use.
+        - strategy: How to clone; see CloneStrategies.
+        - depth: History depth for the shallow and sparse strategies.
+        - options: ListBuilderOptions whose subdirs/match_patterns drive sparse checkout.
+        - last_report: CloneReport of the last clone, if any.
+
+    Strategies:
+        - full: plain 'git clone', all history and blobs.
+        - shallow: '--depth <depth>', only the latest commits.
+        - blobless: '--filter=blob:none', full history but blobs are
+          fetched on demand, i.e. only those of the checked-out tree.
+        - sparse: blobless and shallow, checking out only the paths
+          selected by 'options'.
 
+    Local paths are cloned through file:// so that --depth and --filter
+    take effect; filters also need 'uploadpack.allowFilter' on the source.
     """
 
-    def __init__(self, repo_url: str, app_dir: Path, keep: bool = False):
+    def __init__(
+        self,
+        repo_url: str,
+        app_dir: Path,
+        keep: bool = False,
+        strategy: CloneStrategies = CloneStrategies.FULL,
+        depth: int = 1,
+        options: Optional[ListBuilderOptions] = None,
+    ):
         self.repo_url = repo_url
         self.tmp_dir = self._init_tmp_dir(app_dir)
         self.keep = keep
+        self.strategy = CloneStrategies(strategy)
+        self.depth = depth
+        self.options = options
+        self.last_report: Optional[CloneReport] = None
 
     def _init_tmp_dir(self, app_dir: Path) -> Path:
         """Initialize the temporary directory."""
@@ -58,13 +163,28 @@ class TmpRepoManager:
             if not self.keep:
                 self._cleanup()
 
+    def _clone_source(self, repo_url: str) -> str:
+        """Local clones ignore --depth and --filter unless they go through file://."""
+        if self.strategy != CloneStrategies.FULL and os.path.isdir(repo_url):
+            return Path(repo_url).resolve().as_uri()
+        return repo_url
+
+    def _clone_args(self) -> List[str]:
+        if self.strategy == CloneStrategies.SHALLOW:
+            return ["--depth", str(self.depth)]
+        if self.strategy == CloneStrategies.BLOBLESS:
+            return ["--filter=blob:none"]
+        if self.strategy == CloneStrategies.SPARSE:
+            return ["--filter=blob:none", "--depth", str(self.depth), "--no-checkout"]
+        return []
+
     def _pull_repo_to_tmp(self, repo_url: str, tmp_dir: Path) -> bool:
         """Clone or pull the repository into the temporary directory."""
         try:
             if not tmp_dir.exists():
                 tmp_dir.mkdir(parents=True)
             if not (tmp_dir / ".git").exists():
-                subprocess.run(["git", "clone", repo_url, str(tmp_dir)], check=True)
+                self._clone(repo_url, tmp_dir)
             else:
                 subprocess.run(["git", "-C", str(tmp_dir), "pull"], check=True)
             return True
@@ -72,8 +192,89 @@ class TmpRepoManager:
             print(f"Error pulling repository: {e}")
             return False
 
+    def _clone(self, repo_url: str, tmp_dir: Path) -> CloneReport:
+        """Clone with the configured strategy and record its cost in last_report."""
+        start = time.perf_counter()
+        subprocess.run(
+            [
+                "git",
+                "clone",
+                "--quiet",
+                *self._clone_args(),
+                self._clone_source(repo_url),
+                str(tmp_dir),
+            ],
+            check=True,
+        )
+        patterns: List[str] = []
+        if self.strategy == CloneStrategies.SPARSE:
+            patterns, cone = sparse_patterns(self.options)
+            if patterns:
+                subprocess.run(
+                    [
+                        "git",
+                        "-C",
+                        str(tmp_dir),
+                        "sparse-checkout",
+                        "set",
+                        "--cone" if cone else "--no-cone",
+                        *patterns,
+                    ],
+                    check=True,
+                )
+            subprocess.run(
+                ["git", "-C", str(tmp_dir), "checkout", "--quiet"], check=True
+            )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        git_bytes, _ = _tree_size(tmp_dir / ".git")
+        worktree_bytes, worktree_files = _tree_size(tmp_dir, skip=".git")
+        self.last_report = CloneReport(
+            strategy=self.strategy,
+            elapsed_ms=elapsed_ms,
+            git_bytes=git_bytes,
+            worktree_bytes=worktree_bytes,
+            worktree_files=worktree_files,
+            sparse_patterns=patterns,
+        )
+        return self.last_report
+
+    def add_sparse_paths(self, paths: Iterable[str]) -> None:
+        """Widen a sparse checkout; the blobs of the new paths are fetched on demand."""
+        subprocess.run(
+            ["git", "-C", str(self.tmp_dir), "sparse-checkout", "add", *paths],
+            check=True,
+        )
+
     def _cleanup(self):
         """Clean up the temporary directory."""
         if self.tmp_dir.exists():
-            subprocess.run(["git", "-C", str(self.tmp_dir), "clean", "-fdx"])
-            self.tmp_dir.rmdir()
+            shutil.rmtree(self.tmp_dir, onexc=_make_writable)
+
+
+def measure_clone_strategies(
+    repo_url: str,
+    app_dir: Path,
+    strategies: Iterable[CloneStrategies] = tuple(CloneStrategies),
+    options: Optional[ListBuilderOptions] = None,
+    depth: int = 1,
+) -> List[CloneReport]:
+    """
+    Clone a repository once per strategy and report time and bytes for each.
+
+    Args:
+        repo_url (str): Repository URL or local path.
+        app_dir (Path): Directory under which temporary clones are made.
+        strategies (Iterable[CloneStrategies]): Strategies to compare.
+        options (Optional[ListBuilderOptions]): Drives the sparse strategy.
+        depth (int): History depth for shallow and sparse clones.
+    Returns:
+        List[CloneReport]: One report per strategy.
+    """
+    reports = []
+    for strategy in strategies:
+        manager = TmpRepoManager(
+            repo_url, app_dir, strategy=strategy, depth=depth, options=options
+        )
+        with manager.temp_repo():
+            reports.append(manager.last_report)
+    return reports
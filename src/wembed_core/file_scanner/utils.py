@@ -4,12 +4,11 @@
 Utility functions for file scanning and indexing.
 """
 
-import hashlib
 import mimetypes
 import os
 import traceback
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, Optional
 from uuid import uuid4
 
 from anyio import Path
@@ -17,6 +16,14 @@ from anyio import Path
 from wembed_core.constants import MD_XREF as md_xref
 from wembed_core.models.indexing import IndexedFileLines, IndexedFiles
 
+from .hashing import DEFAULT_TEXT_SIZE_LIMIT, FileDigest, digest_bytes, hash_file
+from .sniffing import BINARY_PLACEHOLDER, ContentSniffer, default_sniffer
+
+
+def current_host() -> str:
+    """Return the host name recorded on IndexedFiles rows created on this machine."""
+    return os.environ.get("COMPUTERNAME", "unknown")
+
 
 def create_file_record_from_path(
     file_path: Path,
@@ -24,57 +31,20 @@ def create_file_record_from_path(
     source_name: str,
     source_root: str,
     relative_path: str,
+    text_size_limit: int = DEFAULT_TEXT_SIZE_LIMIT,
 ) -> Optional[IndexedFiles]:
-    """Create a IndexedFiles from a file path."""
+    """
+    Create a IndexedFiles from a file path.
+    The file is hashed in one streaming pass; its text is only loaded if the
+    file is at most 'text_size_limit' bytes, otherwise content_text is empty.
+    """
     if not file_path.is_file() or not file_path.exists():
         return None
 
     try:
-        # Read file content
-        with open(file_path, "rb") as f:
-            content = f.read()
-
-        # Try to decode as text
-        try:
-            content_text = content.decode("utf-8")
-        except UnicodeDecodeError:
-            try:
-                content_text = content.decode("latin-1", errors="replace")
-            except Exception:
-                content_text = "<Binary or non-text content>"
-
-        # Calculate hashes
-        sha256 = hashlib.sha256(content).hexdigest()
-        md5 = hashlib.md5(content).hexdigest()
-
-        # Get file stats
-        stat = file_path.stat()
-
-        file_record = IndexedFiles(
-            id=uuid4().hex,
-            version=1,
-            host=os.environ.get("COMPUTERNAME", "unknown"),
-            name=file_path.name,
-            stem=file_path.stem,
-            path=str(file_path),
-            suffix=file_path.suffix,
-            sha256=sha256,
-            md5=md5,
-            size=stat.st_size,
-            content=(
-                content if len(content) < 1024 * 1024 else None
-            ),  # Don't store large files in DB
-            content_text=content_text,
-            ctime_iso=datetime.fromtimestamp(stat.st_birthtime, tz=timezone.utc),
-            mtime_iso=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
-            uri=f"file://{file_path.as_posix()}",
-            mimetype=mimetypes.guess_type(file_path.name)[0]
-            or "application/octet-stream",  # noqa: W503
-            created_at=datetime.now(timezone.utc),
-            updated_at=None,
-        )
-
-        return file_record
+        stat = os.stat(file_path)
+        digest = hash_file(file_path, text_size_limit=text_size_limit)
+        return create_file_record_from_digest(file_path, digest, stat)
 
     except Exception as e:
         print(
@@ -83,6 +53,87 @@ def create_file_record_from_path(
         return None
 
 
+def create_file_record_from_content(
+    file_path: Path,
+    content: bytes,
+    stat: Optional[os.stat_result] = None,
+    git_blob_sha: Optional[str] = None,
+) -> IndexedFiles:
+    """
+    Create a IndexedFiles from content that has already been read, e.g. a git blob.
+    'stat' defaults to the file's current stat; its size is replaced by the content length.
+    """
+    return create_file_record_from_digest(
+        file_path, digest_bytes(content), stat, git_blob_sha
+    )
+
+
+def create_file_record_from_digest(
+    file_path: Path,
+    digest: FileDigest,
+    stat: Optional[os.stat_result] = None,
+    git_blob_sha: Optional[str] = None,
+    sniffer: Optional[ContentSniffer] = None,
+) -> IndexedFiles:
+    """
+    Create a IndexedFiles from a FileDigest.
+    content_text is empty if the digest has no content, and a placeholder if
+    'sniffer' (default: default_sniffer) classifies the content as binary.
+    """
+    return IndexedFiles(
+        **file_record_fields(file_path, digest, stat, git_blob_sha, sniffer)
+    )
+
+
+def file_record_fields(
+    file_path: Path,
+    digest: FileDigest,
+    stat: Optional[os.stat_result] = None,
+    git_blob_sha: Optional[str] = None,
+    sniffer: Optional[ContentSniffer] = None,
+) -> Dict[str, Any]:
+    """Column values of the IndexedFiles record for a FileDigest, as a plain dict."""
+    content = digest.content
+    if content is None:
+        content_text = ""
+    else:
+        # Sniff the first few KB, then decode once in the detected encoding.
+        content_text = (sniffer or default_sniffer).decode(content, file_path.suffix)
+        if content_text is None:
+            content_text = BINARY_PLACEHOLDER
+
+    # Get file stats
+    if stat is None:
+        stat = os.stat(file_path)
+    # st_birthtime is not available on Linux.
+    birthtime = getattr(stat, "st_birthtime", stat.st_ctime)
+
+    return dict(
+        id=uuid4().hex,
+        version=1,
+        host=current_host(),
+        name=file_path.name,
+        stem=file_path.stem,
+        path=str(file_path),
+        suffix=file_path.suffix,
+        sha256=digest.sha256,
+        md5=digest.md5,
+        size=digest.size,
+        content=(
+            content if digest.size < 1024 * 1024 else None
+        ),  # Don't store large files in DB
+        content_text=content_text,
+        ctime_iso=datetime.fromtimestamp(birthtime, tz=timezone.utc),
+        mtime_iso=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+        uri=f"file://{file_path.as_posix()}",
+        mimetype=mimetypes.guess_type(file_path.name)[0]
+        or "application/octet-stream",  # noqa: W503
+        git_blob_sha=git_blob_sha,
+        created_at=datetime.now(timezone.utc),
+        updated_at=None,
+    )
+
+
 # def get_filelines_list_from_file_record(
 #     file_record: IndexedFileSchema,
 # ) -> list[IndexedFileLineSchema]:
@@ -0,0 +1,258 @@
+"""
+wembed_core/file_scanner/walker.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Single-pass, multi-threaded directory walker built on os.scandir.
+
+Each directory is listed once by a worker thread; the file type cached on
+every DirEntry is used instead of extra stat calls, and repositories,
+Obsidian vaults, images and Docling inputs are classified as entries
+arrive. Ignored directories are pruned by name before they are entered.
+The result can be queried any number of times.
+"""
+
+import fnmatch
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from wembed_core.constants import (
+    DOCLING_EXTENSIONS,
+    IMAGE_EXTENSIONS,
+    OBSIDIAN_MARKER,
+    REPO_MARKER,
+)
+
+from .dot_scanignore import ScanIgnoreMatcher
+from .path_table import PathTable
+
+DEFAULT_WALK_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+class WalkResult(BaseModel):
+    """
+    Everything found by one walk of a directory tree.
+
+    Attributes:
+        root (Path): The resolved directory that was walked.
+        files (PathTable): Every file below the root, in no particular order.
+        directories (int): Directories listed, including the root.
+        repositories (Set[Path]): Directories containing a '.git' folder.
+        obsidian_vaults (Set[Path]): Directories containing a '.obsidian' folder.
+        images (Set[Path]): Files with an image extension.
+        docling_dirs (Set[Path]): Directories holding at least one Docling input.
+        pruned_dirs (Set[Path]): Ignored directories that were not entered.
+        errors (int): Directories that could not be listed.
+        elapsed_ms (float): Wall time of the walk.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    root: Path
+    files: PathTable = Field(default_factory=PathTable)
+    directories: int = 0
+    repositories: Set[Path] = Field(default_factory=set)
+    obsidian_vaults: Set[Path] = Field(default_factory=set)
+    images: Set[Path] = Field(default_factory=set)
+    docling_dirs: Set[Path] = Field(default_factory=set)
+    pruned_dirs: Set[Path] = Field(default_factory=set)
+    errors: int = 0
+    elapsed_ms: float = 0.0
+
+
+class PruneReport(BaseModel):
+    """
+    Work saved by pruning ignored directories, from measure_pruning().
+
+    Attributes:
+        pruned_dirs (int): Ignored directories not entered.
+        dirs_skipped (int): Directories below the root that were not listed.
+        files_skipped (int): Files that were not enumerated.
+        full_ms (float): Wall time of the walk without pruning.
+        pruned_ms (float): Wall time of the walk with pruning.
+        saved_ms (float): Difference between the two.
+    """
+
+    pruned_dirs: int
+    dirs_skipped: int
+    files_skipped: int
+    full_ms: float
+    pruned_ms: float
+    saved_ms: float
+
+
+class DirectoryPruner:
+    """
+    Matches directory names against ignore rules.
+
+    Plain names are looked up in a frozenset; glob patterns are compiled
+    into a single regular expression, so a check never loops over rules.
+    """
+
+    __slots__ = ("names", "pattern")
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        names: Set[str] = set()
+        globs: List[str] = []
+        for pattern in patterns:
+            if any(char in pattern for char in "*?["):
+                globs.append(pattern)
+            else:
+                names.add(pattern)
+        self.names: FrozenSet[str] = frozenset(names)
+        self.pattern: Optional[re.Pattern] = (
+            re.compile("|".join(fnmatch.translate(g) for g in globs)) if globs else None
+        )
+
+    def __call__(self, name: str) -> bool:
+        """True if a directory with this name should not be entered."""
+        if name in self.names:
+            return True
+        return self.pattern is not None and self.pattern.match(name) is not None
+
+    def __bool__(self) -> bool:
+        return bool(self.names) or self.pattern is not None
+
+
+def _list_dir(path: str) -> Tuple[str, List[str], List[str], bool]:
+    """List one directory, split into subdirectory and file names."""
+    dirs: List[str] = []
+    files: List[str] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        files.append(entry.name)
+                except OSError:
+                    continue
+    except OSError:
+        return path, dirs, files, False
+    return path, dirs, files, True
+
+
+class FileTreeWalker:
+    """
+    Walks a directory tree with a pool of threads, one directory per task.
+
+    Symlinked directories are not followed, matching Path.rglob().
+    Directories whose name matches a prune rule are not entered; marker
+    folders such as '.git' are still detected when they are pruned. With a
+    ScanIgnoreMatcher, directories and files excluded by .scanignore files
+    are skipped as well.
+
+    Methods:
+        walk(): Walk a tree and return a WalkResult.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WALK_WORKERS,
+        prune: Iterable[str] = (),
+        scanignore: Optional[ScanIgnoreMatcher] = None,
+    ):
+        """
+        Initialize the walker.
+        Args:
+            workers (int): Threads listing directories concurrently.
+            prune (Iterable[str]): Directory names or glob patterns not to descend into.
+            scanignore (Optional[ScanIgnoreMatcher]): .scanignore rules to apply.
+        """
+        self.workers = max(workers, 1)
+        self.pruner = DirectoryPruner(prune)
+        self.scanignore = scanignore
+
+    def walk(self, root: str | Path) -> WalkResult:
+        """
+        Walk 'root' once, collecting and classifying every entry.
+
+        Args:
+            root (str | Path): Directory to walk.
+        Returns:
+            WalkResult: Files and classified directories below the root.
+        """
+        start = time.perf_counter()
+        result = WalkResult(root=Path(root).resolve())
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="wembed-walk") as pool:
+            pending: Set[Future] = {pool.submit(_list_dir, str(result.root))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, dirs, files, ok = future.result()
+                    self._collect(result, path, dirs, files, ok)
+                    for name in dirs:
+                        subdir = os.path.join(path, name)
+                        if self.pruner(name) or self._scanignored(subdir):
+                            result.pruned_dirs.add(Path(subdir))
+                        else:
+                            pending.add(pool.submit(_list_dir, subdir))
+        result.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return result
+
+    def _scanignored(self, path: str, is_dir: bool = True) -> bool:
+        """Whether .scanignore rules exclude a path."""
+        return self.scanignore is not None and self.scanignore.is_ignored(path, is_dir)
+
+    def _collect(
+        self, result: WalkResult, path: str, dirs: List[str], files: List[str], ok: bool
+    ) -> None:
+        """Record the entries of one listed directory."""
+        result.directories += 1
+        if not ok:
+            result.errors += 1
+            return
+        if REPO_MARKER in dirs:
+            result.repositories.add(Path(path))
+        if OBSIDIAN_MARKER in dirs:
+            result.obsidian_vaults.add(Path(path))
+        has_docling_input = False
+        for name in files:
+            full = os.path.join(path, name)
+            if self._scanignored(full, is_dir=False):
+                continue
+            result.files.append(full)
+            suffix = os.path.splitext(name)[1].lower()
+            if suffix in IMAGE_EXTENSIONS:
+                result.images.add(Path(full))
+            if suffix in DOCLING_EXTENSIONS:
+                has_docling_input = True
+        if has_docling_input:
+            result.docling_dirs.add(Path(path))
+
+
+def walk_tree(
+    root: str | Path, workers: int = DEFAULT_WALK_WORKERS, prune: Iterable[str] = ()
+) -> WalkResult:
+    """Walk a directory tree once with FileTreeWalker."""
+    return FileTreeWalker(workers, prune).walk(root)
+
+
+def measure_pruning(
+    root: str | Path, prune: Iterable[str], workers: int = DEFAULT_WALK_WORKERS
+) -> PruneReport:
+    """
+    Walk 'root' with and without pruning and report what pruning saved.
+
+    Args:
+        root (str | Path): Directory to walk.
+        prune (Iterable[str]): Directory names or glob patterns to prune.
+        workers (int): Threads listing directories concurrently.
+    Returns:
+        PruneReport: Directories and files skipped, and the time difference.
+    """
+    full = walk_tree(root, workers)
+    pruned = walk_tree(root, workers, prune)
+    return PruneReport(
+        pruned_dirs=len(pruned.pruned_dirs),
+        dirs_skipped=full.directories - pruned.directories,
+        files_skipped=len(full.files) - len(pruned.files),
+        full_ms=full.elapsed_ms,
+        pruned_ms=pruned.elapsed_ms,
+        saved_ms=full.elapsed_ms - pruned.elapsed_ms,
+    )
@@ -0,0 +1,504 @@
+"""
+wembed_core/file_scanner/watcher.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Live watch mode: reports file changes below a root as they happen.
+
+On Linux the watcher registers an inotify watch on every directory below
+the root (through ctypes, no extra dependency). Events are coalesced per
+path and delivered in batches once the tree has been quiet for a short
+debounce period, or after a maximum latency while changes keep arriving.
+Where inotify is unavailable, or the per-user watch limit is reached, it
+falls back to diffing stat snapshots of the tree at a fixed interval.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from wembed_core.enums import FileChangeStates
+
+from .dot_scanignore import ScanIgnoreMatcher
+from .walker import DirectoryPruner, FileTreeWalker
+
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Completed writes rather than every IN_MODIFY, so a large write is one event.
+WATCH_MASK = sum(
+    (
+        IN_ATTRIB,
+        IN_CLOSE_WRITE,
+        IN_MOVED_FROM,
+        IN_MOVED_TO,
+        IN_CREATE,
+        IN_DELETE,
+        IN_DELETE_SELF,
+        IN_MOVE_SELF,
+        IN_ONLYDIR,
+        IN_DONT_FOLLOW,
+        IN_EXCL_UNLINK,
+    )
+)
+
+_EVENT = struct.Struct("iIII")
+
+StatKey = Tuple[int, int, int, int]
+
+
+class WatchBatch(BaseModel):
+    """
+    Coalesced changes delivered to the watch callback.
+
+    Attributes:
+        changes (Dict[str, FileChangeStates]): Final state of every changed file.
+        deleted_dirs (List[str]): Directories removed or moved away; their files are gone.
+        rescan_required (bool): Events were lost; the consumer should rescan the root.
+        backend (str): "inotify" or "polling".
+        latency_ms (float): Time from the first change in the batch to delivery.
+    """
+
+    changes: Dict[str, FileChangeStates] = Field(default_factory=dict)
+    deleted_dirs: List[str] = Field(default_factory=list)
+    rescan_required: bool = False
+    backend: str = "inotify"
+    latency_ms: float = 0.0
+
+    @property
+    def changed(self) -> List[str]:
+        """New and modified files, sorted."""
+        return sorted(
+            p for p, state in self.changes.items() if state != FileChangeStates.DELETED
+        )
+
+    @property
+    def deleted(self) -> List[str]:
+        """Deleted files, sorted."""
+        return sorted(
+            p for p, state in self.changes.items() if state == FileChangeStates.DELETED
+        )
+
+
+class WatchLimitReached(OSError):
+    """The per-user inotify watch or instance limit was hit."""
+
+
+class _Inotify:
+    """Minimal ctypes binding of the Linux inotify API."""
+
+    _libc = None
+
+    def __init__(self):
+        libc = self._load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            code = ctypes.get_errno()
+            if code in (errno.EMFILE, errno.ENFILE):
+                raise WatchLimitReached(code, os.strerror(code))
+            raise OSError(code, os.strerror(code))
+        self.fd = fd
+
+    @classmethod
+    def _load_libc(cls):
+        if cls._libc is None:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            if not hasattr(libc, "inotify_init1"):
+                raise OSError(errno.ENOSYS, "inotify is not available")
+            libc.inotify_add_watch.argtypes = [
+                ctypes.c_int,
+                ctypes.c_char_p,
+                ctypes.c_uint32,
+            ]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+            cls._libc = libc
+        return cls._libc
+
+    @classmethod
+    def available(cls) -> bool:
+        try:
+            cls._load_libc()
+        except OSError:
+            return False
+        return True
+
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code == errno.ENOSPC:
+                raise WatchLimitReached(code, os.strerror(code), path)
+            raise OSError(code, os.strerror(code), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self) -> Iterator[Tuple[int, int, str]]:
+        """Yield (wd, mask, name) for every queued event."""
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                yield wd, mask, os.fsdecode(name)
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _merge(
+    previous: Optional[FileChangeStates], state: FileChangeStates
+) -> Optional[FileChangeStates]:
+    """Coalesce two changes of the same path; None means they cancel out."""
+    if previous is None:
+        return state
+    if state == FileChangeStates.DELETED:
+        return None if previous == FileChangeStates.NEW else state
+    if previous == FileChangeStates.DELETED:
+        return FileChangeStates.MODIFIED
+    if previous == FileChangeStates.NEW:
+        return previous
+    return state
+
+
+class FileWatcher:
+    """
+    Watches a root and delivers coalesced, debounced change batches.
+
+    Methods:
+        poll(): Process pending events; return a batch when one is due.
+        run(): Deliver batches to the callback until stop() is called.
+        start(): run() in a background thread.
+        stop(): Stop watching and release the inotify instance.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        on_changes: Optional[Callable[[WatchBatch], None]] = None,
+        debounce_s: float = 0.5,
+        max_latency_s: float = 5.0,
+        poll_interval_s: float = 30.0,
+        prune: Iterable[str] = (),
+        scanignore: Optional[ScanIgnoreMatcher] = None,
+        backend: str = "auto",
+    ):
+        """
+        Initialize the watcher and register its watches.
+        Args:
+            root (str | Path): Directory to watch.
+            on_changes (Optional[Callable[[WatchBatch], None]]): Receives each batch from run().
+            debounce_s (float): Quiet period after the last event before a batch is delivered.
+            max_latency_s (float): Deliver a batch at most this long after its first change,
+                even while events keep arriving.
+            poll_interval_s (float): Interval between stat diffs in polling mode.
+            prune (Iterable[str]): Directory names or glob patterns not to watch.
+            scanignore (Optional[ScanIgnoreMatcher]): .scanignore rules to apply.
+            backend (str): "auto", "inotify" or "polling".
+        Raises:
+            ValueError: If the backend is unknown.
+        """
+        if backend not in ("auto", "inotify", "polling"):
+            raise ValueError(f"Unknown watch backend: {backend}")
+        self.root = os.path.abspath(root)
+        self.on_changes = on_changes
+        self.debounce_s = debounce_s
+        self.max_latency_s = max_latency_s
+        self.poll_interval_s = poll_interval_s
+        self.prune = tuple(prune)
+        self.pruner = DirectoryPruner(self.prune)
+        self.scanignore = scanignore
+
+        self._pending: Dict[str, FileChangeStates] = {}
+        self._deleted_dirs: List[str] = []
+        self._rescan_required = False
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._inotify: Optional[_Inotify] = None
+        self._wd_paths: Dict[int, str] = {}
+        self._snapshot: Dict[str, StatKey] = {}
+        self._next_poll = 0.0
+        self.backend = "polling"
+        if backend != "polling" and (backend == "inotify" or _Inotify.available()):
+            try:
+                self._start_inotify()
+            except WatchLimitReached:
+                self.backend = "polling"
+        if self.backend == "polling":
+            self._start_polling()
+
+    # -- filtering --------------------------------------------------------
+
+    def _skip_dir(self, path: str) -> bool:
+        if self.pruner(os.path.basename(path)):
+            return True
+        return self.scanignore is not None and self.scanignore.is_ignored(path, True)
+
+    def _skip_file(self, path: str) -> bool:
+        return self.scanignore is not None and self.scanignore.is_ignored(path)
+
+    # -- inotify ----------------------------------------------------------
+
+    def _start_inotify(self) -> None:
+        self._inotify = _Inotify()
+        try:
+            self._watch_tree(self.root, report=False)
+        except WatchLimitReached:
+            self._inotify.close()
+            self._inotify = None
+            self._wd_paths.clear()
+            raise
+        self.backend = "inotify"
+
+    def _watch_tree(self, top: str, report: bool) -> None:
+        """Watch 'top' and every directory below it; optionally report its files as new."""
+        stack = [top]
+        while stack:
+            directory = stack.pop()
+            try:
+                wd = self._inotify.add_watch(directory)
+            except WatchLimitReached:
+                raise
+            except OSError:
+                # Removed or unreadable since it was listed.
+                continue
+            self._wd_paths[wd] = directory
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not self._skip_dir(entry.path):
+                                stack.append(entry.path)
+                        elif report and not self._skip_file(entry.path):
+                            self._record(entry.path, FileChangeStates.NEW)
+            except OSError:
+                continue
+
+    def _unwatch_tree(self, top: str) -> None:
+        prefix = top + os.sep
+        for wd, path in list(self._wd_paths.items()):
+            if path == top or path.startswith(prefix):
+                self._inotify.rm_watch(wd)
+                del self._wd_paths[wd]
+
+    def _handle(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            self._rescan_required = True
+            self._touch()
+            return
+        directory = self._wd_paths.get(wd)
+        if directory is None:
+            return
+        if mask & IN_IGNORED:
+            self._wd_paths.pop(wd, None)
+            return
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            if directory == self.root:
+                self._rescan_required = True
+                self._touch()
+            return
+        path = os.path.join(directory, name)
+        if mask & IN_ISDIR:
+            if self._skip_dir(path):
+                return
+            if mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_tree(path, report=True)
+            elif mask & (IN_DELETE | IN_MOVED_FROM):
+                self._unwatch_tree(path)
+                self._deleted_dirs.append(path)
+                self._touch()
+            return
+        if self._skip_file(path):
+            return
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            self._record(path, FileChangeStates.DELETED)
+        elif mask & (IN_CREATE | IN_MOVED_TO):
+            self._record(path, FileChangeStates.NEW)
+        else:
+            self._record(path, FileChangeStates.MODIFIED)
+
+    def _read_inotify(self, timeout: float) -> None:
+        try:
+            ready, _, _ = select.select([self._inotify.fd], [], [], timeout)
+        except InterruptedError:
+            return
+        if not ready:
+            return
+        try:
+            for wd, mask, name in self._inotify.read_events():
+                self._handle(wd, mask, name)
+        except WatchLimitReached:
+            self._fall_back()
+
+    # -- polling ----------------------------------------------------------
+
+    def _fall_back(self) -> None:
+        """Switch to stat-snapshot polling after hitting an inotify limit."""
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._wd_paths.clear()
+        self.backend = "polling"
+        self._start_polling()
+        # Changes made while switching over cannot be seen.
+        self._rescan_required = True
+        self._touch()
+
+    def _take_snapshot(self) -> Dict[str, StatKey]:
+        walker = FileTreeWalker(prune=self.prune, scanignore=self.scanignore)
+        snapshot = {}
+        for path in walker.walk(self.root).files.iter_str():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def _start_polling(self) -> None:
+        self._snapshot = self._take_snapshot()
+        self._next_poll = time.monotonic() + self.poll_interval_s
+
+    def _diff_snapshot(self) -> None:
+        current = self._take_snapshot()
+        previous = self._snapshot
+        for path, key in current.items():
+            old = previous.get(path)
+            if old is None:
+                self._record(path, FileChangeStates.NEW)
+            elif old != key:
+                self._record(path, FileChangeStates.MODIFIED)
+        for path in previous.keys() - current.keys():
+            self._record(path, FileChangeStates.DELETED)
+        self._snapshot = current
+        self._next_poll = time.monotonic() + self.poll_interval_s
+
+    # -- batching ---------------------------------------------------------
+
+    def _touch(self) -> None:
+        now = time.monotonic()
+        if not self._first_event:
+            self._first_event = now
+        self._last_event = now
+
+    def _record(self, path: str, state: FileChangeStates) -> None:
+        self._touch()
+        merged = _merge(self._pending.pop(path, None), state)
+        if merged is not None:
+            self._pending[path] = merged
+
+    def _has_pending(self) -> bool:
+        return bool(self._pending or self._deleted_dirs or self._rescan_required)
+
+    def _due_in(self, now: float) -> Optional[float]:
+        """Seconds until the pending batch is due, or None if nothing is pending."""
+        if not self._has_pending():
+            return None
+        deadline = min(
+            self._last_event + self.debounce_s,
+            self._first_event + self.max_latency_s,
+        )
+        return max(0.0, deadline - now)
+
+    def _flush(self, now: float) -> WatchBatch:
+        batch = WatchBatch(
+            changes=self._pending,
+            deleted_dirs=self._deleted_dirs,
+            rescan_required=self._rescan_required,
+            backend=self.backend,
+            latency_ms=(now - self._first_event) * 1000.0,
+        )
+        self._pending, self._deleted_dirs = {}, []
+        self._rescan_required = False
+        self._first_event = self._last_event = 0.0
+        return batch
+
+    def poll(self, timeout: float = 1.0) -> Optional[WatchBatch]:
+        """
+        Wait up to 'timeout' seconds for events and return a batch if one is due.
+
+        Args:
+            timeout (float): Longest time to block.
+        Returns:
+            Optional[WatchBatch]: The coalesced changes, or None if no batch is due yet.
+        """
+        now = time.monotonic()
+        due = self._due_in(now)
+        wait = timeout if due is None else min(timeout, due)
+        if self.backend == "inotify":
+            self._read_inotify(wait)
+        else:
+            wait = min(wait, max(0.0, self._next_poll - now))
+            if self._stop.wait(wait) is False and time.monotonic() >= self._next_poll:
+                self._diff_snapshot()
+        now = time.monotonic()
+        due = self._due_in(now)
+        if due is not None and due <= 0:
+            return self._flush(now)
+        return None
+
+    # -- running ----------------------------------------------------------
+
+    def run(self) -> None:
+        """Deliver batches to on_changes until stop() is called."""
+        while not self._stop.is_set():
+            batch = self.poll(timeout=0.25)
+            if batch is not None and self.on_changes is not None:
+                self.on_changes(batch)
+
+    def start(self) -> None:
+        """Run the watcher in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.run, name="wembed-watch", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching; pending changes not yet delivered are dropped."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._wd_paths.clear()
+
+    @property
+    def watched_dirs(self) -> int:
+        """Number of directories with an inotify watch."""
+        return len(self._wd_paths)
@@ -0,0 +1,375 @@
+"""
+wembed_core/index_io.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Columnar export and import of the index database to Parquet or Arrow IPC files.
+
+Requires the optional 'arrow' extra (pyarrow).
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    Integer,
+    LargeBinary,
+    Table,
+    func,
+    select,
+)
+
+from wembed_core.database import AppBase, DatabaseService
+from wembed_core.pagination import stream_query
+from wembed_core.search.fts import FTS_INDEXES, drop_fts, install_fts
+
+EXPORT_TABLES: List[str] = [
+    "indexed_files",
+    "indexed_file_lines",
+    "dl_doc_chunks",
+    "code_chunker_code_chunks",
+    "code_chunker_dependency_nodes",
+    "code_chunker_function_calls",
+    "code_chunker_git_branches",
+    "code_chunker_git_commits",
+    "code_chunker_git_file_info",
+    "code_chunker_import_statements",
+    "code_chunker_usage_nodes",
+]
+"""Tables written by export_index(), in load order."""
+
+EMBEDDING_COLUMN = "embedding"
+FILE_CONTENT_COLUMNS = {"content", "content_text"}
+MANIFEST_NAME = "manifest.json"
+FORMAT_SUFFIXES = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _require_pyarrow() -> Any:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for index export/import; "
+            "install it with 'pip install wembed-core[arrow]'."
+        ) from e
+    return pyarrow
+
+
+def _arrow_type(pa: Any, column: Any, embedding_dim: Optional[int]) -> Any:
+    """Map a SQLAlchemy column to an Arrow type."""
+    if column.name == EMBEDDING_COLUMN:
+        if embedding_dim:
+            return pa.list_(pa.float32(), embedding_dim)
+        return pa.list_(pa.float32())
+    col_type = column.type
+    if isinstance(col_type, Boolean):
+        return pa.bool_()
+    if isinstance(col_type, Integer):
+        return pa.int64()
+    if isinstance(col_type, Float):
+        return pa.float64()
+    if isinstance(col_type, DateTime):
+        return pa.timestamp("us", tz="UTC" if col_type.timezone else None)
+    if isinstance(col_type, LargeBinary):
+        return pa.large_binary()
+    return pa.large_string()
+
+
+def _export_columns(table: Table, include_content: bool) -> List[Any]:
+    if include_content or table.name != "indexed_files":
+        return list(table.columns)
+    return [c for c in table.columns if c.name not in FILE_CONTENT_COLUMNS]
+
+
+def _detect_embedding_dim(db: Any, table: Table) -> Optional[int]:
+    """
+    The dimension shared by every stored embedding, if there is exactly one.
+
+    Tables whose embeddings differ in length (or include empty ones) get
+    None and are exported as variable-length lists, so nothing is lost.
+    """
+    if EMBEDDING_COLUMN not in table.columns:
+        return None
+    column = table.columns[EMBEDDING_COLUMN]
+    dim: Optional[int] = None
+    stmt = select(column).where(column.is_not(None))
+    for (value,) in stream_query(db, stmt, 10_000):
+        if not value or (dim is not None and len(value) != dim):
+            return None
+        dim = len(value)
+    return dim
+
+
+def _to_arrow_value(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if column.name == EMBEDDING_COLUMN:
+        return value
+    if isinstance(column.type, JSON):
+        if isinstance(value, (set, frozenset)):
+            value = sorted(value)
+        return json.dumps(value)
+    if isinstance(column.type, DateTime) and column.type.timezone:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _from_arrow_value(column: Any, value: Any) -> Any:
+    if value is None:
+        return None
+    if column.name != EMBEDDING_COLUMN and isinstance(column.type, JSON):
+        return json.loads(value)
+    if isinstance(value, datetime) and not getattr(column.type, "timezone", False):
+        return value.replace(tzinfo=None)
+    return value
+
+
+def export_index(
+    db_service: DatabaseService,
+    out_dir: Path,
+    fmt: str = "parquet",
+    batch_size: int = 10_000,
+    tables: Optional[Sequence[str]] = None,
+    include_content: bool = False,
+    compression: Optional[str] = "zstd",
+) -> Dict[str, int]:
+    """
+    Export index tables to one Parquet or Arrow IPC file per table.
+
+    Rows are streamed from the database and written in row groups (Parquet)
+    or record batches (Arrow) of 'batch_size'. Embedding columns are written
+    as fixed-size float32 list columns, or as variable-length ones when the
+    table holds embeddings of more than one dimension. A manifest.json
+    records the format, row counts and embedding dimensions (None if mixed).
+
+    Args:
+        db_service (DatabaseService): Initialized database service to read from.
+        out_dir (Path): Directory to write into; created if missing.
+        fmt (str): 'parquet' or 'arrow'.
+        batch_size (int): Rows per row group / record batch.
+        tables (Optional[Sequence[str]]): Subset of EXPORT_TABLES to write.
+        include_content (bool): Include IndexedFiles.content and content_text;
+            by default only file metadata is exported.
+        compression (Optional[str]): Codec for Parquet, or for Arrow IPC
+            ('zstd' or 'lz4'); None writes uncompressed files.
+    Returns:
+        Dict[str, int]: Rows written per table.
+    Raises:
+        ValueError: If the format or a table name is unknown.
+    """
+    pa = _require_pyarrow()
+    if fmt not in FORMAT_SUFFIXES:
+        raise ValueError(f"Unknown export format '{fmt}'; use 'parquet' or 'arrow'.")
+    names = list(tables or EXPORT_TABLES)
+    unknown = set(names) - set(EXPORT_TABLES)
+    if unknown:
+        raise ValueError(f"Cannot export unknown tables: {sorted(unknown)}")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    counts: Dict[str, int] = {}
+    manifest: Dict[str, Any] = {
+        "format": fmt,
+        "include_content": include_content,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "tables": {},
+    }
+    with db_service.get_db() as db:
+        for name in names:
+            table = AppBase.metadata.tables[name]
+            columns = _export_columns(table, include_content)
+            dim = _detect_embedding_dim(db, table)
+            schema = pa.schema(
+                [
+                    pa.field(c.name, _arrow_type(pa, c, dim), nullable=True)
+                    for c in columns
+                ]
+            )
+            path = out_dir / f"{name}{FORMAT_SUFFIXES[fmt]}"
+            rows = select(*columns).order_by(*table.primary_key.columns)
+            batches = _record_batches(pa, db, rows, columns, schema, batch_size)
+            counts[name] = _write_batches(pa, fmt, path, schema, batches, compression)
+            manifest["tables"][name] = {
+                "file": path.name,
+                "rows": counts[name],
+                "embedding_dim": dim,
+            }
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    return counts
+
+
+def _record_batches(
+    pa: Any,
+    db: Any,
+    stmt: Any,
+    columns: List[Any],
+    schema: Any,
+    batch_size: int,
+) -> Iterator[Any]:
+    """Convert streamed rows into Arrow record batches."""
+    buffer: List[List[Any]] = [[] for _ in columns]
+    for row in stream_query(db, stmt, batch_size):
+        for i, column in enumerate(columns):
+            buffer[i].append(_to_arrow_value(column, row[i]))
+        if len(buffer[0]) >= batch_size:
+            yield pa.record_batch(buffer, schema=schema)
+            buffer = [[] for _ in columns]
+    if buffer[0]:
+        yield pa.record_batch(buffer, schema=schema)
+
+
+def _write_batches(
+    pa: Any,
+    fmt: str,
+    path: Path,
+    schema: Any,
+    batches: Iterator[Any],
+    compression: Optional[str],
+) -> int:
+    rows = 0
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        with pq.ParquetWriter(path, schema, compression=compression or "none") as w:
+            for batch in batches:
+                w.write_batch(batch, row_group_size=batch.num_rows)
+                rows += batch.num_rows
+        return rows
+
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, schema, options=options) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+                rows += batch.num_rows
+    return rows
+
+
+def read_index_batches(path: Path, batch_size: int = 10_000) -> Iterator[Any]:
+    """
+    Memory-map an exported Parquet or Arrow IPC file and yield its record batches.
+
+    Args:
+        path (Path): File written by export_index().
+        batch_size (int): Rows per batch when reading Parquet.
+    Yields:
+        pyarrow.RecordBatch: Batches backed by the mapped file where possible.
+    """
+    pa = _require_pyarrow()
+    path = Path(path)
+    if path.suffix == FORMAT_SUFFIXES["parquet"]:
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(str(path), memory_map=True)
+        yield from parquet_file.iter_batches(batch_size=batch_size)
+        return
+    with pa.memory_map(str(path), "r") as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            yield reader.get_batch(i)
+
+
+def import_index(
+    db_service: DatabaseService,
+    in_dir: Path,
+    batch_size: int = 10_000,
+    tables: Optional[Sequence[str]] = None,
+) -> Dict[str, int]:
+    """
+    Bulk-load files written by export_index() into an empty database.
+
+    Files are memory mapped and inserted batch by batch with executemany in
+    a single transaction. On SQLite, FTS5 triggers are dropped for the load
+    and the indexes are rebuilt once at the end, and journaling is relaxed
+    for the duration of the load.
+
+    Args:
+        db_service (DatabaseService): Initialized database service to write to.
+        in_dir (Path): Directory containing manifest.json and the table files.
+        batch_size (int): Rows per insert batch.
+        tables (Optional[Sequence[str]]): Subset of exported tables to load.
+    Returns:
+        Dict[str, int]: Rows inserted per table.
+    Raises:
+        FileNotFoundError: If the manifest is missing.
+        ValueError: If a target table already contains rows.
+    """
+    _require_pyarrow()
+    in_dir = Path(in_dir)
+    manifest_path = in_dir / MANIFEST_NAME
+    if not manifest_path.is_file():
+        raise FileNotFoundError(f"{manifest_path} does not exist.")
+    manifest = json.loads(manifest_path.read_text())
+    names = [
+        n
+        for n in EXPORT_TABLES
+        if n in manifest["tables"] and (not tables or n in tables)
+    ]
+
+    counts: Dict[str, int] = {}
+    engine = db_service.engine
+    is_sqlite = engine.dialect.name == "sqlite"
+    fts_specs = [s for s in FTS_INDEXES.values() if s.content_table in names]
+    with engine.connect() as conn:
+        if is_sqlite:
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+            conn.commit()
+        try:
+            with conn.begin():
+                for name in names:
+                    table = AppBase.metadata.tables[name]
+                    existing = conn.execute(select(func.count()).select_from(table))
+                    if existing.scalar():
+                        raise ValueError(
+                            f"Table '{name}' is not empty; import needs a fresh database."
+                        )
+                if is_sqlite:
+                    for spec in fts_specs:
+                        drop_fts(conn, spec)
+                for name in names:
+                    counts[name] = _load_table(
+                        conn,
+                        AppBase.metadata.tables[name],
+                        in_dir / manifest["tables"][name]["file"],
+                        batch_size,
+                    )
+                if is_sqlite:
+                    install_fts(conn)
+        finally:
+            if is_sqlite:
+                conn.exec_driver_sql("PRAGMA synchronous = FULL")
+                conn.commit()
+    return counts
+
+
+def _load_table(conn: Any, table: Table, path: Path, batch_size: int) -> int:
+    rows = 0
+    for batch in read_index_batches(path, batch_size=batch_size):
+        columns = [table.columns[name] for name in batch.schema.names]
+        records = []
+        for values in zip(*(batch.column(i).to_pylist() for i in range(len(columns)))):
+            record = {
+                column.name: _from_arrow_value(column, value)
+                for column, value in zip(columns, values)
+            }
+            if table.name == "indexed_files" and record.get("content_text") is None:
+                # metadata-only exports leave out the NOT NULL text column
+                record["content_text"] = ""
+            records.append(record)
+        if records:
+            conn.execute(table.insert(), records)
+            rows += len(records)
+    return rows
+
+
+__all__ = [
+    "EXPORT_TABLES",
+    "export_index",
+    "import_index",
+    "read_index_batches",
+]
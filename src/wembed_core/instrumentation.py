@@ -0,0 +1,231 @@
+"""
+wembed_core/instrumentation.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Per-statement timing, latency histograms and a slow-query log for SQLAlchemy engines.
+"""
+
+import bisect
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+HISTOGRAM_BOUNDS_MS: List[float] = [0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000]
+"""Upper bounds (ms) of the latency histogram buckets; a final bucket catches the rest."""
+
+EXPLAINABLE_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+class StatementStats(BaseModel):
+    """
+    Aggregated timings for one SQL statement text.
+
+    Attributes:
+        statement (str): The parameterized SQL text.
+        count (int): Number of executions.
+        total_ms (float): Sum of execution times.
+        min_ms (float): Fastest execution.
+        max_ms (float): Slowest execution.
+        rows (int): Sum of rows reported by the cursor (writes only on SQLite).
+        histogram (List[int]): Execution counts per HISTOGRAM_BOUNDS_MS bucket.
+    """
+
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    min_ms: float = float("inf")
+    max_ms: float = 0.0
+    rows: int = 0
+    histogram: List[int] = Field(
+        default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+    )
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def record(self, duration_ms: float, rows: int) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.min_ms = min(self.min_ms, duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.rows += max(rows, 0)
+        self.histogram[bisect.bisect_left(HISTOGRAM_BOUNDS_MS, duration_ms)] += 1
+
+
+class SlowQuery(BaseModel):
+    """
+    A single execution that exceeded the slow-query threshold.
+
+    Attributes:
+        statement (str): The parameterized SQL text.
+        parameters (str): Truncated repr of the bound parameters.
+        duration_ms (float): Execution time.
+        rows (int): Rows reported by the cursor.
+        executed_at (datetime): When the statement finished.
+        query_plan (Optional[List[str]]): EXPLAIN QUERY PLAN output, if captured.
+    """
+
+    statement: str
+    parameters: str
+    duration_ms: float
+    rows: int
+    executed_at: datetime
+    query_plan: Optional[List[str]] = None
+
+
+class QueryInstrumentation:
+    """
+    Collects statement timings from an engine via cursor execution events.
+
+    Usage:
+        stats = QueryInstrumentation(slow_query_ms=50, explain_slow_queries=True)
+        stats.attach(engine)
+        ...
+        print(stats.to_json())
+    """
+
+    def __init__(
+        self,
+        slow_query_ms: float = 100.0,
+        explain_slow_queries: bool = False,
+        max_slow_queries: int = 500,
+        max_parameter_chars: int = 200,
+    ):
+        self.slow_query_ms = slow_query_ms
+        self.explain_slow_queries = explain_slow_queries
+        self.max_parameter_chars = max_parameter_chars
+        self.statements: Dict[str, StatementStats] = {}
+        self.slow_queries: Deque[SlowQuery] = deque(maxlen=max_slow_queries)
+        self._engine: Optional[Engine] = None
+        self._lock = threading.Lock()
+
+    def attach(self, engine: Engine) -> "QueryInstrumentation":
+        """Start listening to cursor execution events on the engine."""
+        if self._engine is not None:
+            raise RuntimeError("Instrumentation is already attached to an engine.")
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engine = engine
+        return self
+
+    def detach(self) -> None:
+        """Stop listening to the engine."""
+        if self._engine is None:
+            return
+        event.remove(self._engine, "before_cursor_execute", self._before_cursor_execute)
+        event.remove(self._engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engine = None
+
+    def reset(self) -> None:
+        """Discard everything collected so far."""
+        with self._lock:
+            self.statements.clear()
+            self.slow_queries.clear()
+
+    def _before_cursor_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("wembed_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        starts = conn.info.get("wembed_query_start")
+        if not starts:
+            return
+        duration_ms = (time.perf_counter() - starts.pop()) * 1000.0
+        rows = cursor.rowcount if cursor.rowcount is not None else -1
+
+        with self._lock:
+            stats = self.statements.get(statement)
+            if stats is None:
+                stats = self.statements[statement] = StatementStats(statement=statement)
+            stats.record(duration_ms, rows)
+
+        if duration_ms < self.slow_query_ms:
+            return
+        plan = None
+        if self.explain_slow_queries:
+            plan = self._explain(conn, statement, parameters, executemany)
+        entry = SlowQuery(
+            statement=statement,
+            parameters=repr(parameters)[: self.max_parameter_chars],
+            duration_ms=duration_ms,
+            rows=rows,
+            executed_at=datetime.now(timezone.utc),
+            query_plan=plan,
+        )
+        with self._lock:
+            self.slow_queries.append(entry)
+
+    def _explain(
+        self, conn: Any, statement: str, parameters: Any, executemany: bool
+    ) -> Optional[List[str]]:
+        """Capture EXPLAIN QUERY PLAN on SQLite, bypassing the engine events."""
+        if conn.dialect.name != "sqlite":
+            return None
+        if not statement.lstrip().upper().startswith(EXPLAINABLE_PREFIXES):
+            return None
+        if executemany and parameters:
+            parameters = parameters[0]
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+                return [str(row[-1]) for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+        except Exception as e:
+            return [f"<explain failed: {e}>"]
+
+    def to_dict(self, top: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Export the collected data as plain Python structures.
+
+        Args:
+            top (Optional[int]): Only include the N statements with the most total time.
+        Returns:
+            Dict[str, Any]: 'histogram_bounds_ms', 'slow_query_ms', 'statements'
+            (sorted by total time) and 'slow_queries' (oldest first).
+        """
+        with self._lock:
+            statements = sorted(
+                self.statements.values(), key=lambda s: s.total_ms, reverse=True
+            )
+            slow = list(self.slow_queries)
+        if top is not None:
+            statements = statements[:top]
+        return {
+            "histogram_bounds_ms": HISTOGRAM_BOUNDS_MS,
+            "slow_query_ms": self.slow_query_ms,
+            "statements": [
+                {**s.model_dump(), "mean_ms": s.mean_ms} for s in statements
+            ],
+            "slow_queries": [q.model_dump(mode="json") for q in slow],
+        }
+
+    def to_json(self, top: Optional[int] = None, indent: Optional[int] = 2) -> str:
+        """Export the collected data as a JSON string."""
+        return json.dumps(self.to_dict(top=top), indent=indent)
+
+
+__all__ = ["QueryInstrumentation", "SlowQuery", "StatementStats"]
@@ -0,0 +1,411 @@
+"""
+wembed_core/maintenance.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Storage maintenance: statistics, retention policies and incremental vacuum.
+
+Maintenance work is split into small steps that each commit on their own,
+and run() stops once its time budget is used up. The next call resumes
+where the previous one stopped, so a background scheduler can call run()
+periodically without holding the write lock for long.
+"""
+
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, Field
+from sqlalchemy import Column, delete, func, insert, inspect, or_, select, update
+from sqlalchemy.orm import Session
+
+from wembed_core.database import DatabaseService
+from wembed_core.models import (
+    DLChunks,
+    DLDoc,
+    DLDocTags,
+    DLHtml,
+    DLMarkdown,
+    DLText,
+    FileIndexingResults,
+    IndexedFileLines,
+    IndexedFiles,
+    IndexedFileVersions,
+    ScanPaths,
+    ScanSnapshotDeltas,
+    ScanSnapshotKeyframes,
+    ScanSnapshots,
+)
+from wembed_core.search.fts import rebuild_fts
+
+ORPHAN_RULES: List[Tuple[Type, str, Type]] = [
+    (DLChunks, "document_id", DLDoc),
+    (DLDocTags, "document_id", DLDoc),
+    (DLHtml, "document_id", DLDoc),
+    (DLMarkdown, "document_id", DLDoc),
+    (DLText, "document_id", DLDoc),
+    (IndexedFileLines, "file_id", IndexedFiles),
+    (IndexedFileVersions, "file_id", IndexedFiles),
+]
+"""(child model, foreign key attribute, parent model) pairs checked for orphans."""
+
+Step = Dict[str, int]
+"""A finished unit of work: rows deleted per table name."""
+
+
+def _primary_key(model: Type) -> Column:
+    return inspect(model).primary_key[0]
+
+
+class MaintenanceConfig(BaseModel):
+    """
+    Configuration model for storage maintenance.
+
+    Attributes:
+        keep_scans (int): Scan results and snapshots kept per root path.
+        keep_file_versions (int): IndexedFiles versions kept per host and path.
+        delete_orphans (bool): Delete rows whose parent document or file is gone.
+        analyze (bool): Refresh the query planner statistics.
+        analysis_limit (int): Rows sampled per index by ANALYZE; 0 for no limit.
+        vacuum_pages_per_step (int): Free pages released per incremental vacuum step.
+        batch_size (int): Rows deleted per step.
+        time_budget_ms (float): Default time slice for run().
+    """
+
+    keep_scans: int = Field(default=10)
+    keep_file_versions: int = Field(default=1)
+    delete_orphans: bool = Field(default=True)
+    analyze: bool = Field(default=True)
+    analysis_limit: int = Field(default=1000)
+    vacuum_pages_per_step: int = Field(default=1000)
+    batch_size: int = Field(default=1000)
+    time_budget_ms: float = Field(default=200.0)
+
+
+class MaintenanceReport(BaseModel):
+    """
+    Outcome of one maintenance run.
+
+    Attributes:
+        completed (bool): True if every task finished within the time budget.
+        steps (int): Number of steps executed.
+        rows_deleted (Dict[str, int]): Rows removed per table.
+        pages_freed (int): Database pages returned to the file system.
+        bytes_reclaimed (int): Shrinkage of the database file in bytes.
+        elapsed_ms (float): Wall time of the run.
+    """
+
+    completed: bool = False
+    steps: int = 0
+    rows_deleted: Dict[str, int] = Field(default_factory=dict)
+    pages_freed: int = 0
+    bytes_reclaimed: int = 0
+    elapsed_ms: float = 0.0
+
+
+class StorageMaintenance:
+    """
+    Runs ANALYZE, retention policies and incremental vacuum in time slices.
+
+    Methods:
+        run(): Execute pending steps until done or out of time.
+        enable_incremental_vacuum(): Convert an existing database to auto_vacuum=INCREMENTAL.
+    """
+
+    def __init__(
+        self, db_service: DatabaseService, config: Optional[MaintenanceConfig] = None
+    ):
+        self._db_service = db_service
+        self.config = config or MaintenanceConfig()
+        self._tasks: List[Callable[[], Iterator[Step]]] = []
+        self._current: Optional[Iterator[Step]] = None
+
+    @property
+    def pending(self) -> bool:
+        """True if a previous run() stopped before finishing."""
+        return bool(self._tasks) or self._current is not None
+
+    def run(self, time_budget_ms: Optional[float] = None) -> MaintenanceReport:
+        """
+        Execute maintenance steps until all tasks are done or the budget is spent.
+
+        A step that has started always finishes, so a run can overshoot the
+        budget by the duration of one step.
+
+        Args:
+            time_budget_ms (Optional[float]): Time slice; defaults to the configured one.
+        Returns:
+            MaintenanceReport: What this run did.
+        """
+        budget = (
+            self.config.time_budget_ms if time_budget_ms is None else time_budget_ms
+        )
+        start = time.perf_counter()
+        deadline = start + budget / 1000.0
+        if not self.pending:
+            self._tasks = self._plan()
+        report = MaintenanceReport()
+        pages_before = self._pragma("page_count")
+
+        while self.pending:
+            if self._current is None:
+                self._current = self._tasks.pop(0)()
+            try:
+                step = next(self._current)
+            except StopIteration:
+                self._current = None
+                continue
+            report.steps += 1
+            for table, deleted in step.items():
+                report.rows_deleted[table] = report.rows_deleted.get(table, 0) + deleted
+            if time.perf_counter() >= deadline:
+                break
+
+        page_size = self._pragma("page_size")
+        report.pages_freed = max(pages_before - self._pragma("page_count"), 0)
+        report.bytes_reclaimed = report.pages_freed * page_size
+        report.completed = not self.pending
+        report.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return report
+
+    def enable_incremental_vacuum(self) -> bool:
+        """
+        Switch the database to auto_vacuum=INCREMENTAL.
+
+        New databases get this mode from DatabaseService. Older files need a
+        one-off full VACUUM, which rewrites the whole file and blocks writers
+        while it runs, so it is left to the caller to schedule.
+
+        Returns:
+            bool: True if the database had to be converted.
+        """
+        if self._pragma("auto_vacuum") == 2:
+            return False
+        with self._db_service.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.commit()
+            conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(
+                "VACUUM"
+            )
+        with self._db_service.get_db() as db:
+            rebuild_fts(db)
+            db.commit()
+        return True
+
+    # -- planning ---------------------------------------------------------
+
+    def _plan(self) -> List[Callable[[], Iterator[Step]]]:
+        tasks: List[Callable[[], Iterator[Step]]] = [
+            self._prune_scans,
+            self._prune_file_versions,
+        ]
+        if self.config.delete_orphans:
+            tasks.append(self._prune_orphans)
+        tasks.append(self._prune_scan_paths)
+        if self.config.analyze:
+            tasks.append(self._analyze)
+        tasks.append(self._incremental_vacuum)
+        return tasks
+
+    def _pragma(self, name: str) -> int:
+        with self._db_service.engine.connect() as conn:
+            return int(conn.exec_driver_sql(f"PRAGMA {name}").scalar() or 0)
+
+    # -- tasks ------------------------------------------------------------
+
+    def _prune_scans(self) -> Iterator[Step]:
+        """Keep the newest 'keep_scans' scan results and snapshots per root."""
+        keep = max(self.config.keep_scans, 1)
+        with self._db_service.get_db() as db:
+            roots = db.scalars(select(FileIndexingResults.root_path).distinct()).all()
+            snapshot_roots = db.scalars(
+                select(ScanSnapshots.root_path).distinct()
+            ).all()
+
+        for root in roots:
+            with self._db_service.get_db() as db:
+                ids = db.scalars(
+                    select(FileIndexingResults.id)
+                    .where(FileIndexingResults.root_path == root)
+                    .order_by(FileIndexingResults.scan_start.desc())
+                    .offset(keep)
+                ).all()
+            for start in range(0, len(ids), self.config.batch_size):
+                batch = ids[start : start + self.config.batch_size]
+                with self._db_service.get_db() as db:
+                    db.execute(
+                        update(ScanSnapshots)
+                        .where(ScanSnapshots.scan_id.in_(batch))
+                        .values(scan_id=None)
+                    )
+                    db.execute(
+                        delete(FileIndexingResults).where(
+                            FileIndexingResults.id.in_(batch)
+                        )
+                    )
+                    db.commit()
+                yield {FileIndexingResults.__tablename__: len(batch)}
+
+        for root in snapshot_roots:
+            with self._db_service.get_db() as db:
+                removed = self._fold_snapshots(db, root, keep)
+            yield {ScanSnapshots.__tablename__: removed} if removed else {}
+
+    @staticmethod
+    def _fold_snapshots(db: Session, root: str, keep: int) -> int:
+        """
+        Merge the oldest snapshots of a root into the oldest one kept.
+
+        The kept base snapshot receives the net (+1) delta of every path
+        present in it, which keeps later snapshots reconstructible. Keyframes
+        of the merged snapshots are dropped with them.
+        """
+        base_id = db.scalar(
+            select(ScanSnapshots.id)
+            .where(ScanSnapshots.root_path == root)
+            .order_by(ScanSnapshots.id.desc())
+            .offset(keep - 1)
+            .limit(1)
+        )
+        if base_id is None:
+            return 0
+        older = select(ScanSnapshots.id).where(
+            ScanSnapshots.root_path == root, ScanSnapshots.id < base_id
+        )
+        if db.scalar(select(func.count()).select_from(older.subquery())) == 0:
+            return 0
+
+        folded = or_(
+            ScanSnapshotDeltas.snapshot_id.in_(older),
+            ScanSnapshotDeltas.snapshot_id == base_id,
+        )
+        present = db.scalars(
+            select(ScanSnapshotDeltas.path_id)
+            .where(folded)
+            .group_by(ScanSnapshotDeltas.path_id)
+            .having(func.sum(ScanSnapshotDeltas.op) > 0)
+        ).all()
+        db.execute(delete(ScanSnapshotDeltas).where(folded))
+        if present:
+            db.execute(
+                insert(ScanSnapshotDeltas),
+                [{"snapshot_id": base_id, "path_id": p, "op": 1} for p in present],
+            )
+        db.execute(
+            update(ScanSnapshots)
+            .where(ScanSnapshots.id == base_id)
+            .values(parent_id=None, added_count=len(present), removed_count=0)
+        )
+        db.execute(
+            delete(ScanSnapshotKeyframes).where(
+                ScanSnapshotKeyframes.snapshot_id.in_(older)
+            )
+        )
+        removed = db.execute(
+            delete(ScanSnapshots).where(ScanSnapshots.id.in_(older))
+        ).rowcount
+        db.commit()
+        return removed
+
+    def _prune_file_versions(self) -> Iterator[Step]:
+        """
+        Delete IndexedFiles rows superseded by newer versions of the same path.
+
+        Rows are ranked by version, then by modification and creation time,
+        then by id, so rows that share a version still rank the same way on
+        every run.
+        """
+        keep = max(self.config.keep_file_versions, 1)
+        rank = (
+            func.row_number()
+            .over(
+                partition_by=(IndexedFiles.host, IndexedFiles.path),
+                order_by=(
+                    IndexedFiles.version.desc(),
+                    IndexedFiles.mtime_iso.desc(),
+                    IndexedFiles.created_at.desc(),
+                    IndexedFiles.id.desc(),
+                ),
+            )
+            .label("rank")
+        )
+        ranked = select(IndexedFiles.id, rank).subquery()
+        stale = select(ranked.c.id).where(ranked.c.rank > keep)
+        while True:
+            with self._db_service.get_db() as db:
+                ids = db.scalars(stale.limit(self.config.batch_size)).all()
+                if not ids:
+                    return
+                lines = db.execute(
+                    delete(IndexedFileLines).where(IndexedFileLines.file_id.in_(ids))
+                ).rowcount
+                db.execute(delete(IndexedFiles).where(IndexedFiles.id.in_(ids)))
+                db.commit()
+            yield {
+                IndexedFiles.__tablename__: len(ids),
+                IndexedFileLines.__tablename__: lines,
+            }
+
+    def _prune_orphans(self) -> Iterator[Step]:
+        """Delete child rows whose parent document or file no longer exists."""
+        for child, column, parent in ORPHAN_RULES:
+            key = _primary_key(child)
+            orphans = (
+                select(key)
+                .where(getattr(child, column).not_in(select(_primary_key(parent))))
+                .limit(self.config.batch_size)
+            )
+            while True:
+                with self._db_service.get_db() as db:
+                    ids = db.scalars(orphans).all()
+                    if not ids:
+                        break
+                    db.execute(delete(child).where(key.in_(ids)))
+                    db.commit()
+                yield {child.__tablename__: len(ids)}
+
+    def _prune_scan_paths(self) -> Iterator[Step]:
+        """Delete interned scan paths no longer referenced by any snapshot."""
+        unused = (
+            select(ScanPaths.id)
+            .where(
+                ScanPaths.id.not_in(select(ScanSnapshotDeltas.path_id)),
+                ScanPaths.id.not_in(select(ScanSnapshotKeyframes.path_id)),
+            )
+            .limit(self.config.batch_size)
+        )
+        while True:
+            with self._db_service.get_db() as db:
+                ids = db.scalars(unused).all()
+                if not ids:
+                    return
+                db.execute(delete(ScanPaths).where(ScanPaths.id.in_(ids)))
+                db.commit()
+            yield {ScanPaths.__tablename__: len(ids)}
+
+    def _analyze(self) -> Iterator[Step]:
+        """Refresh planner statistics, sampling at most 'analysis_limit' rows per index."""
+        with self._db_service.engine.connect() as conn:
+            conn.exec_driver_sql(
+                f"PRAGMA analysis_limit = {self.config.analysis_limit}"
+            )
+            conn.exec_driver_sql("ANALYZE")
+            conn.commit()
+        yield {}
+
+    def _incremental_vacuum(self) -> Iterator[Step]:
+        """Return free pages to the file system a few at a time."""
+        if self._pragma("auto_vacuum") != 2:
+            return
+        pages = self.config.vacuum_pages_per_step
+        free = self._pragma("freelist_count")
+        while free > 0:
+            with self._db_service.engine.connect() as conn:
+                # The pragma frees one page per sqlite3_step(), so it must be
+                # drained on the raw cursor rather than through SQLAlchemy.
+                cursor = conn.connection.dbapi_connection.cursor()
+                cursor.execute(f"PRAGMA incremental_vacuum({pages})").fetchall()
+                cursor.close()
+                conn.commit()
+            yield {}
+            remaining = self._pragma("freelist_count")
+            if remaining >= free:
+                return
+            free = remaining
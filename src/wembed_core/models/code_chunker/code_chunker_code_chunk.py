@@ -6,7 +6,7 @@ SQLAlchemy model for code chunks.
 
 import uuid
 from datetime import datetime, timezone
-from typing import Optional, Set
+from typing import List, Optional, Set
 
 from sqlalchemy import JSON, DateTime, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
@@ -29,6 +29,7 @@ class CodeChunkerCodeChunks(AppBase):
         parent_id (Optional[str]): The UUID of the parent chunk, if any.
         dependencies (Set[str]): A JSON set of dependencies for this chunk.
         docstring (Optional[str]): The docstring associated with the chunk.
+        embedding (Optional[List[float]]): Embedding vector for the chunk content.
         created_at (datetime): Timestamp when the record was created.
     """
 
@@ -46,6 +47,7 @@ class CodeChunkerCodeChunks(AppBase):
     parent_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
     dependencies: Mapped[Set[str]] = mapped_column(JSON, nullable=True)
     docstring: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    embedding: Mapped[Optional[List[float]]] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
@@ -32,7 +32,7 @@ class DLChunks(AppBase):
         ForeignKey("dl_doc.id"), nullable=False, index=True
     )
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
-    chunk_text: Mapped[str] = mapped_column(Text, nullable=False, index=True)
+    chunk_text: Mapped[str] = mapped_column(Text, nullable=False)
     embedding: Mapped[List[float]] = mapped_column(JSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -32,7 +32,7 @@ class DLMarkdown(AppBase):
     document_id: Mapped[int] = mapped_column(
         ForeignKey("dl_doc.id"), nullable=False, index=True
     )
-    markdown: Mapped[Optional[str]] = mapped_column(Text, nullable=True, index=True)
+    markdown: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
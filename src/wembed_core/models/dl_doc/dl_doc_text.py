@@ -30,7 +30,7 @@ class DLText(AppBase):
     document_id: Mapped[int] = mapped_column(
         ForeignKey("dl_doc.id"), nullable=False, index=True
     )
-    text: Mapped[Optional[str]] = mapped_column(Text, nullable=True, index=True)
+    text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -4,18 +4,32 @@ wembed_core/models/indexing/__init__.py
 Initializes the indexing models package.
 """
 
+from .file_stat_snapshots import FileStatSnapshots
 from .indexed_directory import IndexedDirectory
 from .indexed_file_lines import IndexedFileLines
+from .indexed_file_versions import IndexedFileVersions
 from .indexed_files import IndexedFiles
 from .indexed_image import IndexedImage
 from .indexed_structured import IndexedStructured
 from .indexing_results import FileIndexingResults
+from .scan_snapshots import (
+    ScanPaths,
+    ScanSnapshotDeltas,
+    ScanSnapshotKeyframes,
+    ScanSnapshots,
+)
 
 __all__ = [
+    "FileStatSnapshots",
     "IndexedFileLines",
+    "IndexedFileVersions",
     "IndexedFiles",
     "FileIndexingResults",
     "IndexedDirectory",
     "IndexedImage",
     "IndexedStructured",
+    "ScanPaths",
+    "ScanSnapshotDeltas",
+    "ScanSnapshotKeyframes",
+    "ScanSnapshots",
 ]
@@ -0,0 +1,35 @@
+"""
+wembed_core/models/indexing/file_stat_snapshots.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+SQLAlchemy model for the stat snapshot used by incremental scans.
+"""
+
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from wembed_core.database import AppBase
+
+
+class FileStatSnapshots(AppBase):
+    """
+    The stat of a file when it was last processed by a scan of its root.
+
+    A rescan skips a file without opening it if all four values still match.
+
+    Attributes:
+        root_path (str): The scanned root the file belongs to.
+        path (str): Absolute file path.
+        dev (int): Device number.
+        inode (int): Inode number.
+        size (int): Size in bytes.
+        mtime_ns (int): Modification time in nanoseconds.
+    """
+
+    __tablename__ = "file_stat_snapshots"
+
+    root_path: Mapped[str] = mapped_column(String, primary_key=True)
+    path: Mapped[str] = mapped_column(String, primary_key=True)
+    dev: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    inode: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=False)
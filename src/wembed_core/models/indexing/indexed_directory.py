@@ -24,6 +24,7 @@ class IndexedDirectory(AppBase):
         files (List[str], optional): List of file paths in the repository.
         file_count (int): Number of files in the repository.
         indexed_at (datetime, optional): Timestamp of the last indexing operation.
+        last_indexed_commit (str, optional): HEAD commit when a git repository was last indexed.
     """
 
     __tablename__ = "indexed_repos"
@@ -37,3 +38,4 @@ class IndexedDirectory(AppBase):
     indexed_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    last_indexed_commit: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -0,0 +1,62 @@
+"""
+wembed_core/models/indexing/indexed_file_versions.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+SQLAlchemy model for earlier versions of indexed files.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Integer,
+    LargeBinary,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from wembed_core.database import AppBase
+
+
+class IndexedFileVersions(AppBase):
+    """
+    A superseded version of an IndexedFiles record.
+
+    The current version lives in full on the IndexedFiles row. Earlier
+    versions are stored as reverse deltas against the next newer version,
+    with a compressed full copy (keyframe) at regular intervals to bound
+    the number of deltas applied during reconstruction.
+
+    Attributes:
+        id (int): Primary key.
+        file_id (str): Foreign key to the current IndexedFiles record.
+        version (int): Version number this row reconstructs.
+        base_version (Optional[int]): Version the delta applies to; None for keyframes.
+        is_keyframe (bool): True if 'data' is the full compressed content.
+        data (bytes): zlib-compressed delta or full content.
+        sha256 (str): SHA-256 hash of the reconstructed content.
+        size (int): Size of the reconstructed content in bytes.
+        created_at (datetime): Timestamp when the version was superseded.
+    """
+
+    __tablename__ = "indexed_file_versions"
+    __table_args__ = (UniqueConstraint("file_id", "version"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    file_id: Mapped[str] = mapped_column(
+        ForeignKey("indexed_files.id"), nullable=False, index=True
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    base_version: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    is_keyframe: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    sha256: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
@@ -9,6 +9,7 @@ from typing import Optional
 
 from sqlalchemy import (
     DateTime,
+    Index,
     Integer,
     LargeBinary,
     String,
@@ -40,11 +41,13 @@ class IndexedFiles(AppBase):
         mtime_iso (datetime): Last modification time of the file in ISO format.
         uri (str): URI of the file.
         mimetype (str): MIME type of the file.
+        git_blob_sha (str, optional): Git blob id of the content, for files indexed from a repository.
         created_at (datetime): Timestamp when the record was created.
         updated_at (datetime): Timestamp when the record was last updated.
     """
 
     __tablename__ = "indexed_files"
+    __table_args__ = (Index("ix_indexed_files_host_path", "host", "path"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     version: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
@@ -62,9 +65,10 @@ class IndexedFiles(AppBase):
     mtime_iso: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     uri: Mapped[str] = mapped_column(String, nullable=False)
     mimetype: Mapped[str] = mapped_column(String, nullable=False)
+    git_blob_sha: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default="now()"
+        DateTime, nullable=False, default=datetime.now
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, nullable=False, default="now()", onupdate="now()"
+        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now
     )
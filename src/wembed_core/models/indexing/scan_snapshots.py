@@ -0,0 +1,115 @@
+"""
+wembed_core/models/indexing/scan_snapshots.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+SQLAlchemy models for delta-encoded scan snapshots.
+
+A snapshot is the set of paths found by one scan of a root. Instead of
+storing the full list per scan, every path is interned once in 'scan_paths'
+and each snapshot stores only the paths added (+1) or removed (-1) relative
+to the previous snapshot of the same root. Every so often a snapshot also
+stores its full path list as a keyframe, so rebuilding a snapshot never
+replays more than the deltas recorded since the last keyframe.
+"""
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from wembed_core.database import AppBase
+
+
+class ScanPaths(AppBase):
+    """
+    An interned file path shared by all snapshots.
+
+    Attributes:
+        id (int): Primary key.
+        path (str): Absolute file path (unique).
+    """
+
+    __tablename__ = "scan_paths"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    path: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+
+
+class ScanSnapshots(AppBase):
+    """
+    One scan of a root, stored as a delta against the previous scan.
+
+    Attributes:
+        id (int): Primary key, increasing with each recorded scan.
+        root_path (str): The root path that was scanned.
+        scan_id (Optional[str]): The matching FileIndexingResults id, if any.
+        parent_id (Optional[int]): Previous snapshot of the same root.
+        file_count (int): Number of paths in the snapshot.
+        added_count (int): Paths added since the parent snapshot.
+        removed_count (int): Paths removed since the parent snapshot.
+        is_keyframe (Optional[bool]): True if the full path list is stored
+            in 'scan_snapshot_keyframes'.
+        created_at (datetime): Timestamp when the snapshot was recorded.
+    """
+
+    __tablename__ = "scan_snapshots"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    root_path: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    scan_id: Mapped[Optional[str]] = mapped_column(
+        ForeignKey("indexing_results.id"), nullable=True, index=True
+    )
+    parent_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("scan_snapshots.id"), nullable=True
+    )
+    file_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    added_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    removed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    is_keyframe: Mapped[Optional[bool]] = mapped_column(
+        Boolean, nullable=True, default=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+
+class ScanSnapshotDeltas(AppBase):
+    """
+    A path added to or removed from a snapshot.
+
+    Attributes:
+        snapshot_id (int): Snapshot the change belongs to.
+        path_id (int): Interned path that changed.
+        op (int): +1 if the path was added, -1 if it was removed.
+    """
+
+    __tablename__ = "scan_snapshot_deltas"
+
+    snapshot_id: Mapped[int] = mapped_column(
+        ForeignKey("scan_snapshots.id"), primary_key=True
+    )
+    path_id: Mapped[int] = mapped_column(
+        ForeignKey("scan_paths.id"), primary_key=True, index=True
+    )
+    op: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+
+
+class ScanSnapshotKeyframes(AppBase):
+    """
+    A path present in a keyframe snapshot.
+
+    Attributes:
+        snapshot_id (int): Keyframe snapshot the path belongs to.
+        path_id (int): Interned path present in the snapshot.
+    """
+
+    __tablename__ = "scan_snapshot_keyframes"
+
+    snapshot_id: Mapped[int] = mapped_column(
+        ForeignKey("scan_snapshots.id"), primary_key=True
+    )
+    path_id: Mapped[int] = mapped_column(
+        ForeignKey("scan_paths.id"), primary_key=True, index=True
+    )
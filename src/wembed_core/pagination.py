@@ -0,0 +1,160 @@
+"""
+wembed_core/pagination.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Streaming and keyset-paginated reads for large tables.
+"""
+
+import base64
+import json
+from typing import Any, Generic, Iterator, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Select, inspect, select
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """
+    One page of a keyset-paginated query.
+
+    Attributes:
+        items (List[T]): Rows of this page.
+        next_cursor (Optional[str]): Opaque token for the following page, None on the last page.
+    """
+
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(value: Any) -> str:
+    """Encode the last seen key value as an opaque, URL-safe cursor token."""
+    raw = json.dumps({"k": value}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> Any:
+    """
+    Decode a cursor token produced by encode_cursor().
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["k"]
+    except Exception as e:
+        raise ValueError(f"Invalid pagination cursor: {token!r}") from e
+
+
+def _key_column(model: Type[Any]) -> InstrumentedAttribute:
+    """Return the single-column primary key attribute of a model."""
+    primary_key = inspect(model).primary_key
+    if len(primary_key) != 1:
+        raise ValueError(
+            f"{model.__name__} needs a single-column key for keyset paging."
+        )
+    return getattr(model, primary_key[0].key)
+
+
+def stream_query(
+    session: Session, stmt: Select, batch_size: int = 1000
+) -> Iterator[Any]:
+    """
+    Stream the rows of a statement in batches without loading the full result.
+
+    Uses yield_per with a server-side cursor where the driver supports one,
+    so memory stays proportional to 'batch_size'.
+
+    Args:
+        session (Session): Open database session.
+        stmt (Select): The statement to execute.
+        batch_size (int): Rows fetched per round trip.
+    Yields:
+        ORM entities for single-entity selects, otherwise Row objects.
+    """
+    stmt = stmt.execution_options(yield_per=batch_size, stream_results=True)
+    result = session.execute(stmt)
+    columns = stmt.column_descriptions
+    if len(columns) == 1 and columns[0]["expr"] is columns[0].get("entity"):
+        yield from result.scalars()
+    else:
+        yield from result
+
+
+def iter_table(
+    session: Session,
+    model: Type[T],
+    batch_size: int = 1000,
+    stmt: Optional[Select] = None,
+) -> Iterator[T]:
+    """
+    Iterate over every row of a model using keyset pagination on its primary key.
+
+    Each batch is a separate indexed range query ('key > last ORDER BY key
+    LIMIT n'), so no long-lived cursor or OFFSET scan is needed. Rows that
+    the caller does not keep or modify are released by the session's weak
+    identity map once the next batch is loaded.
+
+    Args:
+        session (Session): Open database session.
+        model (Type[T]): Mapped class to iterate over.
+        batch_size (int): Rows fetched per query.
+        stmt (Optional[Select]): Base select with extra filters; defaults to select(model).
+    Yields:
+        T: Model instances in primary key order.
+    """
+    key = _key_column(model)
+    base = stmt if stmt is not None else select(model)
+    last = None
+    while True:
+        query = base.order_by(key).limit(batch_size)
+        if last is not None:
+            query = query.where(key > last)
+        batch = session.scalars(query).all()
+        if not batch:
+            return
+        yield from batch
+        last = getattr(batch[-1], key.key)
+        if len(batch) < batch_size:
+            return
+
+
+def paginate(
+    session: Session,
+    model: Type[T],
+    page_size: int = 100,
+    cursor: Optional[str] = None,
+    stmt: Optional[Select] = None,
+) -> Page[T]:
+    """
+    Fetch one page of a model ordered by primary key.
+
+    Args:
+        session (Session): Open database session.
+        model (Type[T]): Mapped class to page over.
+        page_size (int): Maximum number of rows per page.
+        cursor (Optional[str]): Token from a previous page's next_cursor.
+        stmt (Optional[Select]): Base select with extra filters; defaults to select(model).
+    Returns:
+        Page[T]: The rows and the cursor for the next page.
+    """
+    key = _key_column(model)
+    query = (stmt if stmt is not None else select(model)).order_by(key)
+    if cursor is not None:
+        query = query.where(key > decode_cursor(cursor))
+    rows = session.scalars(query.limit(page_size + 1)).all()
+    has_more = len(rows) > page_size
+    items = list(rows[:page_size])
+    next_cursor = encode_cursor(getattr(items[-1], key.key)) if has_more else None
+    return Page(items=items, next_cursor=next_cursor)
+
+
+__all__ = [
+    "Page",
+    "decode_cursor",
+    "encode_cursor",
+    "iter_table",
+    "paginate",
+    "stream_query",
+]
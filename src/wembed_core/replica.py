@@ -0,0 +1,281 @@
+"""
+wembed_core/replica.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+In-memory read replica of the SQLite index for query serving.
+
+The replica is a copy of the database (or of selected tables) in a shared
+in-memory SQLite database, made with the SQLite online backup API. Every
+refresh builds a new copy and swaps it in, so readers never see a
+half-copied replica and ingestion keeps the on-disk file to itself.
+"""
+
+import contextlib
+import itertools
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Generator, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
+
+_generation = itertools.count(1)
+
+
+class ReplicaStatus(BaseModel):
+    """
+    Freshness of a read replica.
+
+    Attributes:
+        generation (int): Number of the current copy; increases on every refresh.
+        refreshed_at (Optional[datetime]): When the current copy was taken.
+        refresh_ms (float): Duration of the last refresh.
+        stale (bool): True if the source has changed since the copy was taken.
+        lag_seconds (float): Upper bound on how far the replica is behind; 0 when fresh.
+        tables (Optional[List[str]]): Tables copied, None for the whole database.
+    """
+
+    generation: int = 0
+    refreshed_at: Optional[datetime] = None
+    refresh_ms: float = 0.0
+    stale: bool = True
+    lag_seconds: float = 0.0
+    tables: Optional[List[str]] = None
+
+
+def _set_query_only(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only = ON")
+    cursor.close()
+
+
+class ReadReplica:
+    """
+    A refreshable in-memory copy of a SQLite database.
+
+    Methods:
+        refresh(): Take a new copy and swap it in.
+        is_stale(): Whether the source changed since the last copy.
+        session(): A read-only session on the replica.
+        start(): Refresh in a background thread on an interval or on notify().
+        notify(): Wake the background thread to refresh now.
+        status(): Freshness metrics.
+        close(): Stop refreshing and release the replica.
+    """
+
+    def __init__(
+        self,
+        source: Engine,
+        tables: Optional[List[str]] = None,
+        pages_per_step: int = 1024,
+    ):
+        """
+        Initialize the replica; call refresh() or start() to populate it.
+        Args:
+            source (Engine): Engine of the on-disk database.
+            tables (Optional[List[str]]): Tables to copy, with their indexes; None copies everything.
+            pages_per_step (int): Pages copied per backup step; the source is unlocked between steps.
+        Raises:
+            ValueError: If the source is not SQLite, or tables are selected from an in-memory source.
+        """
+        if source.dialect.name != "sqlite":
+            raise ValueError("Read replicas require a SQLite database.")
+        self.source = source
+        self.source_path = source.url.database or ""
+        self.in_memory_source = self.source_path in ("", ":memory:")
+        if tables and self.in_memory_source:
+            raise ValueError("Selecting tables requires a file-backed database.")
+        self.tables = tables
+        self.pages_per_step = pages_per_step
+
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._sessionmaker: Optional[sessionmaker] = None
+        self._keeper: Optional[sqlite3.Connection] = None
+        self._monitor: Optional[sqlite3.Connection] = None
+        self._source_version: Optional[int] = None
+        self._status = ReplicaStatus(tables=tables)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -- copying ----------------------------------------------------------
+
+    def _data_version(self) -> Optional[int]:
+        """PRAGMA data_version of a dedicated connection; it changes when others commit."""
+        if self.in_memory_source:
+            return None
+        if self._monitor is None:
+            self._monitor = sqlite3.connect(self.source_path, check_same_thread=False)
+        return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def _copy_database(self, target: sqlite3.Connection) -> None:
+        if self.in_memory_source:
+            raw = self.source.raw_connection()
+            try:
+                raw.driver_connection.backup(target, pages=self.pages_per_step)
+            finally:
+                raw.close()
+            return
+        source = sqlite3.connect(self.source_path)
+        try:
+            source.backup(target, pages=self.pages_per_step)
+        finally:
+            source.close()
+
+    def _copy_tables(self, target: sqlite3.Connection) -> None:
+        target.execute("ATTACH DATABASE ? AS src", (self.source_path,))
+        try:
+            placeholders = ", ".join("?" for _ in self.tables)
+            schema = target.execute(
+                "SELECT type, name, tbl_name, sql FROM src.sqlite_master "
+                f"WHERE tbl_name IN ({placeholders}) AND sql IS NOT NULL "
+                "ORDER BY type = 'index'",
+                self.tables,
+            ).fetchall()
+            for kind, name, table, sql in schema:
+                target.execute(sql)
+                if kind != "table":
+                    continue
+                if sql.upper().startswith("CREATE VIRTUAL TABLE"):
+                    target.execute(
+                        f"INSERT INTO main.{name}({name}) VALUES ('rebuild')"
+                    )
+                else:
+                    target.execute(f"INSERT INTO main.{name} SELECT * FROM src.{name}")
+            target.commit()
+        finally:
+            target.execute("DETACH DATABASE src")
+
+    def refresh(self) -> ReplicaStatus:
+        """
+        Copy the source into a new in-memory database and route readers to it.
+
+        Returns:
+            ReplicaStatus: Metrics after the refresh.
+        """
+        start = time.perf_counter()
+        version = self._data_version()
+        uri = f"file:wembed-replica-{id(self)}-{next(_generation)}?mode=memory&cache=shared"
+        keeper = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        if self.tables:
+            self._copy_tables(keeper)
+        else:
+            self._copy_database(keeper)
+
+        engine = create_engine(
+            "sqlite://",
+            creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+            poolclass=QueuePool,
+        )
+        event.listen(engine, "connect", _set_query_only)
+        with self._lock:
+            old_engine, old_keeper = self._engine, self._keeper
+            self._engine, self._keeper = engine, keeper
+            self._sessionmaker = sessionmaker(
+                autocommit=False, autoflush=False, bind=engine
+            )
+            self._source_version = version
+            self._status = ReplicaStatus(
+                generation=self._status.generation + 1,
+                refreshed_at=datetime.now(timezone.utc),
+                refresh_ms=(time.perf_counter() - start) * 1000.0,
+                stale=False,
+                tables=self.tables,
+            )
+        if old_engine is not None:
+            old_engine.dispose()
+            old_keeper.close()
+        return self.status()
+
+    def is_stale(self) -> bool:
+        """
+        True if the source has committed changes since the last refresh.
+
+        An in-memory source cannot be observed from another connection, so
+        it is always reported as stale.
+        """
+        if self._engine is None or self.in_memory_source:
+            return True
+        return self._data_version() != self._source_version
+
+    def status(self) -> ReplicaStatus:
+        """Return freshness metrics; lag is the age of the copy while it is stale."""
+        status = self._status.model_copy()
+        status.stale = self.is_stale()
+        if status.stale and status.refreshed_at is not None:
+            age = datetime.now(timezone.utc) - status.refreshed_at
+            status.lag_seconds = age.total_seconds()
+        return status
+
+    # -- serving ----------------------------------------------------------
+
+    @contextlib.contextmanager
+    def session(self) -> Generator[Session, None, None]:
+        """
+        Provide a read-only session on the current copy.
+        Raises:
+            Exception: If the replica has not been populated yet.
+        """
+        with self._lock:
+            factory = self._sessionmaker
+        if factory is None:
+            raise Exception("Read replica not populated. Call refresh() first.")
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    # -- scheduling -------------------------------------------------------
+
+    def start(self, interval_s: float = 30.0) -> None:
+        """
+        Refresh in a background thread.
+
+        Every 'interval_s' seconds, or as soon as notify() is called, the
+        thread refreshes the replica if the source has changed.
+        """
+        if self._thread is not None:
+            return
+        if self._engine is None:
+            self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval_s,), name="wembed-replica", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, interval_s: float) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(interval_s)
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            if self.is_stale():
+                self.refresh()
+
+    def notify(self) -> None:
+        """Ask the background thread to check for changes now."""
+        self._wake.set()
+
+    def close(self) -> None:
+        """Stop the background thread and release the in-memory copy."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            engine, keeper = self._engine, self._keeper
+            self._engine = self._keeper = self._sessionmaker = None
+        if engine is not None:
+            engine.dispose()
+            keeper.close()
+        if self._monitor is not None:
+            self._monitor.close()
+            self._monitor = None
@@ -0,0 +1,40 @@
+"""
+wembed_core/search/__init__.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Search package.
+Provides full-text (FTS5) and hybrid dense + lexical retrieval over the indexed corpora.
+"""
+
+from .fts import (  # noqa: F401
+    FTS_INDEXES,
+    FTSHit,
+    FTSIndexSpec,
+    drop_fts,
+    fts_search,
+    install_fts,
+    rebuild_fts,
+    to_fts_query,
+)
+from .hybrid import (  # noqa: F401
+    HybridHit,
+    HybridRetriever,
+    HybridSearchConfig,
+    HybridSearchResult,
+    reciprocal_rank_fusion,
+)
+
+__all__ = [
+    "FTS_INDEXES",
+    "FTSHit",
+    "FTSIndexSpec",
+    "HybridHit",
+    "HybridRetriever",
+    "HybridSearchConfig",
+    "HybridSearchResult",
+    "drop_fts",
+    "fts_search",
+    "install_fts",
+    "rebuild_fts",
+    "reciprocal_rank_fusion",
+    "to_fts_query",
+]
@@ -0,0 +1,268 @@
+"""
+wembed_core/search/fts.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+SQLite FTS5 full-text indexes over file content, file lines and chunks.
+
+Each searchable corpus gets an external-content FTS5 table that points back at
+the rowid of its source table, so the text is stored only once. Triggers on the
+source tables keep the index in sync for ORM writes and bulk inserts alike.
+"""
+
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from wembed_core.database import AppBase
+from wembed_core.enums import FTSSources
+
+
+class FTSIndexSpec(BaseModel):
+    """
+    Describes one FTS5 index and the source table it mirrors.
+
+    Attributes:
+        fts_table (str): Name of the FTS5 virtual table.
+        content_table (str): Name of the source table.
+        text_column (str): Column of the source table that is indexed.
+        key_column (str): Column returned as the hit key.
+        filter_columns (List[str]): Source columns allowed in search filters.
+    """
+
+    fts_table: str
+    content_table: str
+    text_column: str
+    key_column: str
+    filter_columns: List[str] = Field(default_factory=list)
+
+
+class FTSHit(BaseModel):
+    """
+    A single BM25-ranked full-text search result.
+
+    Attributes:
+        source (FTSSources): Corpus the hit came from.
+        key (str | int): Value of the source table key column.
+        rowid (int): Rowid of the source row.
+        score (float): BM25 relevance, higher is better.
+        snippet (Optional[str]): Highlighted excerpt around the match.
+    """
+
+    source: FTSSources
+    key: str | int
+    rowid: int
+    score: float
+    snippet: Optional[str] = None
+
+
+FTS_INDEXES: Dict[FTSSources, FTSIndexSpec] = {
+    FTSSources.INDEXED_FILES: FTSIndexSpec(
+        fts_table="indexed_files_fts",
+        content_table="indexed_files",
+        text_column="content_text",
+        key_column="id",
+        filter_columns=["host", "suffix", "mimetype", "path"],
+    ),
+    FTSSources.FILE_LINES: FTSIndexSpec(
+        fts_table="indexed_file_lines_fts",
+        content_table="indexed_file_lines",
+        text_column="line_text",
+        key_column="id",
+        filter_columns=["file_id", "file_source_name", "file_source_type"],
+    ),
+    FTSSources.DOC_CHUNKS: FTSIndexSpec(
+        fts_table="dl_doc_chunks_fts",
+        content_table="dl_doc_chunks",
+        text_column="chunk_text",
+        key_column="id",
+        filter_columns=["document_id"],
+    ),
+    FTSSources.CODE_CHUNKS: FTSIndexSpec(
+        fts_table="code_chunker_code_chunks_fts",
+        content_table="code_chunker_code_chunks",
+        text_column="content",
+        key_column="id",
+        filter_columns=["chunk_type", "file_path", "parent_id"],
+    ),
+}
+"""Registry of the FTS5 indexes keyed by corpus."""
+
+# B-tree indexes on large text columns that FTS5 replaces.
+LEGACY_TEXT_INDEXES = [
+    "ix_dl_doc_chunks_chunk_text",
+    "ix_dl_markdown_markdown",
+    "ix_dl_text_text",
+]
+
+
+def _create_statements(spec: FTSIndexSpec) -> List[str]:
+    """Build the DDL for an FTS5 table and its sync triggers."""
+    fts, src, col = spec.fts_table, spec.content_table, spec.text_column
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+        f"{col}, content='{src}', content_rowid='rowid', "
+        "tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {src} BEGIN "
+        f"INSERT INTO {fts}(rowid, {col}) VALUES (new.rowid, new.{col}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {src} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col}) "
+        f"VALUES ('delete', old.rowid, old.{col}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {col} ON {src} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {col}) "
+        f"VALUES ('delete', old.rowid, old.{col}); "
+        f"INSERT INTO {fts}(rowid, {col}) VALUES (new.rowid, new.{col}); END",
+    ]
+
+
+def _table_exists(connection: Connection, name: str) -> bool:
+    row = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": name}
+    ).first()
+    return row is not None
+
+
+def install_fts(connection: Connection) -> List[str]:
+    """
+    Create any missing FTS5 tables and triggers on a SQLite connection.
+
+    Newly created indexes are populated from their source tables, and the
+    legacy B-tree indexes on text columns are dropped.
+
+    Args:
+        connection (Connection): An open SQLAlchemy connection.
+    Returns:
+        List[str]: Names of the FTS5 tables that were created.
+    """
+    if connection.dialect.name != "sqlite":
+        return []
+    created = []
+    for spec in FTS_INDEXES.values():
+        if not _table_exists(connection, spec.content_table):
+            continue
+        is_new = not _table_exists(connection, spec.fts_table)
+        for statement in _create_statements(spec):
+            connection.execute(text(statement))
+        if is_new:
+            rebuild_fts(connection, spec)
+            created.append(spec.fts_table)
+    for index_name in LEGACY_TEXT_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+    return created
+
+
+def drop_fts(connection: Connection, spec: FTSIndexSpec) -> None:
+    """
+    Drop an FTS5 table and its triggers.
+
+    Used by bulk loaders: writing the source table without triggers and
+    letting install_fts() rebuild the index afterwards is much faster than
+    maintaining it row by row.
+    """
+    for suffix in ("ai", "ad", "au"):
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {spec.fts_table}_{suffix}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {spec.fts_table}"))
+
+
+def rebuild_fts(
+    connection: Connection | Session, spec: Optional[FTSIndexSpec] = None
+) -> None:
+    """
+    Rebuild one or all FTS5 indexes from their source tables.
+
+    Needed after a full VACUUM, which may renumber the implicit rowids of
+    tables without an INTEGER PRIMARY KEY such as 'indexed_files'.
+    """
+    specs = [spec] if spec else list(FTS_INDEXES.values())
+    for item in specs:
+        connection.execute(
+            text(f"INSERT INTO {item.fts_table}({item.fts_table}) VALUES ('rebuild')")
+        )
+
+
+def to_fts_query(query: str, match_all: bool = True) -> str:
+    """
+    Convert free text into a safe FTS5 MATCH expression.
+
+    Each whitespace-separated term is quoted as a phrase so punctuation in
+    identifiers (e.g. 'get_db()' or 'a.b') cannot break the query syntax.
+
+    Args:
+        query (str): The user's search text.
+        match_all (bool): Require every term (AND) instead of any term (OR).
+    Returns:
+        str: An FTS5 query string, empty if the input has no terms.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in query.split()]
+    return (" " if match_all else " OR ").join(terms)
+
+
+def fts_search(
+    session: Session | Connection,
+    source: FTSSources | str,
+    query: str,
+    limit: int = 20,
+    filters: Optional[Dict[str, Any]] = None,
+    match_all: bool = True,
+    raw_query: bool = False,
+    with_snippets: bool = False,
+) -> List[FTSHit]:
+    """
+    Run a BM25-ranked full-text query against one corpus.
+
+    Filters are equality constraints on whitelisted source-table columns and
+    are evaluated inside the same SQL statement as the MATCH, so only
+    qualifying rows are ranked and returned.
+
+    Args:
+        session (Session | Connection): Database session or connection.
+        source (FTSSources | str): Corpus to search.
+        query (str): Free text, or an FTS5 expression when raw_query is set.
+        limit (int): Maximum number of hits.
+        filters (Optional[Dict[str, Any]]): Column equality filters.
+        match_all (bool): AND the query terms instead of OR-ing them.
+        raw_query (bool): Pass 'query' to MATCH unchanged.
+        with_snippets (bool): Include a highlighted snippet per hit.
+    Returns:
+        List[FTSHit]: Hits ordered from most to least relevant.
+    Raises:
+        ValueError: If a filter column is not allowed for the corpus.
+    """
+    source = FTSSources(source)
+    spec = FTS_INDEXES[source]
+    match = query if raw_query else to_fts_query(query, match_all=match_all)
+    if not match:
+        return []
+
+    params: Dict[str, Any] = {"match": match, "limit": limit}
+    where = [f"{spec.fts_table} MATCH :match"]
+    for i, (column, value) in enumerate((filters or {}).items()):
+        if column not in spec.filter_columns:
+            raise ValueError(f"Cannot filter {source.value} on column '{column}'.")
+        where.append(f"src.{column} = :f{i}")
+        params[f"f{i}"] = value
+
+    snippet = (
+        f"snippet({spec.fts_table}, 0, '[', ']', '...', 16)"
+        if with_snippets
+        else "NULL"
+    )
+    sql = (
+        f"SELECT src.{spec.key_column}, src.rowid, bm25({spec.fts_table}), {snippet} "
+        f"FROM {spec.fts_table} JOIN {spec.content_table} AS src "
+        f"ON src.rowid = {spec.fts_table}.rowid "
+        f"WHERE {' AND '.join(where)} "
+        f"ORDER BY bm25({spec.fts_table}) LIMIT :limit"
+    )
+    rows = session.execute(text(sql), params).all()
+    return [
+        FTSHit(source=source, key=key, rowid=rowid, score=-score, snippet=snip)
+        for key, rowid, score, snip in rows
+    ]
+
+
+@event.listens_for(AppBase.metadata, "after_create")
+def _install_fts_after_create(target: Any, connection: Connection, **kw: Any) -> None:
+    """Install the FTS5 indexes whenever the schema is created."""
+    install_fts(connection)
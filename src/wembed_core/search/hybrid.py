@@ -0,0 +1,270 @@
+"""
+wembed_core/search/hybrid.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Hybrid dense + lexical retrieval fused with reciprocal rank fusion.
+"""
+
+import heapq
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+from pydantic import BaseModel, Field
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from wembed_core.database import DatabaseService
+from wembed_core.embedding import EmbeddingService
+from wembed_core.enums import FTSSources
+from wembed_core.models import CodeChunkerCodeChunks, DLChunks, IndexedFileLines
+
+from .fts import fts_search
+
+DENSE_MODELS = {
+    FTSSources.FILE_LINES: IndexedFileLines,
+    FTSSources.DOC_CHUNKS: DLChunks,
+    FTSSources.CODE_CHUNKS: CodeChunkerCodeChunks,
+}
+"""Models with an 'embedding' column, keyed by corpus."""
+
+HitKey = Tuple[FTSSources, str | int]
+
+
+class HybridSearchConfig(BaseModel):
+    """
+    Configuration model for hybrid retrieval.
+
+    Attributes:
+        sources (List[FTSSources]): Corpora to search.
+        lexical_k (int): BM25 candidates taken per corpus.
+        dense_k (int): Vector candidates taken per corpus.
+        top_k (int): Number of fused hits returned.
+        rrf_k (int): Reciprocal rank fusion damping constant.
+        batch_size (int): Rows scored per batch during the vector scan.
+        match_all (bool): Require all query terms in the lexical stage.
+    """
+
+    sources: List[FTSSources] = Field(default_factory=lambda: list(DENSE_MODELS))
+    lexical_k: int = Field(default=50)
+    dense_k: int = Field(default=50)
+    top_k: int = Field(default=10)
+    rrf_k: int = Field(default=60)
+    batch_size: int = Field(default=2048)
+    match_all: bool = Field(default=False)
+
+
+class HybridHit(BaseModel):
+    """
+    A fused retrieval result.
+
+    Attributes:
+        source (FTSSources): Corpus the hit came from.
+        key (str | int): Primary key of the source row.
+        score (float): Reciprocal rank fusion score.
+        lexical_rank (Optional[int]): 1-based BM25 rank within its corpus, if retrieved lexically.
+        dense_rank (Optional[int]): 1-based vector rank, if retrieved densely.
+        lexical_score (Optional[float]): BM25 relevance.
+        dense_score (Optional[float]): Cosine similarity.
+    """
+
+    source: FTSSources
+    key: str | int
+    score: float
+    lexical_rank: Optional[int] = None
+    dense_rank: Optional[int] = None
+    lexical_score: Optional[float] = None
+    dense_score: Optional[float] = None
+
+
+class HybridSearchResult(BaseModel):
+    """
+    Fused hits plus per-stage timings in milliseconds.
+
+    Attributes:
+        hits (List[HybridHit]): Fused hits, best first.
+        timings (Dict[str, float]): Stage durations: 'lexical', 'embed',
+            'dense', 'fusion' and 'total'.
+        candidates (Dict[str, int]): Candidate counts per stage.
+    """
+
+    hits: List[HybridHit]
+    timings: Dict[str, float]
+    candidates: Dict[str, int]
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[HitKey]], k: int = 60
+) -> List[Tuple[HitKey, float]]:
+    """
+    Fuse ranked lists with reciprocal rank fusion.
+
+    Args:
+        rankings (List[List[HitKey]]): Ranked lists, best first.
+        k (int): Damping constant; larger values flatten rank differences.
+    Returns:
+        List[Tuple[HitKey, float]]: Keys with fused scores, best first.
+    """
+    scores: Dict[HitKey, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever:
+    """
+    Runs BM25 and vector retrieval in parallel and fuses the rankings.
+
+    BM25 scores depend on each FTS table's own statistics, so every
+    corpus contributes its own lexical ranking to the fusion. Dense results
+    are ranked per corpus too, so both retrievers carry the same weight.
+    """
+
+    def __init__(
+        self,
+        db_service: DatabaseService,
+        embedding_service: EmbeddingService,
+        config: Optional[HybridSearchConfig] = None,
+    ):
+        self._db_service = db_service
+        self._embedding_service = embedding_service
+        self.config = config or HybridSearchConfig()
+
+    def search(self, query: str) -> HybridSearchResult:
+        """Retrieve, fuse and time the results for a query."""
+        start = time.perf_counter()
+        timings: Dict[str, float] = {}
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            lexical_future = pool.submit(self._lexical, query, timings)
+            dense_future = pool.submit(self._dense, query, timings)
+            lexical = lexical_future.result()
+            dense = dense_future.result()
+
+        fusion_start = time.perf_counter()
+        lexical_ranks = {
+            key: (i, s)
+            for ranking in lexical
+            for i, (key, s) in enumerate(ranking, start=1)
+        }
+        dense_ranks = {
+            key: (i, s)
+            for ranking in dense
+            for i, (key, s) in enumerate(ranking, start=1)
+        }
+        rankings = [[key for key, _ in ranking] for ranking in lexical + dense]
+        fused = reciprocal_rank_fusion(rankings, k=self.config.rrf_k)
+        hits = []
+        for (source, key), score in fused[: self.config.top_k]:
+            lex = lexical_ranks.get((source, key))
+            den = dense_ranks.get((source, key))
+            hits.append(
+                HybridHit(
+                    source=source,
+                    key=key,
+                    score=score,
+                    lexical_rank=lex[0] if lex else None,
+                    lexical_score=lex[1] if lex else None,
+                    dense_rank=den[0] if den else None,
+                    dense_score=den[1] if den else None,
+                )
+            )
+        timings["fusion"] = _elapsed_ms(fusion_start)
+        timings["total"] = _elapsed_ms(start)
+        return HybridSearchResult(
+            hits=hits,
+            timings=timings,
+            candidates={
+                "lexical": len(lexical_ranks),
+                "dense": len(dense_ranks),
+                "fused": len(fused),
+            },
+        )
+
+    def _lexical(
+        self, query: str, timings: Dict[str, float]
+    ) -> List[List[Tuple[HitKey, float]]]:
+        """BM25 candidates, one ranking per corpus, best first."""
+        start = time.perf_counter()
+        rankings = []
+        with self._db_service.get_read_db() as db:
+            for source in self.config.sources:
+                hits = fts_search(
+                    db,
+                    source,
+                    query,
+                    limit=self.config.lexical_k,
+                    match_all=self.config.match_all,
+                )
+                if hits:
+                    rankings.append([((h.source, h.key), h.score) for h in hits])
+        timings["lexical"] = _elapsed_ms(start)
+        return rankings
+
+    def _dense(
+        self, query: str, timings: Dict[str, float]
+    ) -> List[List[Tuple[HitKey, float]]]:
+        """Cosine-similarity candidates, one ranking per corpus, best first."""
+        start = time.perf_counter()
+        vector = np.asarray(
+            self._embedding_service.get_embedding(query)[0], dtype=np.float32
+        )
+        timings["embed"] = _elapsed_ms(start)
+
+        start = time.perf_counter()
+        norm = float(np.linalg.norm(vector))
+        rankings: List[List[Tuple[HitKey, float]]] = []
+        if norm:
+            vector /= norm
+            with self._db_service.get_read_db() as db:
+                for source in self.config.sources:
+                    model = DENSE_MODELS.get(source)
+                    if model is None:
+                        continue
+                    heap = self._score_source(db, source, model, vector)
+                    if heap:
+                        heap.sort(reverse=True)
+                        rankings.append([(key, score) for score, _, key in heap])
+        timings["dense"] = _elapsed_ms(start)
+        return rankings
+
+    def _score_source(
+        self,
+        db: Session,
+        source: FTSSources,
+        model: Type[Any],
+        vector: np.ndarray,
+    ) -> List[Tuple[float, int, HitKey]]:
+        """Score one corpus, keeping its top 'dense_k' rows in a min-heap."""
+        heap: List[Tuple[float, int, HitKey]] = []
+        counter = itertools.count()
+        stmt = (
+            select(model.id, model.embedding)
+            .where(model.embedding.is_not(None))
+            .execution_options(yield_per=self.config.batch_size)
+        )
+        for partition in db.execute(stmt).partitions():
+            keys = []
+            rows = []
+            for key, embedding in partition:
+                if embedding and len(embedding) == len(vector):
+                    keys.append(key)
+                    rows.append(embedding)
+            if not rows:
+                continue
+            matrix = np.asarray(rows, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1)
+            norms[norms == 0] = 1.0
+            sims = (matrix @ vector) / norms
+            for key, sim in zip(keys, sims.tolist()):
+                item = (sim, next(counter), (source, key))
+                if len(heap) < self.config.dense_k:
+                    heapq.heappush(heap, item)
+                elif sim > heap[0][0]:
+                    heapq.heapreplace(heap, item)
+        return heap
+
+
+def _elapsed_ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000.0
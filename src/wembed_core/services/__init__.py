@@ -4,12 +4,47 @@
  Services for various functionalities in the application.
 """
 
+from .content_hash_index import ContentHashIndex, HashLookupStats  # noqa: F401, F403
 from .dl_converter_service import DLConverterService  # noqa: F401, F403
 from .file_scanning_service import FileScanningService  # noqa: F401, F403
+from .file_version_service import (  # noqa: F401, F403
+    ContentCollisionError,
+    FileHistoryStats,
+    FileVersionService,
+)
+from .git_index_service import (  # noqa: F401, F403
+    GitFingerprint,
+    GitIndexService,
+    GitSyncResult,
+)
+from .scan_snapshot_service import (  # noqa: F401, F403
+    ScanSnapshotService,
+    SnapshotDiff,
+    merge_diff,
+)
+from .stat_snapshot_service import (  # noqa: F401, F403
+    IncrementalScan,
+    StatKey,
+    StatSnapshotService,
+)
 from .tts_service import TTSService  # noqa: F401, F403
 
 __all__ = [
+    "ContentCollisionError",
+    "ContentHashIndex",
+    "HashLookupStats",
     "DLConverterService",
+    "FileHistoryStats",
     "FileScanningService",
+    "FileVersionService",
+    "GitFingerprint",
+    "GitIndexService",
+    "GitSyncResult",
+    "ScanSnapshotService",
+    "SnapshotDiff",
+    "merge_diff",
+    "IncrementalScan",
+    "StatKey",
+    "StatSnapshotService",
     "TTSService",
 ]
@@ -0,0 +1,252 @@
+"""
+wembed_core/services/content_hash_index.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Answers "is this content already indexed?" with as few queries as possible.
+"""
+
+import struct
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, computed_field
+from sqlalchemy import event, func, select, text
+from sqlalchemy.engine import Connection
+
+from wembed_core.database import AppBase, DatabaseService
+from wembed_core.models.indexing import IndexedFiles
+from wembed_core.pagination import stream_query
+from wembed_core.utils.bloom import BloomFilter
+
+_FINGERPRINT = struct.Struct("<4sQQ")
+_FINGERPRINT_MAGIC = b"CHI2"
+
+WRITE_COUNTER_TABLE = "indexed_files_sha256_writes"
+
+
+def _write_counter_statements() -> List[str]:
+    """DDL for a one-row counter bumped by every write that can change the set of hashes."""
+    table = WRITE_COUNTER_TABLE
+    source = IndexedFiles.__tablename__
+    bump = f"BEGIN UPDATE {table} SET writes = writes + 1; END"
+    return [
+        f"CREATE TABLE IF NOT EXISTS {table} (writes INTEGER NOT NULL)",
+        f"INSERT INTO {table} (writes) "
+        f"SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM {table})",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON {source} {bump}",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON {source} {bump}",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_au "
+        f"AFTER UPDATE OF sha256 ON {source} {bump}",
+    ]
+
+
+def install_write_counter(connection: Connection) -> bool:
+    """
+    Create the IndexedFiles write counter and its triggers on a SQLite connection.
+
+    Args:
+        connection (Connection): An open SQLAlchemy connection.
+    Returns:
+        bool: False if the dialect has no support for the counter.
+    """
+    if connection.dialect.name != "sqlite":
+        return False
+    for statement in _write_counter_statements():
+        connection.execute(text(statement))
+    return True
+
+
+@event.listens_for(AppBase.metadata, "after_create")
+def _install_write_counter_after_create(
+    target: Any, connection: Connection, **kw: Any
+) -> None:
+    """Install the write counter whenever the schema is created."""
+    install_write_counter(connection)
+
+
+class HashLookupStats(BaseModel):
+    """
+    Counters for ContentHashIndex lookups.
+
+    Attributes:
+        checked (int): Hashes passed to lookup().
+        definitely_new (int): Hashes the filter ruled out without a query.
+        probable_hits (int): Hashes the filter could not rule out.
+        confirmed_hits (int): Probable hits found in the database.
+        queries (int): Batched IN (...) queries issued.
+    """
+
+    checked: int = 0
+    definitely_new: int = 0
+    probable_hits: int = 0
+    confirmed_hits: int = 0
+    queries: int = 0
+
+    @computed_field
+    @property
+    def false_positives(self) -> int:
+        """Probable hits that were not in the database."""
+        return self.probable_hits - self.confirmed_hits
+
+    @computed_field
+    @property
+    def false_positive_rate(self) -> float:
+        """Share of absent hashes that the filter failed to rule out."""
+        absent = self.definitely_new + self.false_positives
+        return self.false_positives / absent if absent else 0.0
+
+    @computed_field
+    @property
+    def queries_avoided(self) -> int:
+        """Per-file queries saved compared with one query per hash."""
+        return self.checked - self.queries
+
+
+class ContentHashIndex:
+    """
+    A Bloom filter of every IndexedFiles.sha256, with batched confirmation.
+
+    Hashes the filter rules out are new without touching the database;
+    the rest are confirmed with one 'sha256 IN (...)' query per batch. The
+    filter can be persisted and is rebuilt when the table has changed
+    since it was saved. Changes are detected through a counter that
+    triggers bump on every insert, delete and sha256 update, so in-place
+    rewrites (FileVersionService.update_content) and reused rowids are
+    caught; without the counter (non-SQLite) the persisted file is never
+    trusted.
+
+    Methods:
+        load(): Load the persisted filter, or rebuild it if stale.
+        rebuild(): Build the filter from the database.
+        save(): Persist the filter.
+        add(): Register a newly indexed hash.
+        lookup(): Return which of the given hashes are already indexed.
+    """
+
+    def __init__(
+        self,
+        db_service: DatabaseService,
+        path: Optional[Path] = None,
+        fp_rate: float = 0.01,
+        batch_size: int = 500,
+    ):
+        """
+        Initialize the index.
+        Args:
+            db_service (DatabaseService): Database holding the file records.
+            path (Optional[Path]): File the filter is persisted to.
+            fp_rate (float): Target false-positive rate when sizing the filter.
+            batch_size (int): Hashes confirmed per IN (...) query.
+        """
+        self._db_service = db_service
+        self.path = path
+        self.fp_rate = fp_rate
+        self.batch_size = batch_size
+        self.bloom: Optional[BloomFilter] = None
+        self.stats = HashLookupStats()
+
+    def _fingerprint(self) -> Optional[Tuple[int, int]]:
+        """Row count and write counter of the table, or None if there is no counter."""
+        with self._db_service.get_db() as db:
+            if not install_write_counter(db.connection()):
+                return None
+            db.commit()
+            count = db.scalar(select(func.count()).select_from(IndexedFiles))
+            writes = db.scalar(text(f"SELECT writes FROM {WRITE_COUNTER_TABLE}"))
+        return int(count), int(writes)
+
+    def _row_count(self) -> int:
+        with self._db_service.get_db() as db:
+            return int(db.scalar(select(func.count()).select_from(IndexedFiles)))
+
+    def load(self) -> BloomFilter:
+        """
+        Load the persisted filter if it matches the database, else rebuild it.
+
+        Returns:
+            BloomFilter: The filter in use.
+        """
+        fingerprint = self._fingerprint()
+        if fingerprint is not None and self.path is not None and self.path.is_file():
+            data = self.path.read_bytes()
+            try:
+                magic, *saved = _FINGERPRINT.unpack_from(data)
+                if magic == _FINGERPRINT_MAGIC and tuple(saved) == fingerprint:
+                    self.bloom = BloomFilter.from_bytes(data[_FINGERPRINT.size :])
+                    return self.bloom
+            except (struct.error, ValueError):
+                pass
+        return self.rebuild(fingerprint)
+
+    def rebuild(self, fingerprint: Optional[Tuple[int, int]] = None) -> BloomFilter:
+        """
+        Build the filter from every sha256 in the database and persist it.
+
+        The filter is sized for twice the current row count so it can absorb
+        new files without its false-positive rate degrading quickly.
+        """
+        fingerprint = fingerprint or self._fingerprint()
+        count = fingerprint[0] if fingerprint else self._row_count()
+        bloom = BloomFilter.for_capacity(max(count * 2, 1024), self.fp_rate)
+        with self._db_service.get_db() as db:
+            rows = stream_query(db, select(IndexedFiles.sha256), 10_000)
+            bloom.update(row.sha256 for row in rows)
+        self.bloom = bloom
+        self.save(fingerprint)
+        return bloom
+
+    def save(self, fingerprint: Optional[Tuple[int, int]] = None) -> None:
+        """Persist the filter together with the table fingerprint."""
+        if self.path is None or self.bloom is None:
+            return
+        fingerprint = fingerprint or self._fingerprint()
+        if fingerprint is None:
+            return
+        header = _FINGERPRINT.pack(_FINGERPRINT_MAGIC, *fingerprint)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_bytes(header + self.bloom.to_bytes())
+        tmp.replace(self.path)
+
+    def add(self, sha256: str) -> None:
+        """Register a hash that has just been indexed."""
+        if self.bloom is None:
+            self.load()
+        self.bloom.add(sha256)
+
+    def lookup(self, hashes: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of 'hashes' that is already indexed.
+
+        The filter only knows the rows present at load() plus those passed
+        to add(); hashes committed since by other writers can be missed, so
+        writers must still tolerate a conflict on IndexedFiles.sha256.
+
+        Args:
+            hashes (Iterable[str]): SHA-256 hex digests of scanned files.
+        Returns:
+            Set[str]: The hashes present in IndexedFiles.
+        """
+        if self.bloom is None:
+            self.load()
+        candidates: List[str] = []
+        for sha256 in hashes:
+            self.stats.checked += 1
+            if sha256 in self.bloom:
+                candidates.append(sha256)
+            else:
+                self.stats.definitely_new += 1
+        self.stats.probable_hits += len(candidates)
+
+        found: Set[str] = set()
+        with self._db_service.get_db() as db:
+            for start in range(0, len(candidates), self.batch_size):
+                batch = candidates[start : start + self.batch_size]
+                found.update(
+                    db.scalars(
+                        select(IndexedFiles.sha256).where(
+                            IndexedFiles.sha256.in_(batch)
+                        )
+                    )
+                )
+                self.stats.queries += 1
+        self.stats.confirmed_hits += sum(1 for c in candidates if c in found)
+        return found
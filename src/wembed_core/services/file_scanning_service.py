@@ -5,10 +5,118 @@ Orchestrates the scanning of files within a directory and extracts relevant info
 """
 
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from wembed_core.database import DatabaseService
+from wembed_core.file_scanner.record_builder import (
+    FileRecordData,
+    ParallelRecordBuilder,
+    RecordBuildResult,
+)
+from wembed_core.models.indexing import IndexedFiles
+
+from .content_hash_index import ContentHashIndex
+from .scan_snapshot_service import LOOKUP_CHUNK_SIZE
+
+INSERT_BATCH_SIZE = 500
 
 
 class FileScanningService:
-    pass
+    """
+    Builds IndexedFiles records for scanned files and stores them in bulk.
+
+    Records are built by a ParallelRecordBuilder and inserted with
+    executemany-style INSERTs rather than one ORM object per file. Stored
+    content is detected through a ContentHashIndex, which is kept up to
+    date with every inserted hash.
+
+    Methods:
+        build_records(): Build records on the builder's process pool.
+        insert_records(): Bulk-insert records whose content is not stored yet.
+        index_paths(): Build and insert records for a list of files.
+    """
+
+    def __init__(
+        self,
+        db_service: DatabaseService,
+        builder: Optional[ParallelRecordBuilder] = None,
+        hash_index: Optional[ContentHashIndex] = None,
+    ):
+        """
+        Initialize the service.
+        Args:
+            db_service (DatabaseService): Database the records are stored in.
+            builder (Optional[ParallelRecordBuilder]): Record builder; defaults to one worker per CPU.
+            hash_index (Optional[ContentHashIndex]): Index of stored hashes; defaults to an in-memory one.
+        """
+        self._db_service = db_service
+        self.builder = builder or ParallelRecordBuilder()
+        self.hash_index = hash_index or ContentHashIndex(
+            db_service, batch_size=LOOKUP_CHUNK_SIZE
+        )
+
+    def build_records(self, paths: Sequence[str | Path]) -> RecordBuildResult:
+        """Build records for 'paths' without storing them."""
+        return self.builder.build(paths)
+
+    def insert_records(self, records: Sequence[FileRecordData]) -> int:
+        """
+        Bulk-insert records, skipping content that is already stored.
+
+        IndexedFiles.sha256 is unique, so records whose hash exists in the
+        database, or earlier in 'records', are skipped. Existing hashes are
+        found with ContentHashIndex.lookup(), and inserted ones are added
+        to the index. The index does not see rows other writers commit
+        after it was loaded, so on SQLite the INSERT also skips conflicting
+        hashes (ON CONFLICT(sha256) DO NOTHING) instead of failing the batch.
+
+        Args:
+            records (Sequence[FileRecordData]): Records to store.
+        Returns:
+            int: Number of records inserted.
+        """
+        seen = self.hash_index.lookup({r.sha256 for r in records})
+        rows: List[dict] = []
+        for record in records:
+            if record.sha256 in seen:
+                continue
+            seen.add(record.sha256)
+            rows.append(record.model_dump())
+        inserted: List[str] = []
+        with self._db_service.get_db() as db:
+            if db.get_bind().dialect.name == "sqlite":
+                stmt = (
+                    sqlite_insert(IndexedFiles)
+                    .on_conflict_do_nothing(index_elements=["sha256"])
+                    .returning(IndexedFiles.sha256)
+                )
+                for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                    inserted.extend(
+                        db.scalars(stmt, rows[start : start + INSERT_BATCH_SIZE])
+                    )
+            else:
+                for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                    db.execute(
+                        insert(IndexedFiles), rows[start : start + INSERT_BATCH_SIZE]
+                    )
+                inserted = [row["sha256"] for row in rows]
+            db.commit()
+        for sha256 in inserted:
+            self.hash_index.add(sha256)
+        return len(inserted)
+
+    def index_paths(self, paths: Sequence[str | Path]) -> RecordBuildResult:
+        """
+        Build records for 'paths' in parallel and insert them.
+
+        Args:
+            paths (Sequence[str | Path]): Files to index.
+        Returns:
+            RecordBuildResult: The build result, with 'inserted' set.
+        """
+        result = self.build_records(paths)
+        result.inserted = self.insert_records(result.records)
+        return result
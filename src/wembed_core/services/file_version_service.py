@@ -0,0 +1,243 @@
+"""
+wembed_core/services/file_version_service.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Keeps delta-compressed version history for IndexedFiles records.
+"""
+
+import hashlib
+import zlib
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import func, select
+
+from wembed_core.database import DatabaseService
+from wembed_core.models.indexing import IndexedFiles, IndexedFileVersions
+from wembed_core.utils.delta import apply_delta, make_delta
+
+
+class FileHistoryStats(BaseModel):
+    """
+    Storage used by the history of one file.
+
+    Attributes:
+        versions (int): Number of stored earlier versions.
+        stored_bytes (int): Bytes used by their deltas and keyframes.
+        full_bytes (int): Bytes full copies of those versions would use.
+    """
+
+    versions: int
+    stored_bytes: int
+    full_bytes: int
+
+
+class ContentCollisionError(ValueError):
+    """
+    The new content of a file is already stored on another IndexedFiles row.
+
+    IndexedFiles.sha256 is unique, so one row holds each distinct content.
+    Callers should refer to 'existing_id' for the new content instead.
+
+    Attributes:
+        file_id (str): The record that was being updated.
+        existing_id (str): The record that already holds the content.
+    """
+
+    def __init__(self, file_id: str, existing_id: str):
+        super().__init__(f"Content for {file_id} is already indexed as {existing_id}.")
+        self.file_id = file_id
+        self.existing_id = existing_id
+
+
+def _current_bytes(record: IndexedFiles) -> bytes:
+    """
+    The versioned content of a record: raw bytes, or the text if none is stored.
+
+    Records without 'content' only keep their decoded text, so their
+    versions are text-only: the UTF-8 encoding of content_text, not the
+    original file bytes.
+    """
+    if record.content is not None:
+        return record.content
+    return record.content_text.encode("utf-8")
+
+
+class FileVersionService:
+    """
+    Stores earlier versions of IndexedFiles as reverse deltas.
+
+    The IndexedFiles row always holds the latest version in full. When its
+    content changes, the previous content is saved as a delta against the
+    new content, except every 'keyframe_interval'-th version, which is saved
+    as a compressed full copy. Rebuilding any version therefore applies at
+    most 'keyframe_interval' - 1 deltas.
+
+    Versions of records that store no raw 'content' are text-only; see
+    _current_bytes(). Content already held by another record cannot be
+    stored twice and raises ContentCollisionError.
+
+    Methods:
+        update_content(): Replace a file's content, keeping the old version.
+        get_version(): Rebuild the content of any stored version.
+        list_versions(): Metadata of the stored versions.
+        history_stats(): Storage used by a file's history.
+    """
+
+    def __init__(self, db_service: DatabaseService, keyframe_interval: int = 16):
+        """
+        Initialize the service.
+        Args:
+            db_service (DatabaseService): Database holding the file records.
+            keyframe_interval (int): Versions between full copies.
+        """
+        self._db_service = db_service
+        self.keyframe_interval = max(keyframe_interval, 1)
+
+    def update_content(
+        self,
+        file_id: str,
+        content: bytes,
+        content_text: Optional[str] = None,
+        mtime_iso: Optional[datetime] = None,
+    ) -> IndexedFiles:
+        """
+        Record new content for a file and bump its version.
+
+        Args:
+            file_id (str): Id of the IndexedFiles record.
+            content (bytes): The new file content.
+            content_text (Optional[str]): Decoded text; derived from 'content' if omitted.
+            mtime_iso (Optional[datetime]): New modification time.
+        Returns:
+            IndexedFiles: The updated record, detached from its session.
+        Raises:
+            ValueError: If the record does not exist.
+            ContentCollisionError: If another record already holds 'content';
+                nothing is changed.
+        """
+        sha256 = hashlib.sha256(content).hexdigest()
+        with self._db_service.get_db() as db:
+            record = db.get(IndexedFiles, file_id)
+            if record is None:
+                raise ValueError(f"Indexed file {file_id} does not exist.")
+            if record.sha256 == sha256:
+                db.expunge(record)
+                return record
+            existing_id = db.scalar(
+                select(IndexedFiles.id).where(IndexedFiles.sha256 == sha256)
+            )
+            if existing_id is not None:
+                raise ContentCollisionError(file_id, existing_id)
+
+            previous = _current_bytes(record)
+            full = zlib.compress(previous)
+            data, is_keyframe = full, True
+            if record.version % self.keyframe_interval != 0:
+                delta = make_delta(content, previous)
+                if len(delta) < len(full):
+                    data, is_keyframe = delta, False
+            db.add(
+                IndexedFileVersions(
+                    file_id=record.id,
+                    version=record.version,
+                    base_version=None if is_keyframe else record.version + 1,
+                    is_keyframe=is_keyframe,
+                    data=data,
+                    sha256=hashlib.sha256(previous).hexdigest(),
+                    size=len(previous),
+                )
+            )
+
+            if record.content is not None:
+                record.content = content
+            if content_text is None:
+                content_text = content.decode("utf-8", errors="replace")
+            record.content_text = content_text
+            record.sha256 = sha256
+            record.md5 = hashlib.md5(content).hexdigest()
+            record.size = len(content)
+            record.version += 1
+            if mtime_iso is not None:
+                record.mtime_iso = mtime_iso
+            db.commit()
+            db.refresh(record)
+            db.expunge(record)
+            return record
+
+    def get_version(self, file_id: str, version: int) -> bytes:
+        """
+        Rebuild the content of a file at a given version.
+
+        Args:
+            file_id (str): Id of the IndexedFiles record.
+            version (int): Version number to rebuild.
+        Returns:
+            bytes: The content of that version.
+        Raises:
+            ValueError: If the file or version does not exist, or the
+                rebuilt content fails its checksum.
+        """
+        with self._db_service.get_db() as db:
+            record = db.get(IndexedFiles, file_id)
+            if record is None:
+                raise ValueError(f"Indexed file {file_id} does not exist.")
+            if version == record.version:
+                return _current_bytes(record)
+
+            chain: List[IndexedFileVersions] = []
+            rows = db.scalars(
+                select(IndexedFileVersions)
+                .where(
+                    IndexedFileVersions.file_id == file_id,
+                    IndexedFileVersions.version >= version,
+                )
+                .order_by(IndexedFileVersions.version)
+            )
+            for row in rows:
+                if row.version != version + len(chain):
+                    break
+                chain.append(row)
+                if row.is_keyframe:
+                    break
+            if not chain:
+                raise ValueError(f"Version {version} of {file_id} is not stored.")
+            expected = chain[0].sha256
+
+            if chain[-1].is_keyframe:
+                content = zlib.decompress(chain.pop().data)
+            elif chain[-1].version == record.version - 1:
+                content = _current_bytes(record)
+            else:
+                raise ValueError(f"History of {file_id} is incomplete.")
+            for row in reversed(chain):
+                content = apply_delta(content, row.data)
+
+            if hashlib.sha256(content).hexdigest() != expected:
+                raise ValueError(f"Version {version} of {file_id} failed its checksum.")
+            return content
+
+    def list_versions(self, file_id: str) -> List[IndexedFileVersions]:
+        """Return the stored earlier versions of a file, oldest first."""
+        with self._db_service.get_db() as db:
+            rows = db.scalars(
+                select(IndexedFileVersions)
+                .where(IndexedFileVersions.file_id == file_id)
+                .order_by(IndexedFileVersions.version)
+            ).all()
+            db.expunge_all()
+            return list(rows)
+
+    def history_stats(self, file_id: str) -> FileHistoryStats:
+        """Compare the storage used by a file's history with full copies."""
+        with self._db_service.get_db() as db:
+            versions, stored, full = db.execute(
+                select(
+                    func.count(),
+                    func.coalesce(func.sum(func.length(IndexedFileVersions.data)), 0),
+                    func.coalesce(func.sum(IndexedFileVersions.size), 0),
+                ).where(IndexedFileVersions.file_id == file_id)
+            ).one()
+            return FileHistoryStats(
+                versions=versions, stored_bytes=stored, full_bytes=full
+            )
@@ -0,0 +1,325 @@
+"""
+wembed_core/services/git_index_service.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Incremental indexing of git repositories from their last indexed commit.
+"""
+
+import os
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, select, update
+
+from wembed_core.database import DatabaseService
+from wembed_core.file_scanner.git_changes import GitChangeSet, collect_changes
+from wembed_core.file_scanner.git_objects import (
+    blob_sizes,
+    filtered_paths,
+    iter_blob_contents,
+    list_blobs,
+    worktree_changes,
+)
+from wembed_core.file_scanner.utils import (
+    create_file_record_from_content,
+    create_file_record_from_path,
+    current_host,
+)
+from wembed_core.models.indexing import (
+    IndexedDirectory,
+    IndexedFileLines,
+    IndexedFiles,
+    IndexedFileVersions,
+)
+
+from .scan_snapshot_service import LOOKUP_CHUNK_SIZE
+
+GIT_DIR_TYPE = "git"
+
+
+class GitSyncResult(BaseModel):
+    """
+    Outcome of preparing a repository for incremental indexing.
+
+    Attributes:
+        changes (GitChangeSet): What git reports as changed.
+        renamed_records (int): IndexedFiles rows moved to their new path.
+        deleted_records (int): IndexedFiles rows removed.
+        to_index (List[str]): Absolute paths whose content must be (re)indexed.
+    """
+
+    changes: GitChangeSet
+    renamed_records: int = 0
+    deleted_records: int = 0
+    to_index: List[str] = Field(default_factory=list)
+
+
+class GitFingerprint(BaseModel):
+    """
+    Tracked files of a repository compared by git blob id with their IndexedFiles rows.
+
+    Attributes:
+        repo_root (str): Repository root.
+        blobs (Dict[str, str]): Relative path -> blob id from the index.
+        unchanged (List[str]): Files whose stored blob id matches; nothing to read.
+        changed (List[str]): Files without a record or with a different blob id.
+        dirty (List[str]): Changed files whose working tree copy differs from the index,
+            so their blob cannot be used and they are read from disk.
+        filtered (List[str]): Changed, clean files that checkout converts
+            (.gitattributes filters, eol, core.autocrlf); read from disk but
+            still compared by blob id.
+        sizes (Dict[str, int]): Blob id -> size for the changed blobs.
+    """
+
+    repo_root: str
+    blobs: Dict[str, str] = Field(default_factory=dict)
+    unchanged: List[str] = Field(default_factory=list)
+    changed: List[str] = Field(default_factory=list)
+    dirty: List[str] = Field(default_factory=list)
+    filtered: List[str] = Field(default_factory=list)
+    sizes: Dict[str, int] = Field(default_factory=dict)
+
+
+class GitIndexService:
+    """
+    Re-indexes only what changed in a repository since its last indexed commit.
+
+    prepare() moves the records of renamed files to their new path (so
+    their content and embeddings are kept), deletes the records of removed
+    files together with their lines and stored versions, and returns the
+    added and modified files. Once those have been indexed, mark_indexed()
+    stores the commit for the next run.
+
+    fingerprint() and iter_records() do the same by blob id: files whose
+    stored git_blob_sha matches the index are skipped without any file
+    I/O, and the content of changed blobs is streamed from the object
+    store. Files that checkout converts (see filtered_paths()) are read
+    from disk, since their blob is not the checked-out content.
+
+    Methods:
+        get_repository(): The IndexedDirectory row of a repository.
+        prepare(): Apply renames and deletions and list files to index.
+        mark_indexed(): Record the commit that has been indexed.
+        fingerprint(): Compare tracked files with their records by blob id.
+        iter_records(): Build records for the changed files of a fingerprint.
+    """
+
+    def __init__(self, db_service: DatabaseService, host: Optional[str] = None):
+        """
+        Initialize the service.
+        Args:
+            db_service (DatabaseService): Database holding the file records.
+            host (Optional[str]): Host whose records are updated; defaults to this machine.
+        """
+        self._db_service = db_service
+        self.host = host or current_host()
+
+    def get_repository(self, root: str | Path) -> IndexedDirectory:
+        """Return the repository's IndexedDirectory row, creating it if needed."""
+        root_path = str(Path(root).resolve())
+        with self._db_service.get_db() as db:
+            repo = db.scalars(
+                select(IndexedDirectory).where(
+                    IndexedDirectory.root_path == root_path,
+                    IndexedDirectory.host == self.host,
+                    IndexedDirectory.dir_type == GIT_DIR_TYPE,
+                )
+            ).first()
+            if repo is None:
+                repo = IndexedDirectory(
+                    dir_type=GIT_DIR_TYPE, host=self.host, root_path=root_path
+                )
+                db.add(repo)
+                db.commit()
+                db.refresh(repo)
+            db.expunge(repo)
+            return repo
+
+    def prepare(self, root: str | Path) -> GitSyncResult:
+        """
+        Compare the repository with its last indexed commit and update moved or removed records.
+
+        Args:
+            root (str | Path): Repository root.
+        Returns:
+            GitSyncResult: The changes and the files left to index.
+        """
+        repo = self.get_repository(root)
+        changes = collect_changes(repo.root_path, repo.last_indexed_commit)
+        result = GitSyncResult(
+            changes=changes,
+            to_index=[self._absolute(repo.root_path, p) for p in changes.changed],
+        )
+        with self._db_service.get_db() as db:
+            for new, old in changes.renamed.items():
+                result.renamed_records += self._move(
+                    db,
+                    self._absolute(repo.root_path, old),
+                    self._absolute(repo.root_path, new),
+                )
+            deleted = [self._absolute(repo.root_path, p) for p in changes.deleted]
+            for start in range(0, len(deleted), LOOKUP_CHUNK_SIZE):
+                ids = db.scalars(
+                    select(IndexedFiles.id).where(
+                        IndexedFiles.host == self.host,
+                        IndexedFiles.path.in_(
+                            deleted[start : start + LOOKUP_CHUNK_SIZE]
+                        ),
+                    )
+                ).all()
+                result.deleted_records += self._delete_records(db, ids)
+            db.commit()
+        return result
+
+    def mark_indexed(
+        self, root: str | Path, commit: str, file_count: Optional[int] = None
+    ) -> IndexedDirectory:
+        """
+        Record that the repository has been indexed up to 'commit'.
+
+        Args:
+            root (str | Path): Repository root.
+            commit (str): Usually GitSyncResult.changes.head_commit.
+            file_count (Optional[int]): Number of tracked files, if known.
+        Returns:
+            IndexedDirectory: The updated row, detached from its session.
+        """
+        repo = self.get_repository(root)
+        with self._db_service.get_db() as db:
+            repo = db.merge(repo)
+            repo.last_indexed_commit = commit
+            repo.indexed_at = datetime.now(timezone.utc)
+            if file_count is not None:
+                repo.file_count = file_count
+            db.commit()
+            db.refresh(repo)
+            db.expunge(repo)
+            return repo
+
+    def fingerprint(self, root: str | Path) -> GitFingerprint:
+        """
+        Compare the tracked files of a repository with their records by git blob id.
+
+        Args:
+            root (str | Path): Repository root.
+        Returns:
+            GitFingerprint: Unchanged, changed and dirty files.
+        """
+        root_path = str(Path(root).resolve())
+        blobs = {b.path: b.sha for b in list_blobs(root_path)}
+        absolute = {p: self._absolute(root_path, p) for p in blobs}
+        stored: Dict[str, Optional[str]] = {}
+        paths = list(absolute.values())
+        with self._db_service.get_db() as db:
+            for start in range(0, len(paths), LOOKUP_CHUNK_SIZE):
+                stored.update(
+                    db.execute(
+                        select(IndexedFiles.path, IndexedFiles.git_blob_sha).where(
+                            IndexedFiles.host == self.host,
+                            IndexedFiles.path.in_(
+                                paths[start : start + LOOKUP_CHUNK_SIZE]
+                            ),
+                        )
+                    ).all()
+                )
+
+        dirty = worktree_changes(root_path)
+        result = GitFingerprint(repo_root=root_path, blobs=blobs)
+        for rel, sha in blobs.items():
+            if rel in dirty:
+                result.dirty.append(rel)
+                result.changed.append(rel)
+            elif stored.get(absolute[rel]) == sha:
+                result.unchanged.append(rel)
+            else:
+                result.changed.append(rel)
+        clean = [p for p in result.changed if p not in dirty]
+        filtered = filtered_paths(root_path, clean)
+        result.filtered = [p for p in clean if p in filtered]
+        result.sizes = blob_sizes(
+            root_path, (blobs[p] for p in clean if p not in filtered)
+        )
+        return result
+
+    def iter_records(
+        self, fingerprint: GitFingerprint, max_size: Optional[int] = None
+    ) -> Iterator[IndexedFiles]:
+        """
+        Build IndexedFiles records for the changed files of a fingerprint.
+
+        Clean files are read through one 'git cat-file --batch' stream and
+        keep their blob id. Filtered files are read from disk and also keep
+        it; dirty files are read from disk and get none, so they are
+        compared again on the next run.
+
+        Args:
+            fingerprint (GitFingerprint): Result of fingerprint().
+            max_size (Optional[int]): Skip clean blobs larger than this many bytes.
+        Yields:
+            IndexedFiles: New, unsaved records.
+        """
+        root = fingerprint.repo_root
+        from_disk = set(fingerprint.dirty) | set(fingerprint.filtered)
+        clean = [p for p in fingerprint.changed if p not in from_disk]
+        if max_size is not None:
+            clean = [
+                p
+                for p in clean
+                if fingerprint.sizes.get(fingerprint.blobs[p], 0) <= max_size
+            ]
+        paths_by_sha: Dict[str, List[str]] = {}
+        for rel in clean:
+            paths_by_sha.setdefault(fingerprint.blobs[rel], []).append(rel)
+
+        for sha, content in iter_blob_contents(root, paths_by_sha):
+            if content is None:
+                continue
+            for rel in paths_by_sha[sha]:
+                path = Path(self._absolute(root, rel))
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                yield create_file_record_from_content(
+                    path, content, stat=stat, git_blob_sha=sha
+                )
+        for rel in fingerprint.filtered + fingerprint.dirty:
+            record = create_file_record_from_path(
+                Path(self._absolute(root, rel)), "git", "", root, rel
+            )
+            if record is None:
+                continue
+            if rel not in fingerprint.dirty:
+                record.git_blob_sha = fingerprint.blobs[rel]
+            yield record
+
+    @staticmethod
+    def _absolute(root: str, rel_path: str) -> str:
+        return os.path.join(root, *PurePosixPath(rel_path).parts)
+
+    @staticmethod
+    def _delete_records(db, ids: List[str]) -> int:
+        """Delete IndexedFiles rows together with their lines and stored versions."""
+        if not ids:
+            return 0
+        db.execute(delete(IndexedFileLines).where(IndexedFileLines.file_id.in_(ids)))
+        db.execute(
+            delete(IndexedFileVersions).where(IndexedFileVersions.file_id.in_(ids))
+        )
+        return db.execute(delete(IndexedFiles).where(IndexedFiles.id.in_(ids))).rowcount
+
+    def _move(self, db, old: str, new: str) -> int:
+        """Point the records of 'old' at 'new' without touching their content."""
+        target = Path(new)
+        return db.execute(
+            update(IndexedFiles)
+            .where(IndexedFiles.host == self.host, IndexedFiles.path == old)
+            .values(
+                path=new,
+                name=target.name,
+                stem=target.stem,
+                suffix=target.suffix,
+                uri=f"file://{target.as_posix()}",
+            )
+        ).rowcount
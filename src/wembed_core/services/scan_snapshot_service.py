@@ -0,0 +1,325 @@
+"""
+wembed_core/services/scan_snapshot_service.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Records scan results as delta-encoded snapshots and diffs them.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+from sqlalchemy import func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from wembed_core.database import DatabaseService
+from wembed_core.models.indexing.scan_snapshots import (
+    ScanPaths,
+    ScanSnapshotDeltas,
+    ScanSnapshotKeyframes,
+    ScanSnapshots,
+)
+
+# Keeps 'IN (...)' lists well below SQLite's bound parameter limit.
+LOOKUP_CHUNK_SIZE = 500
+
+
+class SnapshotDiff(BaseModel):
+    """
+    Paths that differ between two snapshots.
+
+    Attributes:
+        added (List[str]): Sorted paths present only in the newer snapshot.
+        removed (List[str]): Sorted paths present only in the older snapshot.
+    """
+
+    added: List[str] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list)
+
+
+def merge_diff(old: Iterable[str], new: Iterable[str]) -> SnapshotDiff:
+    """
+    Diff two sorted, duplicate-free path sequences in a single merge pass.
+
+    Args:
+        old (Iterable[str]): Paths of the older snapshot, sorted.
+        new (Iterable[str]): Paths of the newer snapshot, sorted.
+    Returns:
+        SnapshotDiff: The added and removed paths.
+    """
+    diff = SnapshotDiff()
+    old_it, new_it = iter(old), iter(new)
+    a, b = next(old_it, None), next(new_it, None)
+    while a is not None and b is not None:
+        if a == b:
+            a, b = next(old_it, None), next(new_it, None)
+        elif a < b:
+            diff.removed.append(a)
+            a = next(old_it, None)
+        else:
+            diff.added.append(b)
+            b = next(new_it, None)
+    if a is not None:
+        diff.removed.append(a)
+        diff.removed.extend(old_it)
+    if b is not None:
+        diff.added.append(b)
+        diff.added.extend(new_it)
+    return diff
+
+
+def _chunks(items: List[str]) -> Iterator[List[str]]:
+    for start in range(0, len(items), LOOKUP_CHUNK_SIZE):
+        yield items[start : start + LOOKUP_CHUNK_SIZE]
+
+
+class ScanSnapshotService:
+    """
+    Stores the file list of each scan as a delta against the previous scan.
+
+    Writes are proportional to the number of paths that changed; a snapshot
+    is rebuilt by folding the deltas of its root up to and including it.
+    Every 'keyframe_interval'-th snapshot of a root also stores its full
+    path list, so a rebuild starts from the nearest keyframe and folds at
+    most 'keyframe_interval' - 1 deltas.
+
+    Methods:
+        record_scan(): Store a new snapshot for a root.
+        latest_snapshot(): Most recent snapshot of a root.
+        get_snapshot(): Sorted paths of a snapshot.
+        diff(): Paths added and removed between two snapshots.
+    """
+
+    def __init__(self, db_service: DatabaseService, keyframe_interval: int = 16):
+        """
+        Initialize the service with an initialized database service.
+        Args:
+            db_service (DatabaseService): Database holding the snapshot tables.
+            keyframe_interval (int): Snapshots of a root between full copies.
+        """
+        self._db_service = db_service
+        self.keyframe_interval = max(keyframe_interval, 1)
+
+    def record_scan(
+        self,
+        root_path: str | Path,
+        paths: Iterable[str | Path],
+        scan_id: Optional[str] = None,
+    ) -> ScanSnapshots:
+        """
+        Record the paths found by a scan of 'root_path'.
+
+        Args:
+            root_path (str | Path): The root that was scanned.
+            paths (Iterable[str | Path]): Every path found by the scan.
+            scan_id (Optional[str]): Id of the matching FileIndexingResults row.
+        Returns:
+            ScanSnapshots: The stored snapshot, detached from its session.
+        """
+        root = str(root_path)
+        current = sorted({str(p) for p in paths})
+        with self._db_service.get_db() as db:
+            parent = self._latest(db, root)
+            previous = self._snapshot_rows(db, parent) if parent else []
+            diff = merge_diff((path for path, _ in previous), current)
+
+            path_ids = self._intern(db, diff.added)
+            removed = set(diff.removed)
+            path_ids.update((p, pid) for p, pid in previous if p in removed)
+            is_keyframe = parent is not None and self._due_keyframe(db, parent)
+
+            snapshot = ScanSnapshots(
+                root_path=root,
+                scan_id=scan_id,
+                parent_id=parent.id if parent else None,
+                file_count=len(current),
+                added_count=len(diff.added),
+                removed_count=len(diff.removed),
+                is_keyframe=is_keyframe,
+            )
+            db.add(snapshot)
+            db.flush()
+            rows = [
+                {"snapshot_id": snapshot.id, "path_id": path_ids[p], "op": 1}
+                for p in diff.added
+            ] + [
+                {"snapshot_id": snapshot.id, "path_id": path_ids[p], "op": -1}
+                for p in diff.removed
+            ]
+            if rows:
+                db.execute(insert(ScanSnapshotDeltas), rows)
+            if is_keyframe:
+                path_ids.update(previous)
+                keyframe = [
+                    {"snapshot_id": snapshot.id, "path_id": path_ids[p]}
+                    for p in current
+                ]
+                if keyframe:
+                    db.execute(insert(ScanSnapshotKeyframes), keyframe)
+            db.commit()
+            db.refresh(snapshot)
+            db.expunge(snapshot)
+            return snapshot
+
+    def latest_snapshot(self, root_path: str | Path) -> Optional[ScanSnapshots]:
+        """Return the most recent snapshot of a root, or None."""
+        with self._db_service.get_db() as db:
+            snapshot = self._latest(db, str(root_path))
+            if snapshot is not None:
+                db.expunge(snapshot)
+            return snapshot
+
+    def get_snapshot(self, snapshot_id: int) -> List[str]:
+        """
+        Return the sorted paths of a snapshot.
+        Raises:
+            ValueError: If the snapshot does not exist.
+        """
+        with self._db_service.get_db() as db:
+            snapshot = self._get(db, snapshot_id)
+            return [path for path, _ in self._snapshot_rows(db, snapshot)]
+
+    def diff(self, old_id: int, new_id: int) -> SnapshotDiff:
+        """
+        Compute the paths added and removed between two snapshots.
+
+        Snapshots of the same root are diffed by summing only the deltas
+        recorded between them. Snapshots of different roots are rebuilt in
+        path order and compared with merge_diff().
+
+        Args:
+            old_id (int): Id of the baseline snapshot.
+            new_id (int): Id of the snapshot to compare against it.
+        Returns:
+            SnapshotDiff: Paths in 'new_id' but not 'old_id', and vice versa.
+        Raises:
+            ValueError: If either snapshot does not exist.
+        """
+        with self._db_service.get_db() as db:
+            old, new = self._get(db, old_id), self._get(db, new_id)
+            if old.root_path != new.root_path:
+                return merge_diff(
+                    (path for path, _ in self._snapshot_rows(db, old)),
+                    (path for path, _ in self._snapshot_rows(db, new)),
+                )
+
+            sign = 1 if old.id <= new.id else -1
+            low, high = sorted((old.id, new.id))
+            net = func.sum(ScanSnapshotDeltas.op)
+            stmt = (
+                select(ScanPaths.path, net)
+                .join(ScanSnapshotDeltas, ScanSnapshotDeltas.path_id == ScanPaths.id)
+                .join(ScanSnapshots, ScanSnapshots.id == ScanSnapshotDeltas.snapshot_id)
+                .where(
+                    ScanSnapshots.root_path == old.root_path,
+                    ScanSnapshots.id > low,
+                    ScanSnapshots.id <= high,
+                )
+                .group_by(ScanSnapshotDeltas.path_id)
+                .having(net != 0)
+                .order_by(ScanPaths.path)
+            )
+            diff = SnapshotDiff()
+            for path, total in db.execute(stmt):
+                (diff.added if total * sign > 0 else diff.removed).append(path)
+            return diff
+
+    @staticmethod
+    def _get(db: Session, snapshot_id: int) -> ScanSnapshots:
+        snapshot = db.get(ScanSnapshots, snapshot_id)
+        if snapshot is None:
+            raise ValueError(f"Scan snapshot {snapshot_id} does not exist.")
+        return snapshot
+
+    @staticmethod
+    def _latest(db: Session, root_path: str) -> Optional[ScanSnapshots]:
+        return db.scalars(
+            select(ScanSnapshots)
+            .where(ScanSnapshots.root_path == root_path)
+            .order_by(ScanSnapshots.id.desc())
+            .limit(1)
+        ).first()
+
+    @staticmethod
+    def _last_keyframe_id(db: Session, root_path: str, upto: int) -> Optional[int]:
+        """Id of the newest keyframe of a root at or before snapshot 'upto'."""
+        return db.scalar(
+            select(func.max(ScanSnapshots.id)).where(
+                ScanSnapshots.root_path == root_path,
+                ScanSnapshots.is_keyframe.is_(True),
+                ScanSnapshots.id <= upto,
+            )
+        )
+
+    def _due_keyframe(self, db: Session, parent: ScanSnapshots) -> bool:
+        """True if the snapshot following 'parent' should be a keyframe."""
+        root_path = parent.root_path
+        since = select(ScanSnapshots.id).where(ScanSnapshots.root_path == root_path)
+        last = self._last_keyframe_id(db, root_path, parent.id)
+        if last is not None:
+            since = since.where(ScanSnapshots.id > last)
+        pending = db.scalar(select(func.count()).select_from(since.subquery()))
+        return pending + 1 >= self.keyframe_interval
+
+    @classmethod
+    def _snapshot_rows(
+        cls, db: Session, snapshot: ScanSnapshots
+    ) -> List[Tuple[str, int]]:
+        """
+        Rebuild a snapshot as sorted (path, path_id) pairs.
+
+        The paths of the newest keyframe at or before the snapshot count as
+        +1 and only the deltas recorded after it are folded in. Additions
+        and removals of a path alternate, so the total is 1 exactly when
+        the path is present.
+        """
+        keyframe_id = cls._last_keyframe_id(db, snapshot.root_path, snapshot.id)
+        deltas = (
+            select(ScanSnapshotDeltas.path_id, ScanSnapshotDeltas.op)
+            .join(ScanSnapshots, ScanSnapshots.id == ScanSnapshotDeltas.snapshot_id)
+            .where(
+                ScanSnapshots.root_path == snapshot.root_path,
+                ScanSnapshots.id <= snapshot.id,
+            )
+        )
+        if keyframe_id is not None:
+            deltas = union_all(
+                select(
+                    ScanSnapshotKeyframes.path_id,
+                    literal(1).label("op"),
+                ).where(ScanSnapshotKeyframes.snapshot_id == keyframe_id),
+                deltas.where(ScanSnapshots.id > keyframe_id),
+            )
+        changes = deltas.subquery()
+        stmt = (
+            select(ScanPaths.path, ScanPaths.id)
+            .join(changes, changes.c.path_id == ScanPaths.id)
+            .group_by(ScanPaths.id)
+            .having(func.sum(changes.c.op) > 0)
+            .order_by(ScanPaths.path)
+        )
+        return [(path, path_id) for path, path_id in db.execute(stmt)]
+
+    @staticmethod
+    def _intern(db: Session, paths: List[str]) -> Dict[str, int]:
+        """Return ids for 'paths', inserting the ones not seen before."""
+        ids: Dict[str, int] = {}
+        for chunk in _chunks(paths):
+            ids.update(
+                db.execute(
+                    select(ScanPaths.path, ScanPaths.id).where(
+                        ScanPaths.path.in_(chunk)
+                    )
+                ).all()
+            )
+        missing = [p for p in paths if p not in ids]
+        if missing:
+            db.execute(insert(ScanPaths), [{"path": p} for p in missing])
+            for chunk in _chunks(missing):
+                ids.update(
+                    db.execute(
+                        select(ScanPaths.path, ScanPaths.id).where(
+                            ScanPaths.path.in_(chunk)
+                        )
+                    ).all()
+                )
+        return ids
@@ -0,0 +1,202 @@
+"""
+wembed_core/services/stat_snapshot_service.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Incremental rescans driven by a persisted stat snapshot.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from pydantic import BaseModel, Field
+from sqlalchemy import delete, insert, select
+
+from wembed_core.database import DatabaseService
+from wembed_core.file_scanner.walker import FileTreeWalker
+from wembed_core.models.indexing import FileStatSnapshots
+
+from .scan_snapshot_service import LOOKUP_CHUNK_SIZE
+
+
+class StatKey(NamedTuple):
+    """The stat fields that identify an unchanged file."""
+
+    dev: int
+    inode: int
+    size: int
+    mtime_ns: int
+
+    @classmethod
+    def from_stat(cls, stat: os.stat_result) -> "StatKey":
+        return cls(stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+def _root_key(root_path: str | Path) -> str:
+    """The form of a root stored in FileStatSnapshots.root_path."""
+    return str(Path(root_path).resolve())
+
+
+class IncrementalScan(BaseModel):
+    """
+    A rescan of a root compared with its stat snapshot.
+
+    Attributes:
+        root_path (str): The resolved root that was rescanned.
+        new (List[str]): Files not in the snapshot.
+        modified (List[str]): Files whose stat differs from the snapshot.
+        deleted (List[str]): Snapshot files that were not found.
+        failed (List[str]): Files that could not be stat'ed; their snapshot
+            rows are neither dropped nor rewritten.
+        unchanged (int): Files skipped because their stat matched.
+        errors (int): Number of failed files.
+        elapsed_ms (float): Time taken by the rescan.
+        stats (Dict[str, StatKey]): Current stat of every new or modified file.
+    """
+
+    root_path: str
+    new: List[str] = Field(default_factory=list)
+    modified: List[str] = Field(default_factory=list)
+    deleted: List[str] = Field(default_factory=list)
+    failed: List[str] = Field(default_factory=list)
+    unchanged: int = 0
+    errors: int = 0
+    elapsed_ms: float = 0.0
+    stats: Dict[str, StatKey] = Field(default_factory=dict, repr=False)
+
+    @property
+    def changed(self) -> List[str]:
+        """New and modified files, the ones that need processing."""
+        return self.new + self.modified
+
+
+class StatSnapshotService:
+    """
+    Skips files whose (dev, inode, size, mtime_ns) match the last processed scan.
+
+    A rescan only stats files; none is opened. The caller processes the
+    changed files (record creation, hashing, embedding) and then calls
+    commit() so that the snapshot only ever describes processed content.
+    Roots are resolved before use, so one directory has one snapshot
+    however it is spelled.
+
+    Methods:
+        load(): The stored snapshot of a root.
+        rescan(): Compare files with the snapshot.
+        rescan_tree(): Walk a root and compare its files with the snapshot.
+        commit(): Store the stats of processed files.
+        forget(): Drop the snapshot of a root.
+    """
+
+    def __init__(self, db_service: DatabaseService):
+        """
+        Initialize the service with an initialized database service.
+        Args:
+            db_service (DatabaseService): Database holding the snapshot table.
+        """
+        self._db_service = db_service
+
+    def load(self, root_path: str | Path) -> Dict[str, StatKey]:
+        """Return 'path -> StatKey' for every file in the snapshot of a root."""
+        stmt = select(
+            FileStatSnapshots.path,
+            FileStatSnapshots.dev,
+            FileStatSnapshots.inode,
+            FileStatSnapshots.size,
+            FileStatSnapshots.mtime_ns,
+        ).where(FileStatSnapshots.root_path == _root_key(root_path))
+        with self._db_service.get_db() as db:
+            return {
+                path: StatKey(dev, inode, size, mtime_ns)
+                for path, dev, inode, size, mtime_ns in db.execute(stmt)
+            }
+
+    def rescan(
+        self, root_path: str | Path, paths: Iterable[str | Path]
+    ) -> IncrementalScan:
+        """
+        Stat every path and sort it into new, modified or unchanged.
+
+        Args:
+            root_path (str | Path): The root the paths were found under.
+            paths (Iterable[str | Path]): Every file currently under the root.
+        Returns:
+            IncrementalScan: What changed since the last commit().
+        """
+        start = time.perf_counter()
+        root = _root_key(root_path)
+        snapshot = self.load(root)
+        scan = IncrementalScan(root_path=root)
+        seen = set()
+        for path in paths:
+            path = str(path)
+            seen.add(path)
+            try:
+                key = StatKey.from_stat(os.stat(path))
+            except OSError:
+                # Still listed, so not deleted; the snapshot is left as it was.
+                scan.failed.append(path)
+                scan.errors += 1
+                continue
+            previous = snapshot.get(path)
+            if previous == key:
+                scan.unchanged += 1
+                continue
+            (scan.new if previous is None else scan.modified).append(path)
+            scan.stats[path] = key
+        scan.deleted = sorted(p for p in snapshot if p not in seen)
+        scan.elapsed_ms = (time.perf_counter() - start) * 1000.0
+        return scan
+
+    def rescan_tree(
+        self, root_path: str | Path, walker: Optional[FileTreeWalker] = None
+    ) -> IncrementalScan:
+        """Walk 'root_path' and rescan every file found."""
+        walker = walker or FileTreeWalker()
+        result = walker.walk(_root_key(root_path))
+        return self.rescan(result.root, result.files.iter_str())
+
+    def commit(
+        self, scan: IncrementalScan, processed: Optional[Iterable[str]] = None
+    ) -> int:
+        """
+        Store the stats of processed files and drop deleted ones.
+
+        Args:
+            scan (IncrementalScan): Result of rescan().
+            processed (Optional[Iterable[str]]): Changed files that were processed
+                successfully; defaults to all of them. Others stay changed.
+        Returns:
+            int: Number of snapshot rows written.
+        """
+        paths = scan.changed if processed is None else list(processed)
+        rows = [
+            {"root_path": scan.root_path, "path": p, **scan.stats[p]._asdict()}
+            for p in paths
+            if p in scan.stats
+        ]
+        stale = [row["path"] for row in rows] + scan.deleted
+        with self._db_service.get_db() as db:
+            for start in range(0, len(stale), LOOKUP_CHUNK_SIZE):
+                db.execute(
+                    delete(FileStatSnapshots).where(
+                        FileStatSnapshots.root_path == scan.root_path,
+                        FileStatSnapshots.path.in_(
+                            stale[start : start + LOOKUP_CHUNK_SIZE]
+                        ),
+                    )
+                )
+            if rows:
+                db.execute(insert(FileStatSnapshots), rows)
+            db.commit()
+        return len(rows)
+
+    def forget(self, root_path: str | Path) -> None:
+        """Drop the snapshot of a root so its next rescan treats every file as new."""
+        with self._db_service.get_db() as db:
+            db.execute(
+                delete(FileStatSnapshots).where(
+                    FileStatSnapshots.root_path == _root_key(root_path)
+                )
+            )
+            db.commit()
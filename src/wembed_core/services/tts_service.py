@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 import numpy as np
 import sounddevice as sd
@@ -22,6 +22,7 @@ from wembed_core.config import (
 )
 from wembed_core.database import DatabaseService
 from wembed_core.models.tts import TTSModel
+from wembed_core.pagination import Page, iter_table, paginate
 
 # ---------------------------------------------------------------------
 # Configuration via .env or environment
@@ -108,12 +109,26 @@ class TTSService:
 
         return model_entries
 
+    def iter_models(self, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """Stream all indexed models in keyset-paginated batches."""
+        with self._db_service.get_db() as db:
+            for model in iter_table(db, TTSModel, batch_size=batch_size):
+                yield model.as_dict()
+
     def list_models(self, as_json: bool = False) -> str | List[Dict[str, Any]]:
         """Return list of all indexed models."""
+        model_dicts = list(self.iter_models())
+        return json.dumps(model_dicts, indent=2) if as_json else model_dicts
+
+    def list_models_page(
+        self, page_size: int = 50, cursor: Optional[str] = None
+    ) -> Page[Dict[str, Any]]:
+        """Return one page of indexed models and the cursor for the next page."""
         with self._db_service.get_db() as db:
-            models = db.query(TTSModel).all()
-            model_dicts = [m.as_dict() for m in models]
-            return json.dumps(model_dicts, indent=2) if as_json else model_dicts
+            page = paginate(db, TTSModel, page_size=page_size, cursor=cursor)
+            return Page(
+                items=[m.as_dict() for m in page.items], next_cursor=page.next_cursor
+            )
 
     def _load_voice(self, model: TTSModel) -> PiperVoice:
         return PiperVoice.load(model.model_path, model.config_path)
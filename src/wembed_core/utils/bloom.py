@@ -0,0 +1,124 @@
+"""
+wembed_core/utils/bloom.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+A compact Bloom filter for hex digests and other string keys.
+"""
+
+import hashlib
+import math
+import struct
+from pathlib import Path
+from typing import Iterable, Iterator
+
+_HEADER = struct.Struct("<4sQII")
+_MAGIC = b"WBF1"
+
+
+def _positions(key: str, num_bits: int, num_hashes: int) -> Iterator[int]:
+    """
+    Derive 'num_hashes' bit positions with double hashing.
+
+    Keys are usually SHA-256 hex digests, which are already uniform, so
+    their leading hex digits are used directly; other keys are hashed first.
+    """
+    h1 = h2 = None
+    if len(key) >= 32:
+        try:
+            h1, h2 = int(key[:16], 16), int(key[16:32], 16)
+        except ValueError:
+            pass
+    if h1 is None or h2 is None:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+    h2 |= 1
+    return ((h1 + i * h2) % num_bits for i in range(num_hashes))
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter.
+
+    'in' never returns False for a key that was added; it returns True for
+    an absent key with roughly the configured false-positive probability.
+    """
+
+    __slots__ = ("num_bits", "num_hashes", "count", "_bits")
+
+    def __init__(self, num_bits: int, num_hashes: int):
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(num_hashes, 1)
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float = 0.01) -> "BloomFilter":
+        """Size a filter for 'capacity' keys at the given false-positive rate."""
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        num_hashes = round(num_bits / capacity * math.log(2))
+        return cls(num_bits, num_hashes)
+
+    def add(self, key: str) -> None:
+        """Add a key to the filter."""
+        bits = self._bits
+        for pos in _positions(key, self.num_bits, self.num_hashes):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        """Add every key of an iterable."""
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        bits = self._bits
+        return all(
+            bits[pos >> 3] & (1 << (pos & 7))
+            for pos in _positions(key, self.num_bits, self.num_hashes)
+        )
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def expected_fp_rate(self) -> float:
+        """Theoretical false-positive probability at the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** (
+            self.num_hashes
+        )
+
+    def to_bytes(self) -> bytes:
+        """Serialize the filter."""
+        header = _HEADER.pack(_MAGIC, self.num_bits, self.num_hashes, self.count)
+        return header + bytes(self._bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        """
+        Deserialize a filter produced by to_bytes().
+        Raises:
+            ValueError: If the data is not a serialized filter.
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Bloom filter data is truncated.")
+        magic, num_bits, num_hashes, count = _HEADER.unpack_from(data)
+        body = data[_HEADER.size :]
+        if magic != _MAGIC or len(body) != (num_bits + 7) // 8:
+            raise ValueError("Not a serialized Bloom filter.")
+        bloom = cls(num_bits, num_hashes)
+        bloom._bits[:] = body
+        bloom.count = count
+        return bloom
+
+    def save(self, path: Path) -> None:
+        """Write the filter to a file atomically."""
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(self.to_bytes())
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        """Read a filter written by save()."""
+        return cls.from_bytes(path.read_bytes())
@@ -0,0 +1,76 @@
+"""
+wembed_core/utils/delta.py
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+Compact line-based deltas between two byte strings.
+
+A delta rebuilds a target from a base as a sequence of operations: copy a
+run of base lines, or insert literal bytes. Lines are split after b"\\n", so
+binary content simply yields fewer, longer "lines" and still round-trips.
+The encoded operations are zlib-compressed.
+"""
+
+import struct
+import zlib
+from difflib import SequenceMatcher
+from typing import List
+
+_COPY = b"C"
+_INSERT = b"I"
+_COPY_ARGS = struct.Struct("<II")
+_INSERT_LEN = struct.Struct("<I")
+
+
+def split_lines(data: bytes) -> List[bytes]:
+    """Split bytes into lines, keeping the line endings."""
+    return data.splitlines(keepends=True)
+
+
+def make_delta(base: bytes, target: bytes, level: int = 6) -> bytes:
+    """
+    Encode 'target' as a delta against 'base'.
+
+    Args:
+        base (bytes): Content the delta will be applied to.
+        target (bytes): Content the delta reproduces.
+        level (int): zlib compression level.
+    Returns:
+        bytes: The compressed delta.
+    """
+    base_lines, target_lines = split_lines(base), split_lines(target)
+    matcher = SequenceMatcher(None, base_lines, target_lines, autojunk=False)
+    out = bytearray()
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            out += _COPY + _COPY_ARGS.pack(i1, i2 - i1)
+        elif tag in ("replace", "insert"):
+            literal = b"".join(target_lines[j1:j2])
+            out += _INSERT + _INSERT_LEN.pack(len(literal)) + literal
+    return zlib.compress(bytes(out), level)
+
+
+def apply_delta(base: bytes, delta: bytes) -> bytes:
+    """
+    Rebuild the target of a delta produced by make_delta().
+
+    Raises:
+        ValueError: If the delta is corrupt.
+    """
+    ops = zlib.decompress(delta)
+    base_lines = split_lines(base)
+    out = bytearray()
+    pos = 0
+    while pos < len(ops):
+        op = ops[pos : pos + 1]
+        pos += 1
+        if op == _COPY:
+            start, count = _COPY_ARGS.unpack_from(ops, pos)
+            pos += _COPY_ARGS.size
+            out += b"".join(base_lines[start : start + count])
+        elif op == _INSERT:
+            (length,) = _INSERT_LEN.unpack_from(ops, pos)
+            pos += _INSERT_LEN.size
+            out += ops[pos : pos + length]
+            pos += length
+        else:
+            raise ValueError(f"Corrupt delta: unknown operation {op!r}.")
+    return bytes(out)
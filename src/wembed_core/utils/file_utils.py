@@ -5,9 +5,11 @@
 """
 
 import fnmatch
+import os
+import re
 import subprocess
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
 
 from typer import Exit, echo
 
@@ -46,29 +48,120 @@ def get_git_files(repo_path: Path, include_empty: bool = False) -> List[str]:
         return []
 
 
+_GLOB_CHARS = frozenset("*?[")
+
+
+def _has_glob(text: str) -> bool:
+    return not _GLOB_CHARS.isdisjoint(text)
+
+
+class _CompiledPatterns:
+    """
+    A set of fnmatch patterns compiled for fast repeated testing.
+
+    Patterns are sorted into fast paths: exact literals go into a set,
+    '*.ext' patterns into a set of extensions, other '*literal' patterns
+    into a suffix tuple, 'literal*' patterns into a prefix tuple, and
+    everything else into one combined regex.
+    """
+
+    __slots__ = ("literals", "extensions", "suffixes", "prefixes", "regex", "empty")
+
+    def __init__(self, patterns: Iterable[str]):
+        literals, extensions, suffixes, prefixes, complex_ = set(), set(), [], [], []
+        for pattern in patterns:
+            head, tail = pattern[:1], pattern[1:]
+            if not _has_glob(pattern):
+                literals.add(pattern)
+            elif head == "*" and not _has_glob(tail):
+                if tail.startswith(".") and "." not in tail[1:] and "/" not in tail:
+                    extensions.add(tail)
+                else:
+                    suffixes.append(tail)
+            elif pattern.endswith("*") and not _has_glob(pattern[:-1]):
+                prefixes.append(pattern[:-1])
+            else:
+                complex_.append(pattern)
+        self.literals = frozenset(literals)
+        self.extensions = frozenset(extensions)
+        self.suffixes = tuple(suffixes)
+        self.prefixes = tuple(prefixes)
+        self.regex = (
+            re.compile("|".join(fnmatch.translate(p) for p in complex_)).match
+            if complex_
+            else None
+        )
+        self.empty = not (literals or extensions or suffixes or prefixes or complex_)
+
+    def __call__(self, path: str) -> bool:
+        """True if 'path' matches any of the patterns."""
+        if path in self.literals:
+            return True
+        if self.extensions:
+            dot = path.rfind(".")
+            if dot >= 0 and path[dot:] in self.extensions:
+                return True
+        if self.suffixes and path.endswith(self.suffixes):
+            return True
+        if self.prefixes and path.startswith(self.prefixes):
+            return True
+        return self.regex is not None and self.regex(path) is not None
+
+
+class PathFilter:
+    """
+    Include/exclude filtering of paths with precompiled fnmatch patterns.
+
+    Matches exactly what fnmatch.fnmatch() would for each pattern, but each
+    path is tested once against all patterns instead of once per pattern.
+    """
+
+    def __init__(
+        self,
+        match_patterns: Optional[Sequence[str]] = None,
+        exclude_patterns: Optional[Sequence[str]] = None,
+    ):
+        """
+        Compile the patterns.
+        Args:
+            match_patterns (Optional[Sequence[str]]): Keep only paths matching one of these; all paths if empty.
+            exclude_patterns (Optional[Sequence[str]]): Drop paths matching any of these.
+        """
+        # fnmatch.fnmatch() normalizes case on case-insensitive platforms.
+        self._normcase: Optional[Callable[[str], str]] = (
+            os.path.normcase if os.path.normcase("A/") != "A/" else None
+        )
+        self._match = _CompiledPatterns(self._norm(p) for p in match_patterns or ())
+        self._exclude = _CompiledPatterns(self._norm(p) for p in exclude_patterns or ())
+
+    def _norm(self, text: str) -> str:
+        return self._normcase(text) if self._normcase else text
+
+    def matches(self, path: str) -> bool:
+        """True if 'path' passes the match patterns and no exclude pattern."""
+        path = self._norm(path)
+        if not self._match.empty and not self._match(path):
+            return False
+        return self._exclude.empty or not self._exclude(path)
+
+    def filter(self, paths: Iterable[str]) -> Iterator[str]:
+        """Yield the paths that pass, in input order, without buffering."""
+        match, exclude = self._match, self._exclude
+        norm = self._normcase
+        for path in paths:
+            key = norm(path) if norm else path
+            if not match.empty and not match(key):
+                continue
+            if not exclude.empty and exclude(key):
+                continue
+            yield path
+
+
 def apply_filters(
     files: List[str], match_patterns: List[str], exclude_patterns: List[str]
 ) -> List[str]:
-    """Apply match and exclude patterns to filter files using set intersection/difference."""
-    file_set = set(files)
-
-    # Apply match patterns (if any) - only include files that match at least one pattern
-    if match_patterns:
-        matched_files = set()
-        for pattern in match_patterns:
-            pattern_matches = {f for f in file_set if fnmatch.fnmatch(f, pattern)}
-            matched_files.update(pattern_matches)
-        file_set = file_set.intersection(matched_files)
-
-    # Apply exclude patterns - remove files that match any exclude pattern
-    if exclude_patterns:
-        excluded_files = set()
-        for pattern in exclude_patterns:
-            pattern_matches = {f for f in file_set if fnmatch.fnmatch(f, pattern)}
-            excluded_files.update(pattern_matches)
-        file_set = file_set.difference(excluded_files)
-
-    return sorted(list(file_set))
+    """Apply match and exclude patterns to filter files; returns the sorted, unique survivors."""
+    return sorted(set(PathFilter(match_patterns, exclude_patterns).filter(files)))
 
 
 def build_tree_structure(files: List[str] | List[Path]) -> str:
@@ -0,0 +1,100 @@
+"""
+tests/test_async_scan.py
+Pytest tests for the anyio-based asynchronous scanner.
+"""
+
+import threading
+
+import anyio
+import pytest
+
+from wembed_core.file_scanner import AsyncFileScanner, async_scan
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name in (
+        "a.txt",
+        "sub/b.txt",
+        "sub/deeper/c.md",
+        "node_modules/skip.js",
+        "other/d.py",
+    ):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+    return tmp_path
+
+
+class TestAsyncFileScanner:
+    """Test suite for AsyncFileScanner."""
+
+    @pytest.mark.asyncio
+    async def test_iter_paths_prunes(self, tree):
+        scanner = AsyncFileScanner(concurrency=4, prune={"node_modules"})
+        paths = sorted([p async for p in scanner.iter_paths(tree)])
+        assert paths == sorted(
+            str(tree / n)
+            for n in ("a.txt", "sub/b.txt", "sub/deeper/c.md", "other/d.py")
+        )
+
+    @pytest.mark.asyncio
+    async def test_iter_records_from_directory(self, tree):
+        scanner = AsyncFileScanner(concurrency=3, prune={"node_modules"})
+        records = [r async for r in scanner.iter_records(tree)]
+        assert {r.name: r.content_text for r in records} == {
+            "a.txt": "a.txt",
+            "b.txt": "sub/b.txt",
+            "c.md": "sub/deeper/c.md",
+            "d.py": "other/d.py",
+        }
+
+    @pytest.mark.asyncio
+    async def test_iter_records_from_paths_skips_unreadable(self, tree):
+        scanner = AsyncFileScanner(concurrency=2)
+        paths = [tree / "a.txt", tree / "missing.txt"]
+        records = [r async for r in scanner.iter_records(paths)]
+        assert [r.name for r in records] == ["a.txt"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, tree, monkeypatch):
+        lock = threading.Lock()
+        active = peak = 0
+        build = async_scan.build_record_data
+
+        def tracked(path, limit):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            try:
+                return build(path, limit)
+            finally:
+                with lock:
+                    active -= 1
+
+        monkeypatch.setattr(async_scan, "build_record_data", tracked)
+        paths = [tree / "a.txt"] * 40
+        scanner = AsyncFileScanner(concurrency=2)
+        assert len([r async for r in scanner.iter_records(paths)]) == 40
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_consumer_can_stop_early(self, tree):
+        scanner = AsyncFileScanner(concurrency=2)
+        with anyio.fail_after(5):
+            async with scanner.open_records([tree / "a.txt"] * 100) as records:
+                first = await records.receive()
+        assert first.name == "a.txt"
+
+    @pytest.mark.asyncio
+    async def test_generators_can_be_closed_early(self, tree):
+        scanner = AsyncFileScanner(concurrency=2)
+        with anyio.fail_after(5):
+            for gen in (
+                scanner.iter_records([tree / "a.txt"] * 100),
+                scanner.iter_paths(tree),
+            ):
+                async for _ in gen:
+                    break
+                await gen.aclose()
@@ -0,0 +1,125 @@
+"""
+tests/test_content_hash_index.py
+Pytest tests for the Bloom filter backed content hash index.
+"""
+
+import hashlib
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.models import IndexedFiles
+from wembed_core.services.content_hash_index import ContentHashIndex
+from wembed_core.services.file_version_service import FileVersionService
+from wembed_core.utils.bloom import BloomFilter
+
+
+def sha(i: int) -> str:
+    return hashlib.sha256(str(i).encode()).hexdigest()
+
+
+class TestContentHashIndex:
+    """Test suite for BloomFilter and ContentHashIndex."""
+
+    @pytest.fixture
+    def db_service(self):
+        """Fixture providing a DatabaseService with 300 indexed files."""
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        service = DatabaseService(config)
+        service.init_db()
+        now = datetime(2024, 1, 1)
+        with service.get_db() as db:
+            db.add_all(
+                IndexedFiles(
+                    id=str(i),
+                    host="localhost",
+                    name=f"{i}.txt",
+                    stem=str(i),
+                    path=f"/repo/{i}.txt",
+                    suffix=".txt",
+                    sha256=sha(i),
+                    md5="m",
+                    size=1,
+                    content_text="",
+                    ctime_iso=now,
+                    mtime_iso=now,
+                    uri=f"file:///repo/{i}.txt",
+                    mimetype="text/plain",
+                )
+                for i in range(300)
+            )
+            db.commit()
+        return service
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter.for_capacity(1000, fp_rate=0.01)
+        bloom.update(sha(i) for i in range(1000))
+        bloom.add("not-a-hex-digest")
+        assert all(sha(i) in bloom for i in range(1000))
+        assert "not-a-hex-digest" in bloom
+        false_positives = sum(sha(i) in bloom for i in range(1000, 11000))
+        assert false_positives < 300
+        restored = BloomFilter.from_bytes(bloom.to_bytes())
+        assert sha(5) in restored and len(restored) == 1001
+        with pytest.raises(ValueError):
+            BloomFilter.from_bytes(b"junk")
+
+    def test_lookup_skips_queries_for_new_hashes(self, db_service):
+        index = ContentHashIndex(db_service, batch_size=100)
+        scanned = [sha(i) for i in range(200, 1200)]
+        found = index.lookup(scanned)
+
+        assert found == {sha(i) for i in range(200, 300)}
+        stats = index.stats
+        assert stats.checked == 1000
+        assert stats.confirmed_hits == 100
+        assert stats.definitely_new + stats.false_positives == 900
+        assert stats.queries <= 2
+        assert stats.queries_avoided >= 998
+        assert stats.false_positive_rate < 0.05
+
+    def test_persisted_filter_is_reused_or_rebuilt(self, db_service, tmp_path):
+        path = tmp_path / "hashes.bloom"
+        ContentHashIndex(db_service, path=path).load()
+        assert path.is_file()
+
+        reloaded = ContentHashIndex(db_service, path=path)
+        reloaded.rebuild = Mock(side_effect=AssertionError("should not rebuild"))
+        assert sha(1) in reloaded.load()
+
+        with db_service.get_db() as db:
+            db.delete(db.get(IndexedFiles, "1"))
+            db.commit()
+        stale = ContentHashIndex(db_service, path=path)
+        assert len(stale.load()) == 299
+
+    def test_in_place_rewrite_invalidates_persisted_filter(self, db_service, tmp_path):
+        path = tmp_path / "hashes.bloom"
+        ContentHashIndex(db_service, path=path).load()
+
+        FileVersionService(db_service).update_content("7", b"rewritten")
+        new_sha = hashlib.sha256(b"rewritten").hexdigest()
+        index = ContentHashIndex(db_service, path=path)
+        assert index.lookup([new_sha]) == {new_sha}
+
+    def test_reused_rowid_invalidates_persisted_filter(self, db_service, tmp_path):
+        path = tmp_path / "hashes.bloom"
+        ContentHashIndex(db_service, path=path).load()
+
+        with db_service.get_db() as db:
+            record = db.get(IndexedFiles, "299")
+            db.delete(record)
+            db.flush()
+            db.add(IndexedFiles(**{**self.columns(record), "sha256": sha(1000)}))
+            db.commit()
+        index = ContentHashIndex(db_service, path=path)
+        assert index.lookup([sha(1000)]) == {sha(1000)}
+
+    @staticmethod
+    def columns(record: IndexedFiles) -> dict:
+        return {c.key: getattr(record, c.key) for c in IndexedFiles.__table__.columns}
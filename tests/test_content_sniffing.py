@@ -0,0 +1,118 @@
+"""
+tests/test_content_sniffing.py
+Pytest tests for binary/text sniffing.
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from wembed_core.enums import ContentKinds
+from wembed_core.file_scanner import (
+    ContentSniffer,
+    create_file_record_from_path,
+    sniff_bytes,
+    sniffing,
+)
+
+
+class TestSniffBytes:
+    """Test suite for sniff_bytes."""
+
+    @pytest.mark.parametrize(
+        "data, encoding",
+        [
+            (b"plain ascii\n", "utf-8"),
+            ("café ☃\n".encode("utf-8"), "utf-8"),
+            ("\ufeffbom".encode("utf-8"), "utf-8-sig"),
+            ("utf16".encode("utf-16"), "utf-16"),
+            ("utf32".encode("utf-32"), "utf-32"),
+            ("café crème brûlée".encode("latin-1"), "latin-1"),
+            (b"", "utf-8"),
+        ],
+    )
+    def test_text(self, data, encoding):
+        result = sniff_bytes(data)
+        assert result.kind == ContentKinds.TEXT
+        assert result.encoding == encoding
+
+    def test_truncated_multibyte_character_is_still_utf8(self):
+        data = ("☃" * 10).encode("utf-8")[:-1]
+        assert sniff_bytes(data) == sniffing.UTF8
+
+    def test_mostly_utf8_is_decoded_with_replacement(self):
+        data = ("x" * 500).encode() + b"\xff"
+        result = sniff_bytes(data)
+        assert result.encoding == "utf-8"
+        assert result.errors == "replace"
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            b"\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR",
+            b"\x7fELF\x02\x01\x01" + b"\x00" * 9,
+            bytes(range(1, 32)) * 20 + b"\xff\xfe\xfd" * 100,
+        ],
+    )
+    def test_binary(self, data):
+        assert sniff_bytes(data).kind == ContentKinds.BINARY
+
+
+class TestContentSniffer:
+    """Test suite for ContentSniffer and its per-suffix cache."""
+
+    def test_decode(self):
+        sniffer = ContentSniffer()
+        assert sniffer.decode("hé".encode("utf-16"), ".txt") == "hé"
+        assert sniffer.decode(b"\x00\x01\x02", ".bin") is None
+
+    def test_binary_suffix_is_cached(self):
+        sniffer = ContentSniffer(min_samples=2)
+        for _ in range(2):
+            assert sniffer.decode(b"\x00" + os.urandom(100), ".dat") is None
+        assert sniffer.cached(".DAT").kind == ContentKinds.BINARY
+        with patch.object(sniffing, "sniff_bytes", side_effect=AssertionError):
+            assert sniffer.decode(b"looks like text", ".dat") is None
+
+    def test_cached_text_suffix_still_catches_binaries(self):
+        sniffer = ContentSniffer(min_samples=2)
+        sniffer.decode(b"a", ".txt")
+        sniffer.decode(b"b", ".txt")
+        assert sniffer.cached(".txt") == sniffing.UTF8
+        assert sniffer.decode(b"\x00\x01", ".txt") is None
+
+    def test_cached_encoding_that_does_not_fit_falls_back(self):
+        sniffer = ContentSniffer(min_samples=1)
+        sniffer.decode(b"ascii", ".txt")
+        text = "café crème brûlée"
+        assert sniffer.decode(text.encode("latin-1"), ".txt") == text
+        assert sniffer.cached(".txt") is None
+
+    def test_mixed_suffix_is_never_cached(self):
+        sniffer = ContentSniffer(min_samples=1)
+        sniffer.sniff(b"text", ".x")
+        sniffer.sniff(b"\x00", ".x")
+        sniffer.sniff(b"text", ".x")
+        assert sniffer.cached(".x") is None
+
+
+class TestRecordSniffing:
+    """Test suite for sniffing in create_file_record_from_path."""
+
+    def test_binary_gets_placeholder(self, tmp_path):
+        path = Path(tmp_path / "blob.unknown")
+        path.write_bytes(b"\x00\x01\x02binary")
+        record = create_file_record_from_path(
+            path, "dir", "test", str(tmp_path), "blob.unknown"
+        )
+        assert record.content_text == sniffing.BINARY_PLACEHOLDER
+
+    def test_utf16_text_is_decoded(self, tmp_path):
+        path = Path(tmp_path / "notes.txt")
+        path.write_text("héllo", encoding="utf-16")
+        record = create_file_record_from_path(
+            path, "dir", "test", str(tmp_path), "notes.txt"
+        )
+        assert record.content_text == "héllo"
@@ -0,0 +1,143 @@
+"""
+tests/test_file_hashing.py
+Pytest tests for single-pass streaming file hashing.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from wembed_core.file_scanner import (
+    create_file_record_from_path,
+    digest_bytes,
+    hash_file,
+)
+
+
+def expected(data: bytes) -> dict:
+    return {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "md5": hashlib.md5(data).hexdigest(),
+    }
+
+
+class TestHashFile:
+    """Test suite for hash_file."""
+
+    @pytest.fixture
+    def data(self):
+        return os.urandom(300_000)
+
+    @pytest.fixture
+    def path(self, tmp_path, data):
+        path = tmp_path / "data.bin"
+        path.write_bytes(data)
+        return path
+
+    def test_small_file_keeps_content(self, path, data):
+        digest = hash_file(path)
+        assert digest.hashes == expected(data)
+        assert digest.size == len(data)
+        assert digest.content == data
+
+    def test_streamed_file_drops_content(self, path, data):
+        digest = hash_file(path, text_size_limit=1000, chunk_size=4096)
+        assert digest.hashes == expected(data)
+        assert digest.size == len(data)
+        assert digest.content is None
+
+    def test_mmap_path(self, path, data):
+        digest = hash_file(path, text_size_limit=0, chunk_size=65536, mmap_threshold=1)
+        assert digest.hashes == expected(data)
+        assert digest.size == len(data)
+
+    def test_parallel_hashers(self, path, data, monkeypatch):
+        from wembed_core.file_scanner import hashing
+
+        monkeypatch.setattr(hashing, "PARALLEL_HASH_THRESHOLD", 0)
+        for mmap_threshold in (1, 1 << 40):
+            digest = hash_file(
+                path,
+                text_size_limit=0,
+                chunk_size=10_000,
+                mmap_threshold=mmap_threshold,
+            )
+            assert digest.hashes == expected(data)
+
+    def test_pool_is_created_once(self, monkeypatch):
+        from wembed_core.file_scanner import hashing
+
+        monkeypatch.setattr(hashing, "_hash_pool", None)
+        pools = []
+        barrier = threading.Barrier(8)
+
+        def first_call():
+            barrier.wait()
+            pools.append(hashing._pool())
+
+        threads = [threading.Thread(target=first_call) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(pool) for pool in pools}) == 1
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs fork")
+    def test_forked_child_gets_a_fresh_pool(self, path, data, monkeypatch):
+        from wembed_core.file_scanner import hashing
+
+        monkeypatch.setattr(hashing, "PARALLEL_HASH_THRESHOLD", 0)
+        hash_file(path, text_size_limit=0, chunk_size=10_000)
+        assert hashing._hash_pool is not None
+
+        child = multiprocessing.get_context("fork").Process(
+            target=hash_file,
+            args=(path,),
+            kwargs={"text_size_limit": 0, "chunk_size": 10_000},
+        )
+        child.start()
+        child.join(timeout=30)
+        if child.is_alive():
+            child.kill()
+        assert child.exitcode == 0
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty"
+        path.write_bytes(b"")
+        assert hash_file(path, text_size_limit=-1).hashes == expected(b"")
+        assert hash_file(path, text_size_limit=-1, mmap_threshold=0).size == 0
+
+    def test_digest_bytes(self):
+        digest = digest_bytes(b"abc", algorithms=("sha1",))
+        assert digest.hashes == {"sha1": hashlib.sha1(b"abc").hexdigest()}
+
+
+class TestRecordTextSizeLimit:
+    """Test suite for the text size limit of create_file_record_from_path."""
+
+    def test_large_file_is_hashed_without_text(self, tmp_path):
+        path = Path(tmp_path / "large.txt")
+        data = b"line\n" * 1000
+        path.write_bytes(data)
+        record = create_file_record_from_path(
+            path, "dir", "test", str(tmp_path), "large.txt", text_size_limit=100
+        )
+        assert record.sha256 == hashlib.sha256(data).hexdigest()
+        assert record.size == len(data)
+        assert record.content is None
+        assert record.content_text == ""
+
+    def test_small_file_keeps_text(self, tmp_path):
+        path = Path(tmp_path / "small.txt")
+        path.write_text("hello")
+        record = create_file_record_from_path(
+            path, "dir", "test", str(tmp_path), "small.txt"
+        )
+        assert record.content_text == "hello"
+        assert record.content == b"hello"
+        assert record.md5 == hashlib.md5(b"hello").hexdigest()
@@ -0,0 +1,141 @@
+"""
+tests/test_file_versions.py
+Pytest tests for delta-compressed IndexedFiles version history.
+"""
+
+import zlib
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.models import IndexedFiles
+from wembed_core.services.file_version_service import (
+    ContentCollisionError,
+    FileVersionService,
+)
+from wembed_core.utils.delta import apply_delta, make_delta
+
+
+def source_version(n: int) -> bytes:
+    lines = [f"def function_{i}():\n    return {i}\n" for i in range(200)]
+    lines[n % 200] = f"def function_{n % 200}():\n    return 'edited {n}'\n"
+    lines.append(f"# revision {n}\n")
+    return "".join(lines).encode("utf-8")
+
+
+class TestFileVersions:
+    """Test suite for FileVersionService and the delta codec."""
+
+    @pytest.fixture
+    def db_service(self):
+        """Fixture providing initialized DatabaseService."""
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        service = DatabaseService(config)
+        service.init_db()
+        with service.get_db() as db:
+            now = datetime(2024, 1, 1)
+            content = source_version(1)
+            db.add(
+                IndexedFiles(
+                    id="f1",
+                    host="localhost",
+                    name="mod.py",
+                    stem="mod",
+                    path="/repo/mod.py",
+                    suffix=".py",
+                    sha256="initial",
+                    md5="initial",
+                    size=len(content),
+                    content=content,
+                    content_text=content.decode(),
+                    ctime_iso=now,
+                    mtime_iso=now,
+                    uri="file:///repo/mod.py",
+                    mimetype="text/x-python",
+                )
+            )
+            db.commit()
+        return service
+
+    def test_delta_round_trip(self):
+        base = b"alpha\nbeta\ngamma\n"
+        for target in (b"alpha\nBETA\ngamma\ndelta", b"", b"\x00\xff binary"):
+            assert apply_delta(base, make_delta(base, target)) == target
+        with pytest.raises(ValueError):
+            apply_delta(base, zlib.compress(b"X"))
+
+    def test_every_version_is_reconstructable(self, db_service):
+        service = FileVersionService(db_service, keyframe_interval=4)
+        for n in range(2, 12):
+            record = service.update_content("f1", source_version(n))
+            assert record.version == n
+        assert record.updated_at is not None
+
+        for n in range(2, 12):
+            assert service.get_version("f1", n) == source_version(n)
+
+        versions = service.list_versions("f1")
+        assert [v.version for v in versions] == list(range(1, 11))
+        assert [v.version for v in versions if v.is_keyframe] == [4, 8]
+
+        stats = service.history_stats("f1")
+        assert stats.versions == 10
+        assert stats.stored_bytes * 5 < stats.full_bytes
+
+    def test_unchanged_content_and_errors(self, db_service):
+        service = FileVersionService(db_service)
+        record = service.update_content("f1", source_version(2))
+        assert service.update_content("f1", source_version(2)).version == record.version
+        with pytest.raises(ValueError):
+            service.get_version("f1", 99)
+        with pytest.raises(ValueError):
+            service.update_content("missing", b"")
+
+    def test_content_of_another_record_is_rejected(self, db_service):
+        service = FileVersionService(db_service)
+        taken = service.update_content("f1", source_version(2))
+        now = datetime(2024, 1, 1)
+        with db_service.get_db() as db:
+            db.add(
+                IndexedFiles(
+                    id="f2",
+                    host="localhost",
+                    name="other.py",
+                    stem="other",
+                    path="/repo/other.py",
+                    suffix=".py",
+                    sha256="other",
+                    md5="other",
+                    size=5,
+                    content=b"other",
+                    content_text="other",
+                    ctime_iso=now,
+                    mtime_iso=now,
+                    uri="file:///repo/other.py",
+                    mimetype="text/x-python",
+                )
+            )
+            db.commit()
+
+        with pytest.raises(ContentCollisionError) as excinfo:
+            service.update_content("f2", source_version(2))
+        assert excinfo.value.existing_id == "f1"
+        assert service.list_versions("f2") == []
+        assert service.update_content("f1", source_version(3)).version == (
+            taken.version + 1
+        )
+
+    def test_text_only_records_version_their_text(self, db_service):
+        with db_service.get_db() as db:
+            record = db.get(IndexedFiles, "f1")
+            record.content = None
+            record.content_text = "text only\n"
+            db.commit()
+        service = FileVersionService(db_service)
+        service.update_content("f1", b"new bytes\n")
+        assert service.get_version("f1", 1) == b"text only\n"
@@ -0,0 +1,128 @@
+"""
+tests/test_file_walker.py
+Pytest tests for the scandir-based directory walker.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from wembed_core.file_scanner import (
+    DirectoryPruner,
+    FileTreeWalker,
+    ListBuilder,
+    ListBuilderOptions,
+    measure_pruning,
+    walk_tree,
+)
+
+
+def touch(path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x")
+    return path
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """A small tree with a repository, a vault, images and Docling inputs."""
+    root = tmp_path / "root"
+    touch(root / "repo" / ".git" / "HEAD")
+    touch(root / "repo" / "src" / "main.py")
+    touch(root / "notes" / ".obsidian" / "app.json")
+    touch(root / "notes" / "daily.md")
+    touch(root / "photos" / "cat.JPG")
+    touch(root / "photos" / "dog.png")
+    touch(root / "papers" / "paper.pdf")
+    (root / "empty").mkdir()
+    return root
+
+
+class TestFileTreeWalker:
+    """Test suite for FileTreeWalker."""
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_walk_matches_rglob(self, tree, workers):
+        result = FileTreeWalker(workers).walk(tree)
+        expected = {p for p in tree.rglob("*") if p.is_file()}
+        assert set(result.files) == expected
+        assert result.directories == sum(1 for p in tree.rglob("*") if p.is_dir()) + 1
+        assert result.errors == 0
+
+    def test_classifies_in_one_pass(self, tree):
+        result = walk_tree(tree)
+        assert result.repositories == {tree / "repo"}
+        assert result.obsidian_vaults == {tree / "notes"}
+        assert result.images == {
+            tree / "photos" / "cat.JPG",
+            tree / "photos" / "dog.png",
+        }
+        assert result.docling_dirs == {tree / "photos", tree / "papers"}
+
+    def test_symlinked_directories_are_not_followed(self, tree):
+        (tree / "link").symlink_to(tree / "repo", target_is_directory=True)
+        result = walk_tree(tree)
+        assert not any("link" in p.parts for p in result.files)
+
+
+class TestDirectoryPruning:
+    """Ignored directories are pruned before they are entered."""
+
+    def test_pruner_names_and_globs(self):
+        pruner = DirectoryPruner({"node_modules", ".mypy_cache*", "build"})
+        assert pruner("node_modules")
+        assert pruner(".mypy_cache_3.12")
+        assert not pruner("src")
+        assert not pruner("node_modules_backup")
+        assert not DirectoryPruner()
+
+    def test_walk_prunes_ignored_directories(self, tree):
+        touch(tree / "app" / "node_modules" / "lib" / "index.js")
+        touch(tree / "app" / ".mypy_cache_x" / "cache.json")
+        touch(tree / "app" / "main.js")
+        result = walk_tree(tree, prune={"node_modules", ".mypy_cache*", ".git"})
+        assert result.pruned_dirs == {
+            tree / "app" / "node_modules",
+            tree / "app" / ".mypy_cache_x",
+            tree / "repo" / ".git",
+        }
+        assert tree / "app" / "main.js" in set(result.files)
+        assert not any("node_modules" in p.parts for p in result.files)
+        # Pruned marker folders still identify their repository.
+        assert result.repositories == {tree / "repo"}
+
+    def test_measure_pruning(self, tree):
+        touch(tree / "app" / "node_modules" / "a" / "b" / "index.js")
+        report = measure_pruning(tree, {"node_modules"})
+        assert report.pruned_dirs == 1
+        assert report.dirs_skipped == 3
+        assert report.files_skipped == 1
+        assert report.saved_ms == pytest.approx(report.full_ms - report.pruned_ms)
+
+
+class TestListBuilderWalk:
+    """ListBuilder's try_locate_* methods share one reusable walk."""
+
+    def test_locate_methods_reuse_walk(self, tree):
+        builder = ListBuilder(ListBuilderOptions(root_path=tree))
+        assert builder.try_locate_repositories(tree) == {tree / "repo"}
+        walk = builder.walk_result
+        assert builder.try_locate_obsidian_vaults(tree) == {tree / "notes"}
+        assert len(builder.try_locate_images(tree)) == 2
+        assert builder.try_locate_dL_ingestiable_files(tree) == {
+            tree / "photos",
+            tree / "papers",
+        }
+        assert builder.walk_result is walk
+        assert len(builder.all_files) == len(walk.files)
+
+    def test_locate_returns_none_when_nothing_found(self, tree):
+        builder = ListBuilder(ListBuilderOptions(root_path=tree))
+        assert builder.try_locate_repositories(tree / "papers") is None
+
+    def test_walk_prunes_ignored_file_parts(self, tree):
+        touch(tree / "repo" / "__pycache__" / "main.cpython-313.pyc")
+        builder = ListBuilder(ListBuilderOptions(root_path=tree))
+        walk = builder.walk(tree)
+        assert tree / "repo" / "__pycache__" in walk.pruned_dirs
+        assert not any("__pycache__" in p.parts for p in walk.files)
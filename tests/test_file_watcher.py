@@ -0,0 +1,145 @@
+"""
+tests/test_file_watcher.py
+Pytest tests for the live watch mode.
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from wembed_core.enums import FileChangeStates
+from wembed_core.file_scanner import (
+    FileWatcher,
+    ListBuilder,
+    ListBuilderOptions,
+    WatchBatch,
+    WatchLimitReached,
+)
+from wembed_core.file_scanner import watcher as watcher_module
+
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+
+
+def wait_for_batch(watcher: FileWatcher, timeout: float = 5.0) -> Optional[WatchBatch]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        batch = watcher.poll(timeout=0.05)
+        if batch is not None:
+            return batch
+    return None
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "old.txt").write_text("old")
+    (tmp_path / "keep.txt").write_text("keep")
+    return tmp_path
+
+
+@linux_only
+class TestInotifyWatcher:
+    """Test suite for the inotify backend."""
+
+    @pytest.fixture
+    def watcher(self, root):
+        watcher = FileWatcher(root, debounce_s=0.05, backend="inotify")
+        yield watcher
+        watcher.stop()
+
+    def test_registers_recursive_watches(self, watcher):
+        assert watcher.backend == "inotify"
+        assert watcher.watched_dirs == 2
+
+    def test_coalesces_changes_into_one_batch(self, watcher, root):
+        (root / "new.txt").write_text("a")
+        (root / "new.txt").write_text("b")
+        (root / "keep.txt").write_text("changed")
+        (root / "sub" / "old.txt").unlink()
+        (root / "tmp.txt").write_text("x")
+        (root / "tmp.txt").unlink()
+        batch = wait_for_batch(watcher)
+        assert batch.changes == {
+            str(root / "new.txt"): FileChangeStates.NEW,
+            str(root / "keep.txt"): FileChangeStates.MODIFIED,
+            str(root / "sub" / "old.txt"): FileChangeStates.DELETED,
+        }
+        assert batch.backend == "inotify"
+        assert batch.latency_ms < 5000
+
+    def test_new_directories_are_watched(self, watcher, root):
+        (root / "fresh").mkdir()
+        assert wait_for_batch(watcher, timeout=0.5) is None
+        (root / "fresh" / "file.txt").write_text("x")
+        batch = wait_for_batch(watcher)
+        assert batch.changed == [str(root / "fresh" / "file.txt")]
+        assert watcher.watched_dirs == 3
+
+    def test_removed_directories_are_reported(self, watcher, root):
+        (root / "sub" / "old.txt").unlink()
+        (root / "sub").rmdir()
+        batch = wait_for_batch(watcher)
+        assert batch.deleted_dirs == [str(root / "sub")]
+        assert batch.deleted == [str(root / "sub" / "old.txt")]
+
+    def test_pruned_directories_are_not_watched(self, root):
+        (root / "node_modules").mkdir()
+        watcher = FileWatcher(root, debounce_s=0.05, prune={"node_modules"})
+        try:
+            (root / "node_modules" / "x.js").write_text("x")
+            assert wait_for_batch(watcher, timeout=0.5) is None
+        finally:
+            watcher.stop()
+
+    def test_falls_back_to_polling_at_watch_limit(self, root, monkeypatch):
+        def add_watch(self, path, mask=watcher_module.WATCH_MASK):
+            raise WatchLimitReached(28, "No space left on device", path)
+
+        monkeypatch.setattr(watcher_module._Inotify, "add_watch", add_watch)
+        watcher = FileWatcher(root, debounce_s=0.05, poll_interval_s=0.05)
+        try:
+            assert watcher.backend == "polling"
+            (root / "keep.txt").write_text("changed again")
+            batch = wait_for_batch(watcher)
+            assert batch.changes == {str(root / "keep.txt"): FileChangeStates.MODIFIED}
+            assert batch.backend == "polling"
+        finally:
+            watcher.stop()
+
+
+class TestPollingWatcher:
+    """Test suite for the stat-snapshot polling backend."""
+
+    def test_polling_detects_changes(self, root):
+        watcher = FileWatcher(
+            root, debounce_s=0.01, poll_interval_s=0.05, backend="polling"
+        )
+        (root / "new.txt").write_text("n")
+        (root / "sub" / "old.txt").unlink()
+        batch = wait_for_batch(watcher)
+        assert batch.changes == {
+            str(root / "new.txt"): FileChangeStates.NEW,
+            str(root / "sub" / "old.txt"): FileChangeStates.DELETED,
+        }
+
+    def test_list_builder_watch_feeds_callback(self, root):
+        batches: List[WatchBatch] = []
+        builder = ListBuilder(
+            ListBuilderOptions(root_path=root, ignored_file_parts=set())
+        )
+        watcher = builder.watch(
+            batches.append, debounce_s=0.01, poll_interval_s=0.05, backend="polling"
+        )
+        try:
+            (root / "new.txt").write_text("n")
+            deadline = time.monotonic() + 5
+            while not batches and time.monotonic() < deadline:
+                time.sleep(0.02)
+        finally:
+            watcher.stop()
+        assert Path(batches[0].changed[0]).name == "new.txt"
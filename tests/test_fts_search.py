@@ -0,0 +1,169 @@
+"""
+tests/test_fts_search.py
+Pytest tests for the FTS5 full-text indexes.
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, text
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.enums import FTSSources
+from wembed_core.models import CodeChunkerCodeChunks, DLChunks, IndexedFiles
+from wembed_core.search import fts_search, rebuild_fts, to_fts_query
+
+
+def make_file(file_id: str, content_text: str, suffix: str = ".py") -> IndexedFiles:
+    now = datetime.now()
+    return IndexedFiles(
+        id=file_id,
+        version=1,
+        host="localhost",
+        name=f"{file_id}{suffix}",
+        stem=file_id,
+        path=f"/test/{file_id}{suffix}",
+        suffix=suffix,
+        sha256=f"sha-{file_id}",
+        md5=f"md5-{file_id}",
+        size=len(content_text),
+        content_text=content_text,
+        ctime_iso=now,
+        mtime_iso=now,
+        uri=f"file:///test/{file_id}{suffix}",
+        mimetype="text/plain",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class TestFTSSearch:
+    """Test suite for the FTS5 indexes and BM25 queries."""
+
+    @pytest.fixture
+    def config(self):
+        """Fixture providing test configuration with in-memory SQLite database."""
+        from unittest.mock import Mock
+
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        return config
+
+    @pytest.fixture
+    def db_service(self, config):
+        """Fixture providing initialized DatabaseService."""
+        service = DatabaseService(config)
+        service.init_db()
+        return service
+
+    @pytest.fixture
+    def db_session(self, db_service):
+        """Fixture providing a database session."""
+        with db_service.get_db() as session:
+            yield session
+
+    def test_fts_tables_created_and_text_indexes_dropped(self, db_service):
+        inspector = inspect(db_service.engine)
+        tables = inspector.get_table_names()
+        assert "indexed_files_fts" in tables
+        assert "code_chunker_code_chunks_fts" in tables
+        chunk_indexes = {i["name"] for i in inspector.get_indexes("dl_doc_chunks")}
+        assert "ix_dl_doc_chunks_chunk_text" not in chunk_indexes
+
+    def test_triggers_keep_index_in_sync(self, db_session):
+        db_session.add_all(
+            [
+                make_file("a", "def get_db(): return session"),
+                make_file("b", "the quick brown fox"),
+            ]
+        )
+        db_session.commit()
+
+        hits = fts_search(db_session, FTSSources.INDEXED_FILES, "get_db")
+        assert [h.key for h in hits] == ["a"]
+
+        record = db_session.get(IndexedFiles, "a")
+        record.content_text = "brown bear"
+        record.updated_at = datetime.now()
+        db_session.commit()
+        assert fts_search(db_session, "indexed_files", "get_db") == []
+        assert {h.key for h in fts_search(db_session, "indexed_files", "brown")} == {
+            "a",
+            "b",
+        }
+
+        db_session.delete(record)
+        db_session.commit()
+        assert [h.key for h in fts_search(db_session, "indexed_files", "brown")] == [
+            "b"
+        ]
+
+    def test_bm25_ranking_and_filters(self, db_session):
+        db_session.add_all(
+            [
+                make_file("x", "parser parser parser", suffix=".py"),
+                make_file("y", "parser and many other unrelated words here", ".md"),
+            ]
+        )
+        db_session.commit()
+
+        hits = fts_search(db_session, "indexed_files", "parser", with_snippets=True)
+        assert [h.key for h in hits] == ["x", "y"]
+        assert hits[0].score > hits[1].score
+        assert "[parser]" in hits[0].snippet
+
+        filtered = fts_search(
+            db_session, "indexed_files", "parser", filters={"suffix": ".md"}
+        )
+        assert [h.key for h in filtered] == ["y"]
+
+        with pytest.raises(ValueError):
+            fts_search(db_session, "indexed_files", "parser", filters={"size": 1})
+
+    def test_chunk_corpora(self, db_session):
+        db_session.add(
+            DLChunks(
+                document_id=1,
+                chunk_index=0,
+                chunk_text="hybrid retrieval",
+                embedding=[],
+            )
+        )
+        db_session.add(
+            CodeChunkerCodeChunks(
+                content="class TmpRepoManager: pass",
+                chunk_type="class",
+                file_path="tmp_repo_manager.py",
+                start_line=1,
+                end_line=1,
+            )
+        )
+        db_session.commit()
+
+        assert len(fts_search(db_session, FTSSources.DOC_CHUNKS, "retrieval")) == 1
+        hits = fts_search(
+            db_session,
+            FTSSources.CODE_CHUNKS,
+            "TmpRepoManager",
+            filters={"chunk_type": "class"},
+        )
+        assert len(hits) == 1
+
+    def test_rebuild_restores_index(self, db_session):
+        db_session.add(make_file("r", "rebuild me"))
+        db_session.commit()
+        db_session.execute(
+            text(
+                "INSERT INTO indexed_files_fts(indexed_files_fts) VALUES ('delete-all')"
+            )
+        )
+        assert fts_search(db_session, "indexed_files", "rebuild") == []
+        rebuild_fts(db_session)
+        assert len(fts_search(db_session, "indexed_files", "rebuild")) == 1
+
+    def test_to_fts_query_quotes_terms(self):
+        assert to_fts_query('get_db "x"') == '"get_db" """x"""'
+        assert to_fts_query("a b", match_all=False) == '"a" OR "b"'
+        assert to_fts_query("   ") == ""
@@ -0,0 +1,357 @@
+"""
+tests/test_git_index.py
+Pytest tests for git-aware incremental indexing.
+"""
+
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine, func, inspect, select, text
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.file_scanner import (
+    ListBuilder,
+    ListBuilderOptions,
+    collect_changes,
+    filtered_paths,
+    iter_blob_contents,
+    list_blobs,
+)
+from wembed_core.models.indexing import (
+    IndexedFileLines,
+    IndexedFiles,
+    IndexedFileVersions,
+)
+from wembed_core.services import GitIndexService
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=t@t", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    git(root, "init", "-q")
+    (root / "src").mkdir()
+    (root / "src" / "a.py").write_text("print('a')\n" * 20)
+    (root / "src" / "b.py").write_text("print('b')\n" * 20)
+    (root / "README.md").write_text("readme\n" * 20)
+    (root / "old.txt").write_text("old\n" * 20)
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "initial")
+    return root
+
+
+def record_for(path: Path, host: str) -> IndexedFiles:
+    now = datetime.now()
+    return IndexedFiles(
+        id=str(path),
+        host=host,
+        name=path.name,
+        stem=path.stem,
+        path=str(path),
+        suffix=path.suffix,
+        sha256=str(path),
+        md5="md5",
+        size=1,
+        content_text="",
+        ctime_iso=now,
+        mtime_iso=now,
+        uri=f"file://{path.as_posix()}",
+        mimetype="text/plain",
+    )
+
+
+class TestCollectChanges:
+    """Test suite for collect_changes."""
+
+    def test_without_base_lists_every_tracked_file(self, repo):
+        changes = collect_changes(repo, None)
+        assert changes.full
+        assert changes.added == ["README.md", "old.txt", "src/a.py", "src/b.py"]
+        assert changes.head_commit == git(repo, "rev-parse", "HEAD")
+
+    def test_unknown_base_falls_back_to_full_listing(self, repo):
+        assert collect_changes(repo, "0" * 40).full
+
+    def test_committed_changes(self, repo):
+        base = git(repo, "rev-parse", "HEAD")
+        (repo / "src" / "a.py").write_text("changed\n")
+        (repo / "new.py").write_text("new\n")
+        git(repo, "mv", "old.txt", "moved.txt")
+        git(repo, "rm", "-q", "src/b.py")
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", "second")
+
+        changes = collect_changes(repo, base)
+        assert not changes.full
+        assert changes.added == ["new.py"]
+        assert changes.modified == ["src/a.py"]
+        assert changes.deleted == ["src/b.py"]
+        assert changes.renamed == {"moved.txt": "old.txt"}
+        assert changes.changed == ["new.py", "src/a.py"]
+
+    def test_working_tree_changes_are_included(self, repo):
+        base = git(repo, "rev-parse", "HEAD")
+        (repo / "README.md").write_text("edited\n")
+        (repo / "src" / "b.py").unlink()
+        (repo / "untracked.txt").write_text("ignored\n")
+        git(repo, "mv", "old.txt", "staged.txt")
+
+        changes = collect_changes(repo, base)
+        assert changes.modified == ["README.md"]
+        assert changes.deleted == ["src/b.py"]
+        assert changes.renamed == {"staged.txt": "old.txt"}
+        assert changes.added == []
+
+    def test_rename_across_commit_and_worktree_is_composed(self, repo):
+        base = git(repo, "rev-parse", "HEAD")
+        git(repo, "mv", "old.txt", "step1.txt")
+        git(repo, "commit", "-q", "-m", "rename")
+        git(repo, "mv", "step1.txt", "step2.txt")
+        assert collect_changes(repo, base).renamed == {"step2.txt": "old.txt"}
+
+    def test_no_changes(self, repo):
+        assert collect_changes(repo, git(repo, "rev-parse", "HEAD")).is_empty
+
+    def test_list_builder_wrapper(self, repo, tmp_path):
+        builder = ListBuilder(ListBuilderOptions(root_path=repo))
+        assert builder.get_git_changes(None).full
+        plain = tmp_path / "plain"
+        plain.mkdir()
+        assert (
+            ListBuilder(ListBuilderOptions(root_path=plain)).get_git_changes(None)
+            is None
+        )
+
+
+class TestGitIndexService:
+    """Test suite for GitIndexService."""
+
+    @pytest.fixture
+    def db_service(self):
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        db_service = DatabaseService(config)
+        db_service.init_db()
+        return db_service
+
+    @pytest.fixture
+    def service(self, db_service):
+        return GitIndexService(db_service, host="test-host")
+
+    def test_first_run_indexes_everything(self, service, repo):
+        result = service.prepare(repo)
+        assert result.changes.full
+        assert len(result.to_index) == 4
+        repo_row = service.mark_indexed(repo, result.changes.head_commit)
+        assert repo_row.last_indexed_commit == git(repo, "rev-parse", "HEAD")
+        assert repo_row.indexed_at is not None
+
+    def test_incremental_run_moves_and_deletes_records(self, service, db_service, repo):
+        root = repo.resolve()
+        with db_service.get_db() as db:
+            for rel in ("README.md", "old.txt", "src/a.py", "src/b.py"):
+                db.add(record_for(root / rel, "test-host"))
+            removed_id = str(root / "src" / "b.py")
+            db.add(
+                IndexedFileLines(
+                    file_id=removed_id,
+                    file_source_name="repo",
+                    file_source_type="git",
+                    line_number=1,
+                    line_text="print('b')",
+                )
+            )
+            db.add(
+                IndexedFileVersions(
+                    file_id=removed_id, version=1, data=b"", sha256="s", size=0
+                )
+            )
+            db.commit()
+        service.mark_indexed(repo, git(repo, "rev-parse", "HEAD"))
+
+        git(repo, "mv", "old.txt", "docs.txt")
+        git(repo, "rm", "-q", "src/b.py")
+        (repo / "src" / "a.py").write_text("changed\n")
+        git(repo, "commit", "-q", "-am", "second")
+
+        result = service.prepare(repo)
+        assert result.renamed_records == 1
+        assert result.deleted_records == 1
+        assert result.to_index == [str(root / "src" / "a.py")]
+
+        with db_service.get_db() as db:
+            moved = db.get(IndexedFiles, str(root / "old.txt"))
+            assert moved.path == str(root / "docs.txt")
+            assert moved.name == "docs.txt"
+            assert moved.uri == f"file://{(root / 'docs.txt').as_posix()}"
+            assert db.get(IndexedFiles, removed_id) is None
+            for child in (IndexedFileLines, IndexedFileVersions):
+                assert (
+                    db.scalar(
+                        select(func.count())
+                        .select_from(child)
+                        .where(child.file_id == removed_id)
+                    )
+                    == 0
+                )
+
+        service.mark_indexed(repo, result.changes.head_commit)
+        assert service.prepare(repo).changes.is_empty
+
+
+class TestGitObjects:
+    """Test suite for reading blob ids and contents from the object store."""
+
+    def test_list_blobs_with_sizes(self, repo):
+        blobs = {b.path: b for b in list_blobs(repo, with_sizes=True)}
+        assert sorted(blobs) == ["README.md", "old.txt", "src/a.py", "src/b.py"]
+        assert blobs["old.txt"].sha == git(repo, "hash-object", "old.txt")
+        assert blobs["old.txt"].size == len("old\n" * 20)
+
+    def test_list_blobs_skips_symlinks(self, repo):
+        (repo / "link").symlink_to("old.txt")
+        git(repo, "add", "link")
+        assert "link" not in {b.path for b in list_blobs(repo)}
+
+    def test_iter_blob_contents(self, repo):
+        blobs = {b.path: b.sha for b in list_blobs(repo)}
+        shas = [blobs["src/a.py"], "0" * 40, blobs["README.md"]]
+        assert list(iter_blob_contents(repo, shas)) == [
+            (blobs["src/a.py"], b"print('a')\n" * 20),
+            ("0" * 40, None),
+            (blobs["README.md"], b"readme\n" * 20),
+        ]
+
+    def test_list_builder_git_blobs_skips_empty_files(self, repo):
+        (repo / "empty.txt").write_text("")
+        git(repo, "add", "empty.txt")
+        builder = ListBuilder(ListBuilderOptions(root_path=repo))
+        assert "empty.txt" not in {b.path for b in builder.get_git_blobs()}
+        assert "empty.txt" in {
+            b.path for b in builder.get_git_blobs(include_empty=True)
+        }
+
+
+class TestGitFingerprint:
+    """Test suite for blob-id fingerprinting in GitIndexService."""
+
+    @pytest.fixture
+    def db_service(self):
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        db_service = DatabaseService(config)
+        db_service.init_db()
+        return db_service
+
+    @pytest.fixture
+    def service(self, db_service):
+        return GitIndexService(db_service, host="test-host")
+
+    def index_all(self, service, db_service, repo):
+        records = list(service.iter_records(service.fingerprint(repo)))
+        for record in records:
+            record.host = "test-host"
+        with db_service.get_db() as db:
+            db.add_all(records)
+            db.commit()
+
+    def test_first_fingerprint_reads_every_blob(self, service, repo):
+        records = list(service.iter_records(service.fingerprint(repo)))
+        assert len(records) == 4
+        by_name = {r.name: r for r in records}
+        assert by_name["a.py"].content_text == "print('a')\n" * 20
+        assert by_name["a.py"].git_blob_sha == git(repo, "hash-object", "src/a.py")
+
+    def test_unchanged_blobs_are_not_read(self, service, db_service, repo):
+        self.index_all(service, db_service, repo)
+        fingerprint = service.fingerprint(repo)
+        assert fingerprint.changed == []
+        assert len(fingerprint.unchanged) == 4
+        with patch("builtins.open", side_effect=AssertionError("opened")):
+            assert list(service.iter_records(fingerprint)) == []
+
+    def test_committed_and_dirty_changes(self, service, db_service, repo):
+        self.index_all(service, db_service, repo)
+        (repo / "src" / "a.py").write_text("committed\n")
+        git(repo, "commit", "-q", "-am", "edit")
+        (repo / "README.md").write_text("dirty\n")
+
+        fingerprint = service.fingerprint(repo)
+        assert fingerprint.changed == ["README.md", "src/a.py"]
+        assert fingerprint.dirty == ["README.md"]
+        records = {r.name: r for r in service.iter_records(fingerprint)}
+        assert records["a.py"].content_text == "committed\n"
+        assert records["a.py"].git_blob_sha is not None
+        assert records["README.md"].content_text == "dirty\n"
+        assert records["README.md"].git_blob_sha is None
+
+    def test_converted_files_are_read_from_disk(self, service, db_service, repo):
+        (repo / ".gitattributes").write_text("*.md text eol=crlf\n*.py -text\n")
+        git(repo, "add", ".gitattributes")
+        git(repo, "commit", "-q", "-m", "attributes")
+        (repo / "README.md").unlink()
+        git(repo, "checkout", "--", "README.md")
+        assert (repo / "README.md").read_bytes() == b"readme\r\n" * 20
+
+        fingerprint = service.fingerprint(repo)
+        assert fingerprint.filtered == ["README.md"]
+        assert fingerprint.dirty == []
+        records = {r.name: r for r in service.iter_records(fingerprint)}
+        assert records["README.md"].content_text == "readme\r\n" * 20
+        blob = git(repo, "rev-parse", "HEAD:README.md")
+        assert records["README.md"].git_blob_sha == blob
+
+        self.index_all(service, db_service, repo)
+        assert service.fingerprint(repo).changed == []
+
+    def test_autocrlf_marks_text_files_as_filtered(self, repo):
+        git(repo, "config", "core.autocrlf", "true")
+        (repo / ".gitattributes").write_text("*.py -text\n")
+        assert filtered_paths(repo, ["README.md", "src/a.py"]) == {"README.md"}
+
+    def test_max_size_skips_large_blobs(self, service, repo):
+        fingerprint = service.fingerprint(repo)
+        assert list(service.iter_records(fingerprint, max_size=10)) == []
+
+
+class TestAddMissingColumns:
+    """Test suite for upgrading existing tables with new nullable columns."""
+
+    def test_adds_last_indexed_commit_to_old_table(self, tmp_path):
+        uri = f"sqlite:///{tmp_path / 'old.db'}"
+        engine = create_engine(uri)
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "CREATE TABLE indexed_repos (id INTEGER PRIMARY KEY, dir_type VARCHAR,"
+                    " host VARCHAR, root_path VARCHAR NOT NULL, files JSON,"
+                    " file_count INTEGER NOT NULL, indexed_at DATETIME)"
+                )
+            )
+        engine.dispose()
+
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = uri
+        config.debug = False
+        db_service = DatabaseService(config)
+        db_service.init_db()
+        columns = {
+            c["name"] for c in inspect(db_service.engine).get_columns("indexed_repos")
+        }
+        assert "last_indexed_commit" in columns
+        db_service.engine.dispose()
@@ -0,0 +1,132 @@
+"""
+tests/test_hybrid_search.py
+Pytest tests for hybrid dense + lexical retrieval.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.embedding import EmbeddingService
+from wembed_core.enums import FTSSources
+from wembed_core.models import CodeChunkerCodeChunks, DLChunks
+from wembed_core.search import (
+    HybridRetriever,
+    HybridSearchConfig,
+    reciprocal_rank_fusion,
+)
+
+
+class TestHybridRetriever:
+    """Test suite for HybridRetriever and reciprocal rank fusion."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        """Fixture providing test configuration with a file-backed SQLite database."""
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = f"sqlite:///{(tmp_path / 'hybrid.db').as_posix()}"
+        config.debug = False
+        return config
+
+    @pytest.fixture
+    def db_service(self, config):
+        """Fixture providing an initialized DatabaseService with sample chunks."""
+        service = DatabaseService(config)
+        service.init_db()
+        with service.get_db() as db:
+            db.add_all(
+                [
+                    DLChunks(
+                        document_id=1,
+                        chunk_index=0,
+                        chunk_text="How to open a database session",
+                        embedding=[1.0, 0.0, 0.0],
+                    ),
+                    DLChunks(
+                        document_id=1,
+                        chunk_index=1,
+                        chunk_text="Configuring the text to speech voice",
+                        embedding=[0.0, 1.0, 0.0],
+                    ),
+                    CodeChunkerCodeChunks(
+                        content="def get_db(self): yield self.SessionLocal()",
+                        chunk_type="function",
+                        file_path="database.py",
+                        start_line=1,
+                        end_line=1,
+                        embedding=[0.9, 0.1, 0.0],
+                    ),
+                ]
+            )
+            db.commit()
+        return service
+
+    @pytest.fixture
+    def embedding_service(self):
+        """Fixture providing an embedding service that returns a fixed vector."""
+        service = Mock(spec=EmbeddingService)
+        service.get_embedding.return_value = [[1.0, 0.05, 0.0]]
+        return service
+
+    def test_reciprocal_rank_fusion(self):
+        a = (FTSSources.DOC_CHUNKS, 1)
+        b = (FTSSources.DOC_CHUNKS, 2)
+        c = (FTSSources.CODE_CHUNKS, 1)
+        fused = reciprocal_rank_fusion([[a, b], [c, a]], k=60)
+        assert fused[0][0] == a
+        assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+        assert {key for key, _ in fused} == {a, b, c}
+
+    def test_search_fuses_lexical_and_dense(self, db_service, embedding_service):
+        retriever = HybridRetriever(
+            db_service, embedding_service, HybridSearchConfig(top_k=5)
+        )
+        result = retriever.search("get_db")
+
+        top = result.hits[0]
+        assert (top.source, top.key) == (FTSSources.CODE_CHUNKS, 1)
+        assert top.lexical_rank == 1
+        assert top.dense_rank is not None
+
+        dense_only = [h for h in result.hits if h.lexical_rank is None]
+        assert (FTSSources.DOC_CHUNKS, 1) in {(h.source, h.key) for h in dense_only}
+        embedding_service.get_embedding.assert_called_once_with("get_db")
+
+    def test_timings_and_candidate_limits(self, db_service, embedding_service):
+        retriever = HybridRetriever(
+            db_service, embedding_service, HybridSearchConfig(dense_k=1, top_k=10)
+        )
+        result = retriever.search("voice")
+
+        assert set(result.timings) == {"lexical", "embed", "dense", "fusion", "total"}
+        assert all(value >= 0 for value in result.timings.values())
+        # one dense candidate from each corpus that has embeddings
+        assert result.candidates["dense"] == 2
+        assert result.candidates["lexical"] == 1
+
+    def test_lexical_corpora_are_ranked_separately(self, db_service, embedding_service):
+        embedding_service.get_embedding.return_value = [[0.0, 0.0, 0.0]]
+        retriever = HybridRetriever(db_service, embedding_service)
+        result = retriever.search("database get_db")
+
+        ranks = {(h.source, h.key): h.lexical_rank for h in result.hits}
+        assert ranks[(FTSSources.DOC_CHUNKS, 1)] == 1
+        assert ranks[(FTSSources.CODE_CHUNKS, 1)] == 1
+        assert result.hits[0].score == pytest.approx(result.hits[1].score)
+
+    def test_lexical_and_dense_rankings_weigh_the_same(
+        self, db_service, embedding_service
+    ):
+        retriever = HybridRetriever(
+            db_service, embedding_service, HybridSearchConfig(dense_k=1)
+        )
+        result = retriever.search("voice")
+
+        scores = {(h.source, h.key): h.score for h in result.hits}
+        assert scores == {
+            (FTSSources.DOC_CHUNKS, 2): pytest.approx(1 / 61),
+            (FTSSources.DOC_CHUNKS, 1): pytest.approx(1 / 61),
+            (FTSSources.CODE_CHUNKS, 1): pytest.approx(1 / 61),
+        }
@@ -0,0 +1,180 @@
+"""
+tests/test_index_io.py
+Pytest tests for columnar index export and import.
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import Mock
+
+import pytest
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.index_io import export_index, import_index, read_index_batches
+from wembed_core.models import (
+    CodeChunkerDependencyNodes,
+    DLChunks,
+    IndexedFileLines,
+    IndexedFiles,
+)
+from wembed_core.search import fts_search
+
+pa = pytest.importorskip("pyarrow")
+
+
+def make_service(path) -> DatabaseService:
+    config = Mock(spec=AppConfig)
+    config.sqlalchemy_uri = f"sqlite:///{path.as_posix()}"
+    config.debug = False
+    service = DatabaseService(config)
+    service.init_db()
+    return service
+
+
+class TestIndexExportImport:
+    """Test suite for export_index and import_index."""
+
+    @pytest.fixture
+    def source_db(self, tmp_path):
+        """Fixture providing a populated file-backed database."""
+        service = make_service(tmp_path / "source.db")
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        with service.get_db() as db:
+            db.add(
+                IndexedFiles(
+                    id="f1",
+                    version=1,
+                    host="localhost",
+                    name="a.py",
+                    stem="a",
+                    path="/repo/a.py",
+                    suffix=".py",
+                    sha256="s1",
+                    md5="m1",
+                    size=12,
+                    content=b"print('hi')\n",
+                    content_text="print('hi')\n",
+                    ctime_iso=now,
+                    mtime_iso=now,
+                    uri="file:///repo/a.py",
+                    mimetype="text/x-python",
+                    created_at=now,
+                    updated_at=now,
+                )
+            )
+            db.add_all(
+                IndexedFileLines(
+                    file_id="f1",
+                    file_source_name="repo",
+                    file_source_type="git",
+                    line_number=i,
+                    line_text=f"line {i}",
+                    embedding=[float(i), 0.5, 0.25],
+                    created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                )
+                for i in range(1, 6)
+            )
+            db.add(
+                DLChunks(
+                    document_id=1,
+                    chunk_index=0,
+                    chunk_text="docling chunk",
+                    embedding=[0.1, 0.2, 0.3, 0.4],
+                )
+            )
+            db.add(
+                CodeChunkerDependencyNodes(
+                    name="sqlalchemy",
+                    source="external",
+                    used_by=["database.py"],
+                    imports=[],
+                )
+            )
+            db.commit()
+        return service
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_round_trip(self, source_db, tmp_path, fmt):
+        out_dir = tmp_path / f"export-{fmt}"
+        counts = export_index(
+            source_db, out_dir, fmt=fmt, batch_size=2, include_content=True
+        )
+        assert counts["indexed_file_lines"] == 5
+        assert counts["dl_doc_chunks"] == 1
+
+        manifest = json.loads((out_dir / "manifest.json").read_text())
+        assert manifest["tables"]["indexed_file_lines"]["embedding_dim"] == 3
+
+        batches = list(
+            read_index_batches(
+                out_dir / manifest["tables"]["indexed_file_lines"]["file"],
+                batch_size=2,
+            )
+        )
+        assert [b.num_rows for b in batches] == [2, 2, 1]
+        assert batches[0].schema.field("embedding").type == pa.list_(pa.float32(), 3)
+
+        target = make_service(tmp_path / f"target-{fmt}.db")
+        loaded = import_index(target, out_dir)
+        assert loaded == counts
+
+        with target.get_db() as db:
+            record = db.get(IndexedFiles, "f1")
+            assert record.content == b"print('hi')\n"
+            assert record.ctime_iso == datetime(2024, 1, 1, 12, 0, 0)
+            lines = db.query(IndexedFileLines).order_by(IndexedFileLines.id).all()
+            assert lines[2].embedding == [3.0, 0.5, 0.25]
+            node = db.query(CodeChunkerDependencyNodes).one()
+            assert node.used_by == ["database.py"]
+            # FTS indexes are rebuilt after the bulk load
+            assert len(fts_search(db, "file_lines", "line")) == 5
+            assert len(fts_search(db, "indexed_files", "print")) == 1
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_mixed_embedding_dimensions_round_trip(self, source_db, tmp_path, fmt):
+        with source_db.get_db() as db:
+            db.add(
+                DLChunks(
+                    document_id=1,
+                    chunk_index=1,
+                    chunk_text="smaller model",
+                    embedding=[0.5, 0.5],
+                )
+            )
+            db.commit()
+        out_dir = tmp_path / f"mixed-{fmt}"
+        export_index(source_db, out_dir, fmt=fmt, tables=["dl_doc_chunks"])
+        manifest = json.loads((out_dir / "manifest.json").read_text())
+        assert manifest["tables"]["dl_doc_chunks"]["embedding_dim"] is None
+
+        target = make_service(tmp_path / f"mixed-{fmt}.db")
+        import_index(target, out_dir)
+        with target.get_db() as db:
+            chunks = db.query(DLChunks).order_by(DLChunks.chunk_index).all()
+            assert [len(c.embedding) for c in chunks] == [4, 2]
+            assert chunks[1].embedding == [0.5, 0.5]
+
+    def test_metadata_only_export(self, source_db, tmp_path):
+        out_dir = tmp_path / "meta"
+        export_index(source_db, out_dir, tables=["indexed_files"])
+        (batch,) = read_index_batches(out_dir / "indexed_files.parquet")
+        assert "content_text" not in batch.schema.names
+        assert "content" not in batch.schema.names
+
+        target = make_service(tmp_path / "meta.db")
+        import_index(target, out_dir)
+        with target.get_db() as db:
+            assert db.get(IndexedFiles, "f1").content_text == ""
+
+    def test_import_refuses_non_empty_database(self, source_db, tmp_path):
+        out_dir = tmp_path / "again"
+        export_index(source_db, out_dir, tables=["dl_doc_chunks"])
+        with pytest.raises(ValueError):
+            import_index(source_db, out_dir)
+
+    def test_unknown_format_and_table(self, source_db, tmp_path):
+        with pytest.raises(ValueError):
+            export_index(source_db, tmp_path, fmt="csv")
+        with pytest.raises(ValueError):
+            export_index(source_db, tmp_path, tables=["tts_models"])
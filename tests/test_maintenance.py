@@ -0,0 +1,178 @@
+"""
+tests/test_maintenance.py
+Pytest tests for time-sliced storage maintenance.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import func, select
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.maintenance import MaintenanceConfig, StorageMaintenance
+from wembed_core.models import (
+    DLChunks,
+    DLDoc,
+    FileIndexingResults,
+    IndexedFileLines,
+    IndexedFiles,
+    ScanPaths,
+    ScanSnapshotKeyframes,
+)
+from wembed_core.services.scan_snapshot_service import ScanSnapshotService
+
+
+def make_file(
+    file_id: str,
+    version: int,
+    path: str = "/repo/a.py",
+    now: datetime = datetime(2024, 1, 1),
+) -> IndexedFiles:
+    return IndexedFiles(
+        id=file_id,
+        version=version,
+        host="localhost",
+        name="a.py",
+        stem="a",
+        path=path,
+        suffix=".py",
+        sha256=f"sha-{file_id}",
+        md5="m",
+        size=1,
+        content_text="x" * 200_000,
+        ctime_iso=now,
+        mtime_iso=now,
+        uri=f"file://{path}",
+        mimetype="text/x-python",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class TestStorageMaintenance:
+    """Test suite for StorageMaintenance."""
+
+    @pytest.fixture
+    def db_service(self, tmp_path):
+        """Fixture providing a file-backed DatabaseService."""
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = f"sqlite:///{(tmp_path / 'index.db').as_posix()}"
+        config.debug = False
+        service = DatabaseService(config)
+        service.init_db()
+        return service
+
+    def count(self, db_service, model) -> int:
+        with db_service.get_db() as db:
+            return db.scalar(select(func.count()).select_from(model))
+
+    def test_retention_and_vacuum(self, db_service):
+        start = datetime(2024, 1, 1)
+        store = ScanSnapshotService(db_service, keyframe_interval=2)
+        with db_service.get_db() as db:
+            db.add_all(
+                FileIndexingResults(
+                    id=f"scan-{i}",
+                    root_path="/repo",
+                    scan_mode="manual",
+                    scan_start=start + timedelta(hours=i),
+                )
+                for i in range(5)
+            )
+            db.add_all(make_file(f"f{v}", v) for v in range(1, 4))
+            db.add_all(
+                IndexedFileLines(
+                    file_id=f"f{v}",
+                    file_source_name="repo",
+                    file_source_type="git",
+                    line_number=1,
+                    line_text="x",
+                )
+                for v in range(1, 4)
+            )
+            db.add(DLDoc(id=1, doc_json="{}"))
+            db.add_all(
+                DLChunks(document_id=doc, chunk_index=0, chunk_text="c", embedding=[])
+                for doc in (1, 2, 2)
+            )
+            db.commit()
+        snapshots = [
+            store.record_scan("/repo", [f"/repo/f{j}" for j in range(i, i + 3)])
+            for i in range(5)
+        ]
+
+        maintenance = StorageMaintenance(
+            db_service, MaintenanceConfig(keep_scans=2, time_budget_ms=10_000)
+        )
+        report = maintenance.run()
+
+        assert report.completed
+        assert report.rows_deleted["indexing_results"] == 3
+        assert report.rows_deleted["scan_snapshots"] == 3
+        assert report.rows_deleted["indexed_files"] == 2
+        assert report.rows_deleted["indexed_file_lines"] == 2
+        assert report.rows_deleted["dl_doc_chunks"] == 2
+        assert report.rows_deleted["scan_paths"] == 3
+        assert report.bytes_reclaimed > 0
+        assert report.bytes_reclaimed == report.pages_freed * 4096
+
+        with db_service.get_db() as db:
+            assert db.get(IndexedFiles, "f3") is not None
+        assert self.count(db_service, ScanPaths) == 4
+        # only the keyframe of the kept snapshot 3 survives
+        assert self.count(db_service, ScanSnapshotKeyframes) == 3
+        # the kept snapshots are still reconstructible after folding
+        assert store.get_snapshot(snapshots[3].id) == [
+            "/repo/f3",
+            "/repo/f4",
+            "/repo/f5",
+        ]
+        assert store.diff(snapshots[3].id, snapshots[4].id).added == ["/repo/f6"]
+
+    def test_tied_versions_keep_the_newest_row(self, db_service):
+        with db_service.get_db() as db:
+            db.add_all(
+                [
+                    make_file("z-old", 1, now=datetime(2024, 1, 1)),
+                    make_file("a-new", 1, now=datetime(2024, 6, 1)),
+                ]
+            )
+            db.commit()
+        StorageMaintenance(db_service, MaintenanceConfig(keep_file_versions=1)).run(
+            time_budget_ms=60_000
+        )
+        with db_service.get_db() as db:
+            assert db.scalars(select(IndexedFiles.id)).all() == ["a-new"]
+
+    def test_zero_budget_resumes(self, db_service):
+        with db_service.get_db() as db:
+            db.add_all(
+                DLChunks(document_id=9, chunk_index=i, chunk_text="c", embedding=[])
+                for i in range(5)
+            )
+            db.commit()
+        maintenance = StorageMaintenance(db_service, MaintenanceConfig(batch_size=2))
+
+        runs = 0
+        while True:
+            report = maintenance.run(time_budget_ms=0)
+            runs += 1
+            assert report.steps <= 1
+            if report.completed:
+                break
+        assert runs > 3
+        assert not maintenance.pending
+        assert self.count(db_service, DLChunks) == 0
+
+    def test_enable_incremental_vacuum(self, db_service):
+        maintenance = StorageMaintenance(db_service)
+        assert maintenance.enable_incremental_vacuum() is False
+        with db_service.engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA auto_vacuum = NONE")
+            conn.commit()
+            conn.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql(
+                "VACUUM"
+            )
+        assert maintenance.enable_incremental_vacuum() is True
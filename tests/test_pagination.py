@@ -0,0 +1,96 @@
+"""
+tests/test_pagination.py
+Pytest tests for streaming and keyset-paginated reads.
+"""
+
+import pytest
+from sqlalchemy import select
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.models import DLChunks
+from wembed_core.models.tts import TTSModel
+from wembed_core.pagination import (
+    decode_cursor,
+    encode_cursor,
+    iter_table,
+    paginate,
+    stream_query,
+)
+
+
+class TestPagination:
+    """Test suite for stream_query, iter_table and paginate."""
+
+    @pytest.fixture
+    def config(self):
+        """Fixture providing test configuration with in-memory SQLite database."""
+        from unittest.mock import Mock
+
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        return config
+
+    @pytest.fixture
+    def db_session(self, config):
+        """Fixture providing a session over 25 TTS model rows."""
+        service = DatabaseService(config)
+        service.init_db()
+        with service.get_db() as session:
+            session.add_all(
+                TTSModel(
+                    name=f"voice-{i:02d}",
+                    model_path=f"/m/{i}.onnx",
+                    config_path=f"/m/{i}.onnx.json",
+                    language="en_US" if i % 2 else "de_DE",
+                )
+                for i in range(25)
+            )
+            session.commit()
+            yield session
+
+    def test_cursor_round_trip(self):
+        for value in (42, "abc-123", "ünïcode"):
+            assert decode_cursor(encode_cursor(value)) == value
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor!")
+
+    def test_stream_query_entities_and_rows(self, db_session):
+        names = [m.name for m in stream_query(db_session, select(TTSModel), 7)]
+        assert len(names) == 25
+
+        rows = list(stream_query(db_session, select(TTSModel.id, TTSModel.name), 7))
+        assert rows[0].name == "voice-00"
+
+    def test_iter_table_batches(self, db_session):
+        models = list(iter_table(db_session, TTSModel, batch_size=10))
+        assert [m.id for m in models] == sorted(m.id for m in models)
+        assert len(models) == 25
+
+        filtered = iter_table(
+            db_session,
+            TTSModel,
+            batch_size=4,
+            stmt=select(TTSModel).where(TTSModel.language == "en_US"),
+        )
+        assert len(list(filtered)) == 12
+
+    def test_paginate_walks_all_pages(self, db_session):
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            page = paginate(db_session, TTSModel, page_size=10, cursor=cursor)
+            seen.extend(m.name for m in page.items)
+            pages += 1
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+        assert pages == 3
+        assert seen == [f"voice-{i:02d}" for i in range(25)]
+
+    def test_paginate_empty_table(self, db_session):
+        page = paginate(db_session, DLChunks, page_size=5)
+        assert page.items == []
+        assert page.next_cursor is None
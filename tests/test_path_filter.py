@@ -0,0 +1,92 @@
+"""
+tests/test_path_filter.py
+Pytest tests for the precompiled glob filter behind apply_filters().
+"""
+
+import fnmatch
+import itertools
+
+import pytest
+
+from wembed_core.utils.file_utils import PathFilter, apply_filters
+
+PATHS = [
+    "/".join(parts) + f"/file_{i}{ext}"
+    for i, (parts, ext) in enumerate(
+        itertools.product(
+            [("src",), ("docs",), ("build", "lib"), ("app", "node_modules", "x")],
+            [".py", ".md", ".js", ".min.js", ".tar.gz", ".txt~", ""],
+        )
+    )
+]
+
+PATTERNS = [
+    "*.py",
+    "*.tar.gz",
+    "*~",
+    "*",
+    "README.md",
+    "src/*",
+    "docs/*.md",
+    "*/node_modules/*",
+    "file_[0-9].py",
+    "file_[!0-9]*",
+    "?ake*",
+    "*test*",
+]
+
+
+class TestPathFilter:
+    """Test suite for PathFilter and apply_filters()."""
+
+    @pytest.mark.parametrize("pattern", PATTERNS)
+    def test_single_pattern_matches_fnmatch(self, pattern):
+        paths = PATHS + [
+            "README.md",
+            "a.tar.gz",
+            "notes.txt~",
+            "file_1.py",
+            "file_x.py",
+            "Makefile",
+            "x.py/inner",
+        ]
+        expected = [p for p in paths if fnmatch.fnmatch(p, pattern)]
+        assert list(PathFilter([pattern]).filter(paths)) == expected
+
+    def test_match_and_exclude(self):
+        files = ["src/a.py", "src/b.js", "docs/x.md", "build/a.py", "src/a_pb2.py"]
+        assert apply_filters(files, ["*.py", "docs/*"], ["build/*", "*_pb2.py"]) == [
+            "docs/x.md",
+            "src/a.py",
+        ]
+
+    def test_no_patterns_keeps_everything_sorted_and_unique(self):
+        assert apply_filters(["b", "a", "b"], [], []) == ["a", "b"]
+
+    def test_filter_streams(self):
+        consumed = []
+
+        def source():
+            for i in itertools.count():
+                consumed.append(i)
+                yield f"f{i}.py"
+
+        first = next(PathFilter(["*.py"]).filter(source()))
+        assert first == "f0.py"
+        assert consumed == [0]
+
+    def test_matches(self):
+        path_filter = PathFilter(["*.py"], ["tests/*"])
+        assert path_filter.matches("src/a.py")
+        assert not path_filter.matches("tests/a.py")
+        assert not path_filter.matches("src/a.js")
+
+    def test_apply_filters_matches_per_pattern_fnmatch(self):
+        match, exclude = PATTERNS[:6], ["*/node_modules/*", "*.min.js"]
+        expected = {
+            p
+            for p in PATHS
+            if any(fnmatch.fnmatch(p, m) for m in match)
+            and not any(fnmatch.fnmatch(p, e) for e in exclude)
+        }
+        assert apply_filters(PATHS, match, exclude) == sorted(expected)
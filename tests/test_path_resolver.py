@@ -0,0 +1,148 @@
+"""
+tests/test_path_resolver.py
+Pytest tests for the in-memory path-to-record resolver.
+"""
+
+import os
+from datetime import datetime, timezone
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import text
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.enums import FileChangeStates
+from wembed_core.file_scanner.path_resolver import PathRecordResolver
+from wembed_core.models import IndexedFiles
+
+
+class TestPathRecordResolver:
+    """Test suite for PathRecordResolver."""
+
+    @pytest.fixture
+    def db_service(self):
+        """Fixture providing initialized DatabaseService."""
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        service = DatabaseService(config)
+        service.init_db()
+        return service
+
+    @pytest.fixture
+    def repo(self, tmp_path, db_service):
+        """Fixture indexing three files of a temporary tree."""
+        root = tmp_path / "repo"
+        (root / "src").mkdir(parents=True)
+        for name in ("a.py", "b.py", "src/c.py", "gone.py"):
+            (root / name).write_text(name)
+        (tmp_path / "repo-other").mkdir()
+        (tmp_path / "repo-other" / "x.py").write_text("x")
+
+        with db_service.get_db() as db:
+            for i, path in enumerate(
+                [
+                    root / "a.py",
+                    root / "b.py",
+                    root / "gone.py",
+                    tmp_path / "repo-other/x.py",
+                ]
+            ):
+                stat = path.stat()
+                db.add(
+                    IndexedFiles(
+                        id=f"f{i}",
+                        host="test-host",
+                        name=path.name,
+                        stem=path.stem,
+                        path=str(path),
+                        suffix=path.suffix,
+                        sha256=f"sha{i}",
+                        md5="m",
+                        size=stat.st_size,
+                        content_text="",
+                        ctime_iso=datetime.now(),
+                        mtime_iso=datetime.fromtimestamp(
+                            stat.st_mtime, tz=timezone.utc
+                        ),
+                        uri=path.as_uri(),
+                        mimetype="text/x-python",
+                    )
+                )
+            db.commit()
+        (root / "b.py").write_text("b.py, edited")
+        (root / "gone.py").unlink()
+        return root
+
+    def test_classify_paths(self, db_service, repo):
+        resolver = PathRecordResolver(db_service, host="test-host")
+        assert resolver.load(repo) == 3
+        assert resolver.get(repo / "a.py").id == "f0"
+
+        result = resolver.classify_paths(
+            [repo / "a.py", repo / "b.py", repo / "src" / "c.py"]
+        )
+        assert result.unchanged == [str(repo / "a.py")]
+        assert result.modified == [str(repo / "b.py")]
+        assert result.new == [str(repo / "src" / "c.py")]
+        assert result.deleted == [str(repo / "gone.py")]
+
+    def test_stat_failure_is_not_deleted(self, db_service, repo):
+        resolver = PathRecordResolver(db_service, host="test-host")
+        resolver.load(repo)
+        locked = str(repo / "a.py")
+        real_stat = os.stat
+
+        def flaky_stat(path, *args, **kwargs):
+            if str(path) == locked:
+                raise PermissionError(path)
+            return real_stat(path, *args, **kwargs)
+
+        with patch("os.stat", side_effect=flaky_stat):
+            result = resolver.classify_paths([locked, repo / "b.py"])
+        assert result.failed == [locked]
+        assert result.deleted == [str(repo / "gone.py")]
+
+    def test_newest_of_tied_versions_wins(self, db_service, repo):
+        with db_service.get_db() as db:
+            old = db.get(IndexedFiles, "f0")
+            newer = IndexedFiles(
+                **{
+                    c.key: getattr(old, c.key)
+                    for c in IndexedFiles.__table__.columns
+                    if c.key not in ("id", "sha256", "mtime_iso")
+                },
+                id="a-newer",
+                sha256="sha-newer",
+                mtime_iso=old.mtime_iso.replace(year=old.mtime_iso.year + 1),
+            )
+            db.add(newer)
+            db.commit()
+        resolver = PathRecordResolver(db_service, host="test-host")
+        resolver.load(repo)
+        assert resolver.get(repo / "a.py").id == "a-newer"
+
+    def test_classify_single_file(self, db_service, repo):
+        resolver = PathRecordResolver(db_service, host="test-host")
+        resolver.load(str(repo) + os.sep)
+        stat = (repo / "a.py").stat()
+        assert (
+            resolver.classify(repo / "a.py", stat.st_size, stat.st_mtime)
+            == FileChangeStates.UNCHANGED
+        )
+        assert (
+            resolver.classify(repo / "a.py", stat.st_size + 1, stat.st_mtime)
+            == FileChangeStates.MODIFIED
+        )
+        assert PathRecordResolver(db_service, host="elsewhere").load(repo) == 0
+
+    def test_load_uses_host_path_index(self, db_service):
+        with db_service.get_db() as db:
+            plan = db.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT id FROM indexed_files "
+                    "WHERE host = 'h' AND path >= '/r/' AND path < '/r0'"
+                )
+            ).all()
+        assert "ix_indexed_files_host_path" in str(plan)
@@ -0,0 +1,56 @@
+"""
+tests/test_path_table.py
+Pytest tests for the compact PathTable.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from wembed_core.file_scanner.path_table import PathTable, measure_path_memory
+
+
+def sample_paths(count: int) -> list[str]:
+    return [
+        f"/home/user/project/pkg{i // 100}/mod{i % 10}/file_{i % 100}.py"
+        for i in range(count)
+    ]
+
+
+class TestPathTable:
+    """Test suite for PathTable."""
+
+    def test_round_trip(self):
+        paths = sample_paths(500) + ["relative/file.txt", "top.txt"]
+        table = PathTable(paths)
+        assert len(table) == len(paths)
+        assert list(table.iter_str()) == paths
+        assert list(table) == [Path(p) for p in paths]
+        assert table[0] == Path(paths[0])
+        assert table[-1] == Path("top.txt")
+        assert table[1:3] == [Path(p) for p in paths[1:3]]
+        with pytest.raises(IndexError):
+            table[len(paths)]
+
+    def test_interning_and_membership(self):
+        table = PathTable(sample_paths(1000))
+        # 10 package dirs x 10 module dirs, plus /, home, user and project
+        assert table.dir_count == 100 + 10 + 4
+        assert "/home/user/project/pkg3/mod5/file_35.py" in table
+        assert Path("/home/user/project/pkg3/mod5/file_35.py") in table
+        assert "/home/user/project/pkg3/mod5/file_36.py" not in table
+        assert "/elsewhere/file_35.py" not in table
+        assert table.index(Path("/home/user/project/pkg0/mod1/file_1.py")) == 1
+
+    def test_append_returns_index(self):
+        table = PathTable()
+        assert table.append("/a/b.txt") == 0
+        assert table.append(Path("/a/c.txt")) == 1
+        assert table.dir_count == 2
+
+    def test_memory_report(self):
+        report = measure_path_memory(sample_paths(20_000))
+        assert report.entries == 20_000
+        assert report.table_bytes < report.path_list_bytes
+        assert report.table_bytes_per_million == report.table_bytes * 50
+        assert PathTable(sample_paths(100)).nbytes() > 0
@@ -0,0 +1,83 @@
+"""
+tests/test_query_instrumentation.py
+Pytest tests for DatabaseService query instrumentation.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.models import DLChunks
+
+
+class TestQueryInstrumentation:
+    """Test suite for statement timing and the slow-query log."""
+
+    @pytest.fixture
+    def config(self):
+        """Fixture providing test configuration with in-memory SQLite database."""
+        from unittest.mock import Mock
+
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        return config
+
+    @pytest.fixture
+    def db_service(self, config):
+        """Fixture providing initialized DatabaseService."""
+        service = DatabaseService(config)
+        service.init_db()
+        return service
+
+    def test_instrument_before_init_raises(self, config):
+        with pytest.raises(Exception) as excinfo:
+            DatabaseService(config).instrument()
+        assert "Database not initialized" in str(excinfo.value)
+
+    def test_collects_statement_stats(self, db_service):
+        stats = db_service.instrument(slow_query_ms=10_000)
+        with db_service.get_db() as db:
+            for i in range(3):
+                db.add(
+                    DLChunks(document_id=1, chunk_index=i, chunk_text="x", embedding=[])
+                )
+                db.commit()
+            db.execute(text("SELECT count(*) FROM dl_doc_chunks")).scalar()
+
+        inserts = [s for s in stats.statements.values() if "INSERT" in s.statement]
+        assert inserts and inserts[0].count == 3
+        assert inserts[0].rows == 3
+        assert sum(inserts[0].histogram) == 3
+        assert inserts[0].min_ms <= inserts[0].mean_ms <= inserts[0].max_ms
+        assert len(stats.slow_queries) == 0
+
+    def test_slow_query_log_with_plans(self, db_service):
+        stats = db_service.instrument(slow_query_ms=0, explain_slow_queries=True)
+        with db_service.get_db() as db:
+            db.execute(
+                text("SELECT * FROM dl_doc_chunks WHERE document_id = :d"), {"d": 1}
+            ).all()
+
+        slow = [q for q in stats.slow_queries if "document_id" in q.statement]
+        assert len(slow) == 1
+        assert slow[0].query_plan
+        assert any("dl_doc_chunks" in line for line in slow[0].query_plan)
+
+        exported = json.loads(stats.to_json())
+        assert exported["slow_query_ms"] == 0
+        assert exported["statements"]
+        assert exported["slow_queries"][-1]["query_plan"] == slow[0].query_plan
+
+    def test_detach_and_reinstrument(self, db_service):
+        first = db_service.instrument()
+        second = db_service.instrument()
+        with db_service.get_db() as db:
+            db.execute(text("SELECT 1")).all()
+        assert first.statements == {}
+        assert second.statements
+        second.reset()
+        assert second.statements == {}
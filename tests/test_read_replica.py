@@ -0,0 +1,137 @@
+"""
+tests/test_read_replica.py
+Pytest tests for the in-memory read replica.
+"""
+
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.models import FileIndexingResults, IndexedFiles
+from wembed_core.replica import ReadReplica
+
+
+def make_file(file_id: str) -> IndexedFiles:
+    now = datetime(2024, 1, 1)
+    path = f"/repo/{file_id}.py"
+    return IndexedFiles(
+        id=file_id,
+        version=1,
+        host="localhost",
+        name=f"{file_id}.py",
+        stem=file_id,
+        path=path,
+        suffix=".py",
+        sha256=f"sha-{file_id}",
+        md5="m",
+        size=1,
+        content_text="x",
+        ctime_iso=now,
+        mtime_iso=now,
+        uri=f"file://{path}",
+        mimetype="text/x-python",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def count_files(db) -> int:
+    return db.scalar(select(func.count()).select_from(IndexedFiles))
+
+
+class TestReadReplica:
+    """Test suite for ReadReplica and DatabaseService.get_read_db()."""
+
+    @pytest.fixture
+    def db_service(self, tmp_path):
+        """Fixture providing a file-backed DatabaseService."""
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = f"sqlite:///{(tmp_path / 'index.db').as_posix()}"
+        config.debug = False
+        service = DatabaseService(config)
+        service.init_db()
+        with service.get_db() as db:
+            db.add(make_file("a"))
+            db.commit()
+        yield service
+        service.disable_read_replica()
+
+    def add_file(self, db_service: DatabaseService, file_id: str) -> None:
+        with db_service.get_db() as db:
+            db.add(make_file(file_id))
+            db.commit()
+
+    def test_get_read_db_without_replica(self, db_service):
+        with db_service.get_read_db() as db:
+            assert count_files(db) == 1
+
+    def test_replica_serves_snapshot_until_refreshed(self, db_service):
+        replica = db_service.enable_read_replica()
+        assert replica.status().stale is False
+        assert replica.status().lag_seconds == 0.0
+
+        self.add_file(db_service, "b")
+        with db_service.get_read_db() as db:
+            assert count_files(db) == 1
+        status = replica.status()
+        assert status.stale is True
+        assert status.lag_seconds >= 0.0
+
+        status = replica.refresh()
+        assert status.generation == 2
+        assert status.stale is False
+        with db_service.get_read_db() as db:
+            assert count_files(db) == 2
+
+    def test_replica_is_read_only(self, db_service):
+        db_service.enable_read_replica()
+        with db_service.get_read_db() as db:
+            with pytest.raises(OperationalError):
+                db.execute(text("DELETE FROM indexed_files"))
+
+    def test_selected_tables(self, db_service):
+        replica = db_service.enable_read_replica(tables=["indexed_files"])
+        with replica.session() as db:
+            assert count_files(db) == 1
+            indexes = db.scalars(
+                text(
+                    "SELECT name FROM sqlite_master "
+                    "WHERE type = 'index' AND tbl_name = 'indexed_files'"
+                )
+            ).all()
+            assert "ix_indexed_files_host_path" in indexes
+            with pytest.raises(OperationalError):
+                db.execute(select(FileIndexingResults)).all()
+
+    def test_background_refresh_on_notify(self, db_service):
+        replica = db_service.enable_read_replica(refresh_interval_s=60)
+        self.add_file(db_service, "b")
+        replica.notify()
+        deadline = time.monotonic() + 5
+        while replica.status().generation < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with db_service.get_read_db() as db:
+            assert count_files(db) == 2
+
+    def test_in_memory_source(self):
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        service = DatabaseService(config)
+        service.init_db()
+        with service.get_db() as db:
+            db.add(make_file("a"))
+            db.commit()
+        replica = service.enable_read_replica()
+        with service.get_read_db() as db:
+            assert count_files(db) == 1
+        assert replica.is_stale() is True
+        with pytest.raises(ValueError):
+            ReadReplica(service.engine, tables=["indexed_files"])
+        service.disable_read_replica()
@@ -0,0 +1,137 @@
+"""
+tests/test_record_builder.py
+Pytest tests for the process-pool record builder and bulk insert.
+"""
+
+import hashlib
+import multiprocessing
+import os
+import pickle
+import sys
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import func, select
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.file_scanner import (
+    ParallelRecordBuilder,
+    build_record_data,
+    hash_file,
+    hashing,
+)
+from wembed_core.models.indexing import IndexedFiles
+from wembed_core.services import ContentHashIndex, FileScanningService
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(25):
+        path = tmp_path / f"file_{i:02d}.txt"
+        path.write_text(f"content {i}\n")
+        paths.append(path)
+    return paths
+
+
+class TestParallelRecordBuilder:
+    """Test suite for ParallelRecordBuilder."""
+
+    def test_record_data_is_picklable(self, files):
+        record = build_record_data(files[0])
+        assert pickle.loads(pickle.dumps(record)) == record
+        assert record.content_text == "content 0\n"
+        assert record.sha256 == hashlib.sha256(b"content 0\n").hexdigest()
+        assert isinstance(record.to_orm(), IndexedFiles)
+
+    @pytest.mark.parametrize("workers", [1, 3])
+    def test_results_keep_input_order(self, files, tmp_path, workers):
+        missing = str(tmp_path / "missing.txt")
+        paths = files[:10] + [missing] + files[10:]
+        result = ParallelRecordBuilder(workers=workers, chunk_size=4).build(paths)
+        assert [r.path for r in result.records] == [str(p) for p in files]
+        assert result.failed == [missing]
+        assert sum(w.files for w in result.workers) == len(files)
+        assert sum(w.failed for w in result.workers) == 1
+        assert sum(w.bytes for w in result.workers) == sum(
+            p.stat().st_size for p in files
+        )
+        assert all(w.files_per_s > 0 for w in result.workers if w.files)
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="needs fork")
+    def test_build_after_parallel_hash_in_parent(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(hashing, "PARALLEL_HASH_THRESHOLD", 0)
+        big = []
+        for i in range(3):
+            path = tmp_path / f"big_{i}.bin"
+            path.write_bytes(os.urandom(300_000))
+            big.append(path)
+        hash_file(big[0], text_size_limit=0, chunk_size=10_000)
+        assert hashing._hash_pool is not None
+
+        builder = ParallelRecordBuilder(
+            workers=2,
+            chunk_size=1,
+            text_size_limit=0,
+            mp_context=multiprocessing.get_context("fork"),
+        )
+        result = builder.build(big[1:])
+        assert [r.path for r in result.records] == [str(p) for p in big[1:]]
+
+    def test_empty_input(self):
+        result = ParallelRecordBuilder(workers=2).build([])
+        assert result.records == [] and result.workers == []
+
+
+class TestFileScanningService:
+    """Test suite for FileScanningService bulk inserts."""
+
+    @pytest.fixture
+    def service(self):
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        db_service = DatabaseService(config)
+        db_service.init_db()
+        return FileScanningService(
+            db_service, ParallelRecordBuilder(workers=2, chunk_size=8)
+        )
+
+    def count(self, service) -> int:
+        with service._db_service.get_db() as db:
+            return db.scalar(select(func.count()).select_from(IndexedFiles))
+
+    def test_index_paths(self, service, files):
+        result = service.index_paths(files)
+        assert result.inserted == len(files)
+        assert self.count(service) == len(files)
+
+    def test_duplicate_content_is_skipped(self, service, files, tmp_path):
+        copy = tmp_path / "copy.txt"
+        copy.write_text("content 0\n")
+        assert service.index_paths(files[:5]).inserted == 5
+        assert service.index_paths(files[:10] + [copy]).inserted == 5
+        assert self.count(service) == 10
+
+    def test_hash_index_is_used_and_updated(self, service, files):
+        index = ContentHashIndex(service._db_service)
+        service.hash_index = index
+        assert service.index_paths(files[:5]).inserted == 5
+        assert index.stats.checked == 5
+        assert all(
+            hashlib.sha256(p.read_bytes()).hexdigest() in index.bloom for p in files[:5]
+        )
+        assert service.index_paths(files[:10]).inserted == 5
+        assert index.stats.confirmed_hits == 5
+
+    def test_rows_committed_after_index_load_are_skipped(self, service, files):
+        service.hash_index.load()
+        other = FileScanningService(
+            service._db_service, ParallelRecordBuilder(workers=1)
+        )
+        assert other.index_paths(files[:3]).inserted == 3
+
+        result = service.index_paths(files[:5])
+        assert result.inserted == 2
+        assert self.count(service) == 5
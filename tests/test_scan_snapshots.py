@@ -0,0 +1,120 @@
+"""
+tests/test_scan_snapshots.py
+Pytest tests for delta-encoded scan snapshots.
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.models import (
+    ScanPaths,
+    ScanSnapshotDeltas,
+    ScanSnapshotKeyframes,
+    ScanSnapshots,
+)
+from wembed_core.services.scan_snapshot_service import ScanSnapshotService, merge_diff
+
+
+class TestScanSnapshots:
+    """Test suite for ScanSnapshotService and merge_diff."""
+
+    @pytest.fixture
+    def db_service(self):
+        """Fixture providing initialized DatabaseService."""
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        service = DatabaseService(config)
+        service.init_db()
+        return service
+
+    @pytest.fixture
+    def store(self, db_service):
+        return ScanSnapshotService(db_service)
+
+    def test_merge_diff(self):
+        diff = merge_diff(["a", "b", "d", "f"], ["b", "c", "d", "g", "h"])
+        assert diff.added == ["c", "g", "h"]
+        assert diff.removed == ["a", "f"]
+        assert merge_diff([], ["x"]).added == ["x"]
+        assert merge_diff(["x"], []).removed == ["x"]
+
+    def test_snapshots_store_only_changes(self, store, db_service):
+        first = store.record_scan("/repo", [f"/repo/f{i}" for i in range(100)])
+        second = store.record_scan(
+            "/repo", [f"/repo/f{i}" for i in range(1, 100)] + ["/repo/new"]
+        )
+        third = store.record_scan("/repo", [f"/repo/f{i}" for i in range(100)])
+
+        assert (first.file_count, first.added_count) == (100, 100)
+        assert (second.added_count, second.removed_count) == (1, 1)
+        assert second.parent_id == first.id
+        with db_service.get_db() as db:
+            deltas = db.scalar(
+                select(func.count()).where(ScanSnapshotDeltas.snapshot_id == third.id)
+            )
+            assert deltas == 2
+            # re-added paths reuse their interned id
+            assert db.scalar(select(func.count()).select_from(ScanPaths)) == 101
+
+        assert store.get_snapshot(first.id) == store.get_snapshot(third.id)
+        assert "/repo/new" in store.get_snapshot(second.id)
+        assert store.latest_snapshot("/repo").id == third.id
+
+    def test_diff_between_scans(self, store):
+        a = store.record_scan("/repo", ["/repo/a", "/repo/b", "/repo/c"])
+        store.record_scan("/repo", ["/repo/a", "/repo/c", "/repo/d"])
+        c = store.record_scan("/repo", ["/repo/a", "/repo/d", "/repo/e", "/repo/b"])
+
+        diff = store.diff(a.id, c.id)
+        assert diff.added == ["/repo/d", "/repo/e"]
+        assert diff.removed == ["/repo/c"]
+
+        reverse = store.diff(c.id, a.id)
+        assert reverse.added == diff.removed
+        assert reverse.removed == diff.added
+
+        other = store.record_scan("/other", ["/repo/a", "/repo/z"])
+        cross = store.diff(a.id, other.id)
+        assert cross.added == ["/repo/z"]
+        assert cross.removed == ["/repo/b", "/repo/c"]
+
+    def test_rebuild_starts_at_the_last_keyframe(self, db_service):
+        store = ScanSnapshotService(db_service, keyframe_interval=4)
+        scans = [[f"/repo/f{j}" for j in range(i, i + 5)] for i in range(10)]
+        snapshots = [store.record_scan("/repo", paths) for paths in scans]
+
+        assert [s.is_keyframe for s in snapshots] == [
+            False, False, False, True, False, False, False, True, False, False
+        ]  # fmt: skip
+        with db_service.get_db() as db:
+            keyframe = db.scalars(
+                select(ScanSnapshotKeyframes.path_id).where(
+                    ScanSnapshotKeyframes.snapshot_id == snapshots[7].id
+                )
+            ).all()
+            assert len(keyframe) == 5
+            # deltas before the keyframe are no longer needed to rebuild
+            db.execute(
+                delete(ScanSnapshotDeltas).where(
+                    ScanSnapshotDeltas.snapshot_id < snapshots[7].id
+                )
+            )
+            db.commit()
+
+        for snapshot, paths in zip(snapshots[7:], scans[7:]):
+            assert store.get_snapshot(snapshot.id) == sorted(paths)
+        latest = store.record_scan("/repo", scans[0])
+        assert store.get_snapshot(latest.id) == sorted(scans[0])
+        assert (latest.added_count, latest.removed_count) == (5, 5)
+        assert store.diff(snapshots[8].id, snapshots[9].id).added == ["/repo/f13"]
+        with db_service.get_db() as db:
+            assert db.get(ScanSnapshots, latest.id).parent_id == snapshots[9].id
+
+    def test_unknown_snapshot(self, store):
+        with pytest.raises(ValueError):
+            store.get_snapshot(999)
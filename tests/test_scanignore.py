@@ -0,0 +1,118 @@
+"""
+tests/test_scanignore.py
+Pytest tests for hierarchical .scanignore matching.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from wembed_core.file_scanner import (
+    DotScanIgnoreFile,
+    ListBuilder,
+    ListBuilderOptions,
+    ScanIgnoreMatcher,
+    walk_tree,
+)
+from wembed_core.file_scanner.walker import FileTreeWalker
+
+
+def write(path: Path, text: str = "x") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "root"
+    write(root / ".scanignore", "# comment\n*.log\nbuild/\n/secret.txt\n")
+    write(root / "sub" / ".scanignore", "!keep.log\ndocs/*.md\n")
+    for rel in [
+        "app.py",
+        "app.log",
+        "secret.txt",
+        "build/out.bin",
+        "sub/keep.log",
+        "sub/drop.log",
+        "sub/secret.txt",
+        "sub/docs/a.md",
+        "sub/docs/deep/b.md",
+        "other/build",
+    ]:
+        write(root / rel)
+    return root
+
+
+class TestScanIgnoreMatcher:
+    """Test suite for ScanIgnoreMatcher."""
+
+    @pytest.mark.parametrize(
+        "rel, ignored",
+        [
+            ("app.py", False),
+            ("app.log", True),
+            ("secret.txt", True),
+            ("build/out.bin", True),
+            ("sub/keep.log", False),
+            ("sub/drop.log", True),
+            ("sub/secret.txt", False),
+            ("sub/docs/a.md", True),
+            ("sub/docs/deep/b.md", False),
+            ("other/build", False),
+        ],
+    )
+    def test_is_ignored(self, tree, rel, ignored):
+        matcher = ScanIgnoreMatcher(tree)
+        assert matcher.is_ignored(tree / rel) is ignored
+
+    def test_directories(self, tree):
+        matcher = ScanIgnoreMatcher(tree)
+        assert matcher.is_ignored(tree / "build", is_dir=True)
+        assert not matcher.is_ignored(tree / "sub", is_dir=True)
+        assert not matcher.is_ignored(tree.parent / "elsewhere.log")
+
+    def test_rules_loaded_once_per_directory(self, tree, monkeypatch):
+        matcher = ScanIgnoreMatcher(tree)
+        loads = []
+        original = matcher._load_rules
+        monkeypatch.setattr(
+            matcher, "_load_rules", lambda rel: loads.append(rel) or original(rel)
+        )
+        for _ in range(3):
+            for name in ("keep.log", "drop.log", "secret.txt"):
+                matcher.is_ignored(tree / "sub" / name)
+        assert sorted(loads) == ["", "sub"]
+        assert matcher.cached_dirs == 2
+
+    def test_nothing_below_an_ignored_directory_is_re_included(self, tmp_path):
+        write(tmp_path / ".scanignore", "vendor/\n!vendor/keep.py\n")
+        write(tmp_path / "vendor" / "keep.py")
+        assert ScanIgnoreMatcher(tmp_path).is_ignored(tmp_path / "vendor" / "keep.py")
+
+
+class TestScanIgnoreIntegration:
+    """The matcher is used by ListBuilder and the walker."""
+
+    def test_list_builder_checks_are_not_inverted(self, tree):
+        builder = ListBuilder(
+            ListBuilderOptions(root_path=tree, ignored_file_parts=set())
+        )
+        assert builder.path_has_ignored_part(tree / "app.log")
+        assert not builder.path_has_ignored_part(tree / "app.py")
+        assert builder.path_has_ignored_extension(tree / "build" / "out.bin")
+
+    def test_walker_skips_scanignored_entries(self, tree):
+        result = FileTreeWalker(scanignore=ScanIgnoreMatcher(tree)).walk(tree)
+        files = {p.relative_to(tree).as_posix() for p in result.files}
+        assert "app.py" in files
+        assert "sub/keep.log" in files
+        assert "app.log" not in files
+        assert not any(f.startswith("build/") for f in files)
+        assert tree / "build" in result.pruned_dirs
+        assert len(walk_tree(tree).files) > len(result.files)
+
+    def test_dot_scanignore_file_can_be_constructed(self, tree):
+        scanignore = DotScanIgnoreFile.load(tree / ".scanignore")
+        assert "*.log" in scanignore.patterns
+        assert DotScanIgnoreFile().patterns == []
@@ -0,0 +1,115 @@
+"""
+tests/test_stat_snapshot.py
+Pytest tests for stat-snapshot incremental rescans.
+"""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from wembed_core.config import AppConfig
+from wembed_core.database import DatabaseService
+from wembed_core.services.stat_snapshot_service import StatSnapshotService
+
+
+class TestStatSnapshotService:
+    """Test suite for StatSnapshotService."""
+
+    @pytest.fixture
+    def service(self):
+        config = Mock(spec=AppConfig)
+        config.sqlalchemy_uri = "sqlite:///:memory:"
+        config.debug = False
+        db_service = DatabaseService(config)
+        db_service.init_db()
+        return StatSnapshotService(db_service)
+
+    @pytest.fixture
+    def root(self, tmp_path):
+        for name in ("a.txt", "b.txt", "sub/c.txt"):
+            path = tmp_path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(name)
+        return tmp_path
+
+    def test_first_scan_treats_every_file_as_new(self, service, root):
+        scan = service.rescan_tree(root)
+        assert sorted(os.path.relpath(p, root) for p in scan.new) == [
+            "a.txt",
+            "b.txt",
+            os.path.join("sub", "c.txt"),
+        ]
+        assert scan.modified == [] and scan.unchanged == 0
+        assert service.commit(scan) == 3
+        assert len(service.load(root)) == 3
+
+    def test_rescan_skips_unchanged_files_without_opening_them(self, service, root):
+        service.commit(service.rescan_tree(root))
+        with patch("builtins.open", side_effect=AssertionError("opened")):
+            scan = service.rescan_tree(root)
+        assert scan.changed == []
+        assert scan.unchanged == 3
+
+    def test_detects_new_modified_and_deleted(self, service, root):
+        service.commit(service.rescan_tree(root))
+        (root / "a.txt").write_text("changed content")
+        (root / "b.txt").unlink()
+        (root / "d.txt").write_text("d")
+        scan = service.rescan_tree(root)
+        assert scan.new == [str(root / "d.txt")]
+        assert scan.modified == [str(root / "a.txt")]
+        assert scan.deleted == [str(root / "b.txt")]
+        assert scan.unchanged == 1
+
+        service.commit(scan)
+        assert set(service.load(root)) == {
+            str(root / "a.txt"),
+            str(root / "d.txt"),
+            str(root / "sub" / "c.txt"),
+        }
+        assert service.rescan_tree(root).changed == []
+
+    def test_mtime_change_alone_is_detected(self, service, root):
+        service.commit(service.rescan_tree(root))
+        stat = (root / "a.txt").stat()
+        os.utime(root / "a.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+        assert service.rescan_tree(root).modified == [str(root / "a.txt")]
+
+    def test_partial_commit_keeps_unprocessed_files_pending(self, service, root):
+        scan = service.rescan_tree(root)
+        service.commit(scan, processed=[str(root / "a.txt")])
+        pending = service.rescan_tree(root)
+        assert str(root / "a.txt") not in pending.new
+        assert len(pending.new) == 2
+
+    def test_stat_failure_is_neither_deleted_nor_committed(self, service, root):
+        service.commit(service.rescan_tree(root))
+        locked = str(root / "a.txt")
+        (root / "b.txt").write_text("changed")
+        real_stat = os.stat
+
+        def flaky_stat(path, *args, **kwargs):
+            if str(path) == locked:
+                raise PermissionError(path)
+            return real_stat(path, *args, **kwargs)
+
+        with patch("os.stat", side_effect=flaky_stat):
+            scan = service.rescan(root, [locked, root / "b.txt", root / "sub/c.txt"])
+        assert scan.failed == [locked] and scan.errors == 1
+        assert scan.deleted == []
+        service.commit(scan, processed=[locked, str(root / "b.txt")])
+        assert locked in service.load(root)
+
+    def test_root_spellings_share_one_snapshot(self, service, root, monkeypatch):
+        monkeypatch.chdir(root / "sub")
+        assert service.commit(service.rescan_tree("..")) == 3
+        assert len(service.load(root)) == 3
+        assert len(service.rescan(root / "sub" / "..", []).deleted) == 3
+        service.forget(str(root) + os.sep + ".")
+        assert service.load("..") == {}
+
+    def test_forget(self, service, root):
+        service.commit(service.rescan_tree(root))
+        service.forget(root)
+        assert service.load(root) == {}
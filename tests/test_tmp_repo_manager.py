@@ -0,0 +1,152 @@
+"""
+tests/test_tmp_repo_manager.py
+Pytest tests for TmpRepoManager clone strategies, using local file:// repositories.
+"""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from wembed_core.enums import CloneStrategies
+from wembed_core.file_scanner import (
+    ListBuilderOptions,
+    TmpRepoManager,
+    measure_clone_strategies,
+)
+from wembed_core.file_scanner.tmp_repo_manager import sparse_patterns
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=t@t", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def source(tmp_path):
+    repo = tmp_path / "source"
+    repo.mkdir()
+    git(repo, "init", "-q")
+    git(repo, "config", "uploadpack.allowFilter", "true")
+    for i in range(3):
+        for name in ("README.md", "src/app.py", "src/data.txt", "docs/guide.md"):
+            path = repo / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"{name} version {i}\n" * 200)
+        git(repo, "add", "-A")
+        git(repo, "commit", "-q", "-m", f"commit {i}")
+    return repo
+
+
+def checked_out(root: Path) -> set:
+    return {
+        p.relative_to(root).as_posix()
+        for p in root.rglob("*")
+        if p.is_file() and ".git" not in p.relative_to(root).parts
+    }
+
+
+def commit_count(root: Path) -> int:
+    return int(git(root, "rev-list", "--count", "HEAD"))
+
+
+class TestTmpRepoManager:
+    """Test suite for TmpRepoManager clone strategies."""
+
+    def test_full_clone_and_cleanup(self, source, tmp_path):
+        manager = TmpRepoManager(str(source), tmp_path / "app")
+        with manager.temp_repo() as clone:
+            assert commit_count(clone) == 3
+            assert len(checked_out(clone)) == 4
+        # The clone is removed even though it is not empty.
+        assert not manager.tmp_dir.exists()
+        assert manager.last_report.strategy == CloneStrategies.FULL
+
+    def test_shallow_clone(self, source, tmp_path):
+        manager = TmpRepoManager(
+            str(source), tmp_path / "app", strategy=CloneStrategies.SHALLOW
+        )
+        with manager.temp_repo() as clone:
+            assert commit_count(clone) == 1
+            assert (
+                (clone / "src" / "app.py")
+                .read_text()
+                .startswith("src/app.py version 2")
+            )
+
+    def test_blobless_clone_keeps_history_without_old_blobs(self, source, tmp_path):
+        manager = TmpRepoManager(
+            str(source), tmp_path / "app", strategy=CloneStrategies.BLOBLESS
+        )
+        with manager.temp_repo() as clone:
+            assert commit_count(clone) == 3
+            assert len(checked_out(clone)) == 4
+            missing = git(clone, "rev-list", "--objects", "--all", "--missing=print")
+            assert any(line.startswith("?") for line in missing.splitlines())
+
+    def test_sparse_clone_with_subdirs(self, source, tmp_path):
+        options = ListBuilderOptions(root_path=source, subdirs=["src"])
+        manager = TmpRepoManager(
+            str(source),
+            tmp_path / "app",
+            strategy=CloneStrategies.SPARSE,
+            options=options,
+        )
+        with manager.temp_repo() as clone:
+            # Cone mode always includes top-level files.
+            assert checked_out(clone) == {"README.md", "src/app.py", "src/data.txt"}
+            manager.add_sparse_paths(["docs"])
+            assert "docs/guide.md" in checked_out(clone)
+        assert manager.last_report.sparse_patterns == ["src"]
+
+    def test_sparse_clone_with_match_patterns(self, source, tmp_path):
+        options = ListBuilderOptions(
+            root_path=source, subdirs=["src"], match_patterns=["*.py"]
+        )
+        manager = TmpRepoManager(
+            str(source),
+            tmp_path / "app",
+            strategy=CloneStrategies.SPARSE,
+            options=options,
+        )
+        with manager.temp_repo() as clone:
+            assert checked_out(clone) == {"src/app.py"}
+
+    def test_measure_clone_strategies(self, source, tmp_path):
+        options = ListBuilderOptions(root_path=source, match_patterns=["*.md"])
+        reports = {
+            r.strategy: r
+            for r in measure_clone_strategies(
+                str(source), tmp_path / "app", options=options
+            )
+        }
+        assert set(reports) == set(CloneStrategies)
+        assert reports[CloneStrategies.SPARSE].worktree_files == 2
+        assert reports[CloneStrategies.FULL].worktree_files == 4
+        assert (
+            reports[CloneStrategies.SPARSE].total_bytes
+            < reports[CloneStrategies.FULL].total_bytes
+        )
+        assert all(r.elapsed_ms > 0 for r in reports.values())
+
+
+class TestSparsePatterns:
+    """Test suite for deriving sparse-checkout patterns from ListBuilderOptions."""
+
+    def test_patterns(self, tmp_path):
+        assert sparse_patterns(None) == ([], True)
+        assert sparse_patterns(
+            ListBuilderOptions(root_path=tmp_path, subdirs=["/a/", "b\\c"])
+        ) == (["a", "b/c"], True)
+        assert sparse_patterns(
+            ListBuilderOptions(root_path=tmp_path, match_patterns=["*.py"])
+        ) == (["*.py"], False)
+        assert sparse_patterns(
+            ListBuilderOptions(
+                root_path=tmp_path, subdirs=["a"], match_patterns=["*.py"]
+            )
+        ) == (["/a/**/*.py"], False)